@@ -115,6 +115,49 @@ class BenchMark(benchbase.TreeBenchMark):
     def bench_XML(self, root_xml):
         self.etree.XML(root_xml)
 
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @onlylib('lxe')
+    @serialized
+    def bench_XML_encoding_utf8(self, root_xml):
+        self.etree.XML(root_xml, self.etree.XMLParser(encoding='utf8'))
+
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @onlylib('lxe')
+    @serialized
+    def bench_XML_encoding_latin1(self, root_xml):
+        self.etree.XML(root_xml, self.etree.XMLParser(encoding='latin1'))
+
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @onlylib('lxe')
+    @serialized
+    def bench_XML_encoding_cp1252(self, root_xml):
+        self.etree.XML(root_xml, self.etree.XMLParser(encoding='cp1252'))
+
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @onlylib('lxe')
+    @serialized
+    def bench_XML_encoding_shift_jis(self, root_xml):
+        self.etree.XML(root_xml, self.etree.XMLParser(encoding='shift_jis'))
+
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @onlylib('lxe')
+    @serialized
+    def bench_HTML_encoding_cp1252(self, root_xml):
+        self.etree.HTML(root_xml, self.etree.HTMLParser(encoding='cp1252'))
+
+    @with_attributes(True, False)
+    @with_text(text=True)
+    @serialized
+    def bench_feed_unicode_ascii(self, root_xml):
+        parser = self.etree.XMLParser()
+        parser.feed(root_xml.decode('UTF-8'))
+        parser.close()
+
     @with_attributes(True, False)
     @with_text(text=True, utext=True)
     @serialized
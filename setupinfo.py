@@ -15,7 +15,7 @@ try:
 except ImportError:
     CYTHON_INSTALLED = False
 
-EXT_MODULES = ["lxml.etree", "lxml.objectify", "lxml.tests._testlock"]
+EXT_MODULES = ["lxml.etree", "lxml.objectify", "lxml.tests._testlock", "lxml.tests._testtarget"]
 COMPILED_MODULES = [
     "lxml.builder",
     "lxml.html.diff",
@@ -119,6 +119,8 @@ def ext_modules(static_include_dirs, static_library_dirs,
         base_dir, include_dirs(static_include_dirs) + [
             SOURCE_PATH,
             INCLUDE_PACKAGE_PATH,
+            # for the generated "etree_api.h" in compiled test modules
+            os.path.join(SOURCE_PATH, 'lxml'),
         ])
     _library_dirs = _prefer_reldirs(base_dir, library_dirs(static_library_dirs))
     _cflags = cflags(static_cflags)
@@ -257,7 +257,18 @@ cdef class _MultiTagMatcher:
         self._cached_doc_dict_size = dict_size
         return 0
 
+    cdef int cacheParserTags(self, xmlDoc* c_doc) except -1:
+        """
+        Put the tag names into the dict of a document that is still being parsed
+        and does not have a document proxy yet.
+        """
+        self._cached_doc = None
+        return self._cacheDocTags(c_doc, force_into_dict=True)
+
     cdef int _cacheTags(self, _Document doc, bint force_into_dict=False) except -1:
+        return self._cacheDocTags(doc._c_doc, force_into_dict)
+
+    cdef int _cacheDocTags(self, xmlDoc* c_doc, bint force_into_dict) except -1:
         self._cached_tags_count = 0
         if not self._py_tags:
             self._all_tags_in_dict = True
@@ -268,7 +279,7 @@ cdef class _MultiTagMatcher:
                 self._cached_doc = None
                 raise MemoryError()
         self._cached_tags_count = <size_t>_mapTagsToQnameMatchArray(
-            doc._c_doc, self._py_tags, self._cached_tags, force_into_dict)
+            c_doc, self._py_tags, self._cached_tags, force_into_dict)
         self._all_tags_in_dict = self._cached_tags_count == len(self._py_tags)
         return 0
 
@@ -24,11 +24,12 @@ __all__ = [
     'LXML_VERSION',
     'LxmlError', 'LxmlRegistryError', 'LxmlSyntaxError',
     'NamespaceRegistryError', 'PI', 'PIBase', 'ParseError',
-    'ParserBasedElementClassLookup', 'ParserError', 'ProcessingInstruction',
+    'ParserBasedElementClassLookup', 'ParserError', 'ParserPool', 'ParserTargetBase', 'ProcessingInstruction',
     'PyErrorLog', 'PythonElementClassLookup', 'QName', 'RelaxNG',
     'RelaxNGError', 'RelaxNGErrorTypes', 'RelaxNGParseError',
     'RelaxNGValidateError', 'Resolver', 'Schematron', 'SchematronError',
     'SchematronParseError', 'SchematronValidateError', 'SerialisationError',
+    'SerializationCache',
     'SubElement', 'TreeBuilder', 'XInclude', 'XIncludeError', 'XML',
     'XMLDTDID', 'XMLID', 'XMLParser', 'XMLSchema', 'XMLSchemaError',
     'XMLSchemaParseError', 'XMLSchemaValidateError', 'XMLSyntaxError',
@@ -36,13 +37,14 @@ __all__ = [
     'XPathEvalError', 'XPathEvaluator', 'XPathFunctionError', 'XPathResultError',
     'XPathSyntaxError', 'XSLT', 'XSLTAccessControl', 'XSLTApplyError',
     'XSLTError', 'XSLTExtension', 'XSLTExtensionError', 'XSLTParseError',
-    'XSLTSaveError', 'canonicalize',
+    'XSLTSaveError', 'aparse', 'canonicalize',
     'cleanup_namespaces', 'clear_error_log', 'dump',
-    'fromstring', 'fromstringlist', 'get_default_parser', 'iselement',
-    'iterparse', 'iterwalk', 'parse', 'parseid', 'register_namespace',
-    'set_default_parser', 'set_element_class_lookup', 'strip_attributes',
-    'strip_elements', 'strip_tags', 'tostring', 'tostringlist', 'tounicode',
-    'use_global_python_log'
+    'freeze_parser_dict', 'fromstring', 'fromstringlist', 'get_default_parser',
+    'iselement', 'iter_tostring',
+    'iterparse', 'iterparse_parallel', 'iterwalk', 'parse', 'parse_many', 'parseid',
+    'register_namespace', 'set_default_parser', 'set_element_class_lookup',
+    'strip_attributes', 'strip_elements', 'strip_tags', 'tostring', 'tostring_into',
+    'tostring_many', 'tostringlist', 'tounicode', 'use_global_python_log'
     ]
 
 cimport cython
@@ -67,8 +69,8 @@ from libc.string cimport const_char
 cdef object os_path_abspath
 from os.path import abspath as os_path_abspath
 
-cdef object BytesIO, StringIO, BufferedWriter
-from io import BytesIO, StringIO, BufferedWriter
+cdef object BytesIO, BufferedWriter
+from io import BytesIO, BufferedWriter
 
 cdef object OrderedDict
 from collections import OrderedDict
@@ -85,6 +87,9 @@ from functools import partial
 cdef object islice
 from itertools import islice
 
+cdef object codecs_lookup
+from codecs import lookup as codecs_lookup
+
 cdef object ITER_EMPTY = iter(())
 
 cdef object MutableMapping
@@ -527,6 +532,8 @@ cdef public class _Document [ type LxmlDocumentType, object LxmlDocument ]:
     cdef RWLock _lock
     # Short-lived lock to guard proxy link changes.
     cdef cython.pymutex _proxy_lock
+    cdef _ParseStats _parse_stats
+    cdef SerializationCache _serialisation_cache
 
     def __dealloc__(self):
         # If there are no more references to the document, it is safe
@@ -554,6 +561,9 @@ cdef public class _Document [ type LxmlDocumentType, object LxmlDocument ]:
 
     cdef void lock_write(self) noexcept:
         self._lock.lock_write()
+        if self._serialisation_cache is not None:
+            # unknown change, drop all cached output
+            self._serialisation_cache._invalidateAll()
 
     cdef void unlock_write(self) noexcept:
         self._lock.unlock_write()
@@ -569,6 +579,32 @@ cdef public class _Document [ type LxmlDocumentType, object LxmlDocument ]:
     cdef void lock_write_with(self, _Document second_doc) noexcept:
         """Lock two documents for writing at the same time.
         """
+        self._lock_write_with(second_doc)
+        if self._serialisation_cache is not None:
+            self._serialisation_cache._invalidateAll()
+        if second_doc is not None and second_doc._serialisation_cache is not None:
+            second_doc._serialisation_cache._invalidateAll()
+
+    cdef void lock_write_node(self, xmlNode* c_node) noexcept:
+        """Lock the document for writing, for a change of the name, attributes,
+        text or children of 'c_node' only.
+        """
+        self._lock.lock_write()
+        if self._serialisation_cache is not None:
+            self._serialisation_cache._invalidateNode(c_node)
+
+    cdef void lock_write_for_move(self, xmlNode* c_parent, _Document second_doc,
+                                  xmlNode* c_moved) noexcept:
+        """Lock two documents for writing at the same time, for moving the
+        node 'c_moved' from the second document into or out of 'c_parent'.
+        """
+        self._lock_write_with(second_doc)
+        if self._serialisation_cache is not None:
+            self._serialisation_cache._invalidateNode(c_parent)
+        if second_doc is not None and second_doc._serialisation_cache is not None:
+            second_doc._serialisation_cache._invalidateSubtree(c_moved)
+
+    cdef inline void _lock_write_with(self, _Document second_doc) noexcept:
         if second_doc is None or self._lock is second_doc._lock:
             self._lock.lock_write()
         else:
@@ -890,6 +926,14 @@ cdef class DocInfo:
     def is_html(self):
         return self._doc.ishtml()
 
+    @property
+    def parse_stats(self):
+        """Statistics of the parser run that created the document as a dict,
+        or None if the parser did not collect them.  See ``XMLParser.stats``.
+        """
+        stats = self._doc._parse_stats
+        return stats.as_dict() if stats is not None else None
+
     property URL:
         "The source URL of the document (or None if unknown)."
         def __get__(self):
@@ -1058,7 +1102,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
             doc = self._doc
             other_doc = element._doc
-            doc.lock_write_with(other_doc)
+            doc.lock_write_for_move(self._c_node, other_doc, element._c_node)
             try:
                 c_node = _findChild(self._c_node, x)
                 if c_node is NULL:
@@ -1107,7 +1151,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
         else:
             # item deletion
             doc = self._doc
-            doc.lock_write()
+            doc.lock_write_node(self._c_node)
             try:
                 c_node = _findChild(self._c_node, x)
                 if c_node is NULL:
@@ -1155,7 +1199,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
         _assertValidNode(self)
 
         doc = self._doc
-        doc.lock_write()
+        doc.lock_write_node(self._c_node)
         try:
             _setAttributeValue(self, key, value)
         finally:
@@ -1172,7 +1216,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
         doc = self._doc
         other_doc = element._doc
-        doc.lock_write_with(other_doc)
+        doc.lock_write_for_move(self._c_node, other_doc, element._c_node)
         try:
             _appendChild(self, element)
         finally:
@@ -1193,7 +1237,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
         doc = self._doc
         other_doc = element._doc
-        doc.lock_write_with(other_doc)
+        doc.lock_write_for_move(self._c_node.parent, other_doc, element._c_node)
         try:
             if self._c_node.parent != NULL and not _isElement(self._c_node.parent):
                 if element._c_node.type not in (tree.XML_PI_NODE, tree.XML_COMMENT_NODE):
@@ -1218,7 +1262,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
         doc = self._doc
         other_doc = element._doc
-        doc.lock_write_with(other_doc)
+        doc.lock_write_for_move(self._c_node.parent, other_doc, element._c_node)
         try:
             if self._c_node.parent != NULL and not _isElement(self._c_node.parent):
                 if element._c_node.type != tree.XML_PI_NODE:
@@ -1281,7 +1325,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
         _assertValidNode(self)
 
         doc = self._doc
-        doc.lock_write()
+        doc.lock_write_node(self._c_node)
         try:
             c_node = self._c_node
             # remove self.text and self.tail
@@ -1317,7 +1361,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
         doc = self._doc
         other_doc = element._doc
-        doc.lock_write_with(other_doc)
+        doc.lock_write_for_move(self._c_node, other_doc, element._c_node)
         try:
             c_node = _findChild(self._c_node, index)
             if c_node is NULL:
@@ -1348,7 +1392,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
 
         doc = self._doc
         other_doc = element._doc
-        doc.lock_write_with(other_doc)
+        doc.lock_write_for_move(self._c_node, other_doc, element._c_node)
         try:
             c_node = element._c_node
             if c_node.parent is not self._c_node:
@@ -1377,7 +1421,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
         _assertValidNode(new_element)
         old_doc = old_element._doc
         new_doc = new_element._doc
-        old_doc.lock_write_with(new_doc)
+        old_doc.lock_write_for_move(self._c_node, new_doc, new_element._c_node)
         try:
             c_old_node = old_element._c_node
             if c_old_node.parent is not self._c_node:
@@ -1429,7 +1473,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
             else:
                 _tagValidOrRaise(name)
             doc = self._doc
-            doc.lock_write()
+            doc.lock_write_node(self._c_node)
             try:
                 tree.xmlNodeSetName(self._c_node, _xcstr(name))
                 if ns is None:
@@ -1464,7 +1508,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
             _assertValidNode(self)
             is_qname: cython.bint = isinstance(value, QName)
             doc = self._doc
-            doc.lock_write()
+            doc.lock_write_node(self._c_node)
             try:
                 if is_qname:
                     value = _resolveQNameText(self, value).decode('utf8')
@@ -1493,7 +1537,8 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
         def __set__(self, value):
             _assertValidNode(self)
             doc = self._doc
-            doc.lock_write()
+            # the tail is part of the parent's content
+            doc.lock_write_node(self._c_node.parent)
             try:
                 _setTailText(self._c_node, value)
             finally:
@@ -1597,7 +1642,7 @@ cdef public class _Element [ type LxmlElementType, object LxmlElement ]:
                 url = _encodeFilename(url)
                 c_base = _xcstr(url)
             doc = self._doc
-            doc.lock_write()
+            doc.lock_write_node(self._c_node)
             tree.xmlNodeSetBase(self._c_node, c_base)
             doc.unlock_write()
 
@@ -2481,7 +2526,10 @@ cdef public class _ElementTree [ type LxmlElementTreeType,
         """
         cdef _Document doc = None
         try:
-            doc = _parseDocument(source, parser, base_url)
+            if _mapsFile(source, parser):
+                doc = _parseMappedFileDocument(source, parser, base_url)
+            else:
+                doc = _parseDocument(source, parser, base_url)
         except _TargetParserResult as result_container:
             # raises a TypeError if we don't get an _Element
             self._context_node = result_container.result
@@ -2636,9 +2684,9 @@ cdef public class _ElementTree [ type LxmlElementTreeType,
                     doc.unlock_read()
             else:  # c14n2
                 with _open_utf8_file(file, compression=compression) as f:
-                    target = C14NWriterTarget(
+                    writer = _C14N2Writer(
                         f.write, with_comments=with_comments, strip_text=strip_text)
-                    _tree_to_target(self, target)
+                    (<_C14N2Writer>writer)._writeTree(self)
             return
 
         if not with_comments:
@@ -3101,7 +3149,7 @@ cdef class _Attrib:
     def __setitem__(self, key, value):
         _assertValidNode(self._element)
         doc = self._element._doc
-        doc.lock_write()
+        doc.lock_write_node(self._element._c_node)
         try:
             _setAttributeValue(self._element, key, value)
         finally:
@@ -3110,7 +3158,7 @@ cdef class _Attrib:
     def __delitem__(self, key):
         _assertValidNode(self._element)
         doc = self._element._doc
-        doc.lock_write()
+        doc.lock_write_node(self._element._c_node)
         try:
             _delAttribute(self._element, key)
         finally:
@@ -3121,7 +3169,7 @@ cdef class _Attrib:
         if isinstance(sequence_or_dict, (dict, _Attrib)):
             sequence_or_dict = sequence_or_dict.items()
         doc = self._element._doc
-        doc.lock_write()
+        doc.lock_write_node(self._element._c_node)
         try:
             for key, value in sequence_or_dict:
                 _setAttributeValue(self._element, key, value)
@@ -3133,7 +3181,7 @@ cdef class _Attrib:
             raise TypeError, f"pop expected at most 2 arguments, got {len(default)+1}"
         _assertValidNode(self._element)
         doc = self._element._doc
-        doc.lock_write()
+        doc.lock_write_node(self._element._c_node)
         try:
             result = _getAttributeValue(self._element, key, None)
             if result is None:
@@ -3149,7 +3197,7 @@ cdef class _Attrib:
     def clear(self):
         _assertValidNode(self._element)
         doc = self._element._doc
-        doc.lock_write()
+        doc.lock_write_node(self._element._c_node)
         c_attrs = self._element._c_node.properties
         if c_attrs:
             self._element._c_node.properties = NULL
@@ -3653,7 +3701,7 @@ def SubElement(_Element _parent not None, _tag,
     appends it to an existing element.
     """
     doc = _parent._doc
-    doc.lock_write()
+    doc.lock_write_node(_parent._c_node)
     try:
         return _makeSubElement(
             _parent, _tag,
@@ -3760,6 +3808,10 @@ def fromstring(text, _BaseParser parser=None, *, base_url=None):
     Parses an XML document or fragment from a string.  Returns the
     root node (or the result returned by a parser target).
 
+    Besides ``str`` and ``bytes``, the input can be any contiguous object
+    that supports the buffer protocol, e.g. a ``bytearray``, ``memoryview``
+    or ``mmap``.  It is parsed in place without copying it first.
+
     To override the default parser with a different parser you can pass it to
     the ``parser`` keyword argument.
 
@@ -3942,12 +3994,9 @@ def tostring(element_or_tree, *, encoding=None, method="xml",
         if method == 'c14n':
             return _tostringC14N(element_or_tree, exclusive, with_comments, inclusive_ns_prefixes)
         else:
-            out = BytesIO()
-            target = C14NWriterTarget(
-                utf8_writer(out).write,
-                with_comments=with_comments, strip_text=strip_text)
-            _tree_to_target(element_or_tree, target)
-            return out.getvalue()
+            writer = _C14N2Writer(with_comments=with_comments, strip_text=strip_text)
+            (<_C14N2Writer>writer)._writeTree(element_or_tree)
+            return (<_C14N2Writer>writer)._getResult()
     if not with_comments:
         raise ValueError("Can only discard comments in C14N serialisation")
     if strip_text:
@@ -4000,6 +4049,164 @@ def tostringlist(element_or_tree, *args, **kwargs):
     return [tostring(element_or_tree, *args, **kwargs)]
 
 
+def tostring_into(element_or_tree, buffer, Py_ssize_t offset=0, *,
+                  encoding=None, method="xml", xml_declaration=None,
+                  bint pretty_print=False, bint with_tail=True,
+                  standalone=None, doctype=None):
+    """tostring_into(element_or_tree, buffer, offset=0, *, encoding=None, \
+                      method="xml", xml_declaration=None, pretty_print=False, \
+                      with_tail=True, standalone=None, doctype=None)
+
+    Serialize an element into a writable buffer, starting at byte position
+    ``offset``, and return the number of bytes written.
+
+    Takes the same serialisation options as ``tostring()``, but writes the
+    encoded bytes directly into ``buffer`` instead of returning a new byte
+    string.  This avoids allocating an intermediate result when the output
+    ends up in a reused buffer anyway.
+
+    A ``bytearray`` is extended in place when the data does not fit.  Any
+    other writable buffer (e.g. a ``memoryview`` or an ``mmap``) must be
+    large enough, otherwise a ``ValueError`` is raised and the buffer is
+    left unchanged.
+
+    Serialisation to unicode strings and the C14N methods are not supported.
+    """
+    cdef bint write_declaration
+    cdef int is_standalone
+    if method in ('c14n', 'c14n2'):
+        raise ValueError("C14N serialisation is not supported by tostring_into(), use tostring()")
+    if encoding is unicode or (encoding is not None and encoding.lower() == 'unicode'):
+        raise ValueError("Cannot serialise to unicode into a byte buffer")
+    if xml_declaration is None:
+        # by default, write an XML declaration only for non-standard encodings
+        write_declaration = encoding is not None and encoding.upper() not in \
+                            ('ASCII', 'UTF-8', 'UTF8', 'US-ASCII')
+    else:
+        write_declaration = xml_declaration
+    if encoding is None:
+        encoding = 'ASCII'
+    if standalone is None:
+        is_standalone = -1
+    elif standalone:
+        write_declaration = 1
+        is_standalone = 1
+    else:
+        write_declaration = 1
+        is_standalone = 0
+
+    if isinstance(element_or_tree, _Element):
+        return _tostringInto(<_Element>element_or_tree, buffer, offset,
+                             encoding, doctype, method, write_declaration, 0,
+                             pretty_print, with_tail, is_standalone)
+    elif isinstance(element_or_tree, _ElementTree):
+        (<_ElementTree>element_or_tree)._assertHasRoot()
+        return _tostringInto((<_ElementTree>element_or_tree)._context_node,
+                             buffer, offset, encoding, doctype, method,
+                             write_declaration, 1, pretty_print, with_tail,
+                             is_standalone)
+    else:
+        raise TypeError, f"Type '{python._fqtypename(element_or_tree)}' cannot be serialized."
+
+
+def tostring_many(elements, *, workers=None, output=None, separator=None, **kwargs):
+    """tostring_many(elements, *, workers=None, output=None, separator=None, **kwargs)
+
+    Serialize many elements or ElementTrees in parallel.
+
+    The ``elements`` can be any iterable of elements or trees.  They are
+    serialised on a pool of ``workers`` threads (default: the number of
+    CPUs), where libxml2 writes each of them while holding only the read
+    lock of its document and without holding the GIL.  The keyword
+    arguments are passed on to ``tostring()`` for each element.
+
+    Returns the list of serialised strings in input order.  If ``output``
+    is given, the strings are written to it in input order instead,
+    separated by ``separator`` (if provided), and ``None`` is returned.
+    The ``output`` can be a file name/path, which is opened in binary
+    mode, or a file-like object with a ``.write()`` method.
+
+    Serialisation errors are raised when the failing element is reached
+    in input order.  Any strings before it are written to the ``output``.
+    """
+    if workers is None:
+        import os
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"invalid number of workers: {workers}")
+    serialise = partial(tostring, **kwargs)
+    if output is None:
+        return _tostringMany(elements, serialise, workers, None, None)
+    output = _getFSPathOrObject(output)
+    if _isString(output):
+        with io_open(output, 'wb') as f:
+            _tostringMany(elements, serialise, workers, f, separator)
+    else:
+        _tostringMany(elements, serialise, workers, output, separator)
+
+
+def iter_tostring(element_or_tree, Py_ssize_t chunk_size=1 << 20, *,
+                  encoding=None, method="xml", xml_declaration=None,
+                  bint pretty_print=False, bint with_tail=True,
+                  standalone=None, doctype=None):
+    """iter_tostring(element_or_tree, chunk_size=1 << 20, *, encoding=None, \
+                      method="xml", xml_declaration=None, pretty_print=False, \
+                      with_tail=True, standalone=None, doctype=None)
+
+    Serialize an element and return an iterator over the encoded output
+    in byte strings of ``chunk_size`` bytes.  Only the last chunk can be
+    shorter.
+
+    Takes the same serialisation options as ``tostring()``.  Plain XML
+    output is generated chunk by chunk while iterating, which keeps the
+    memory usage bounded for large trees, e.g. when streaming them over
+    a network or into a compressor.  The document is only locked while
+    each chunk is being generated.  Other output methods and pretty
+    printing serialise the entire tree on the first iteration.
+
+    The tree must not be modified during the iteration.  Moving the
+    elements that are still being serialised raises a ``RuntimeError``.
+
+    Serialisation to unicode strings and the C14N methods are not supported.
+    """
+    cdef bint write_declaration
+    cdef int is_standalone
+    if chunk_size < 1:
+        raise ValueError(f"invalid chunk size: {chunk_size}")
+    if method in ('c14n', 'c14n2'):
+        raise ValueError("C14N serialisation is not supported by iter_tostring(), use tostring()")
+    if encoding is unicode or (encoding is not None and encoding.lower() == 'unicode'):
+        raise ValueError("Cannot serialise to unicode in byte chunks")
+    if xml_declaration is None:
+        # by default, write an XML declaration only for non-standard encodings
+        write_declaration = encoding is not None and encoding.upper() not in \
+                            ('ASCII', 'UTF-8', 'UTF8', 'US-ASCII')
+    else:
+        write_declaration = xml_declaration
+    if encoding is None:
+        encoding = 'ASCII'
+    if standalone is None:
+        is_standalone = -1
+    elif standalone:
+        write_declaration = 1
+        is_standalone = 1
+    else:
+        write_declaration = 1
+        is_standalone = 0
+
+    if isinstance(element_or_tree, _Element):
+        return _iterTostring(<_Element>element_or_tree, encoding, doctype, method,
+                             write_declaration, 0, pretty_print, with_tail,
+                             is_standalone, chunk_size)
+    elif isinstance(element_or_tree, _ElementTree):
+        (<_ElementTree>element_or_tree)._assertHasRoot()
+        return _iterTostring((<_ElementTree>element_or_tree)._context_node,
+                             encoding, doctype, method, write_declaration, 1,
+                             pretty_print, with_tail, is_standalone, chunk_size)
+    else:
+        raise TypeError, f"Type '{python._fqtypename(element_or_tree)}' cannot be serialized."
+
+
 def tounicode(element_or_tree, *, method="xml", bint pretty_print=False,
               bint with_tail=True, doctype=None):
     """tounicode(element_or_tree, method="xml", pretty_print=False, \
@@ -4034,8 +4241,9 @@ def tounicode(element_or_tree, *, method="xml", bint pretty_print=False,
         raise TypeError, f"Type '{type(element_or_tree)}' cannot be serialized."
 
 
-def parse(source, _BaseParser parser=None, *, base_url=None):
-    """parse(source, parser=None, base_url=None)
+def parse(source, _BaseParser parser=None, *, base_url=None, mmap=None,
+          compression=None):
+    """parse(source, parser=None, base_url=None, mmap=None, compression=None)
 
     Return an ElementTree object loaded with source elements.  If no parser
     is provided as second argument, the default parser is used.
@@ -4057,15 +4265,106 @@ def parse(source, _BaseParser parser=None, *, base_url=None):
     The ``base_url`` keyword allows setting a URL for the document
     when parsing from a file-like object.  This is needed when looking
     up external entities (DTD, XInclude, ...) with relative paths.
+
+    Passing ``mmap=True`` parses a local file (given as file name/path or
+    as file object with a ``fileno()``) directly from a read-only memory
+    mapping of the entire file.  This avoids copying the input and lets
+    repeated parses of the same file benefit from the OS page cache.
+    Files larger than 2 GiB are pushed into the parser in slices.
+    Compressed input is not decompressed in this mode.  By default, the
+    ``mmap`` option of the parser decides, which maps only sources that
+    are local files and reads all other input as usual.
+
+    The ``compression`` option decompresses the input while parsing it.
+    It can be one of ``'gzip'``, ``'bz2'``, ``'xz'`` or ``'zstd'`` (which
+    requires Python 3.14 or the ``zstandard`` package), or ``'auto'`` to
+    detect the format from the input data.  The decompressed data is passed
+    to the parser in chunks of limited size.
     """
     cdef _Document doc
+    if mmap is None:
+        mmap = compression is None and _mapsFile(source, parser)
+    elif mmap and compression is not None:
+        raise ValueError("cannot use 'mmap' together with 'compression'")
     try:
-        doc = _parseDocument(source, parser, base_url)
+        if compression is not None:
+            doc = _parseCompressedDocument(source, parser, base_url, compression)
+        elif mmap:
+            doc = _parseMappedFileDocument(source, parser, base_url)
+        else:
+            doc = _parseDocument(source, parser, base_url)
         return _elementTreeFactory(doc, None)
     except _TargetParserResult as result_container:
         return result_container.result
 
 
+def parse_many(sources, _BaseParser parser=None, *, workers=None, bint ordered=True):
+    """parse_many(sources, parser=None, *, workers=None, ordered=True)
+
+    Parse many documents in parallel and return an iterator over the
+    resulting ElementTree objects.
+
+    The ``sources`` can be any iterable of inputs that ``parse()`` accepts,
+    e.g. file names/paths or file-like objects.  They are parsed on a pool
+    of ``workers`` threads (default: the number of CPUs).  Each thread uses
+    its own copy of the ``parser`` (or the default parser), so that the
+    libxml2 parse phase, which runs without holding the GIL, does not get
+    serialised by a shared parser.
+
+    By default, the trees are returned in the order of their sources.
+    Pass ``ordered=False`` to receive them as soon as they are parsed.
+
+    Parse errors are raised by the iterator when it reaches the failing
+    document.  The iteration can continue afterwards.  To stop early, call
+    the ``close()`` method of the iterator or use it as a context manager,
+    which cancels the pending documents and shuts down the worker threads.
+
+    Parser targets are not supported.
+    """
+    if parser is None:
+        parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+    if parser.target is not None:
+        raise ValueError("parse_many() does not support parser targets")
+    if workers is None:
+        import os
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"invalid number of workers: {workers}")
+    return _ParseManyIterator(sources, parser, workers, ordered)
+
+
+async def aparse(source, _BaseParser parser=None, *, base_url=None, executor=None,
+                 chunk_size=65536):
+    """aparse(source, parser=None, *, base_url=None, executor=None, chunk_size=65536)
+
+    Asynchronously parse a document and return an ElementTree object
+    (or the result returned by a parser target).  Use it as
+    ``tree = await aparse(source)``.
+
+    The ``source`` can be an async iterable of data chunks or an object
+    with an async ``.read(size)`` method, e.g. an ``asyncio.StreamReader``.
+    It is read in chunks of ``chunk_size`` bytes.
+
+    The chunks are fed into the parser in the ``executor`` (default: the
+    event loop's default executor), where libxml2 processes them without
+    holding the GIL, while the event loop goes on reading the next chunk.
+
+    A given ``parser`` is used through its feed parser interface and must
+    not be used concurrently by other ``aparse()`` calls.  By default, a
+    copy of the default parser is used.
+    """
+    if parser is None:
+        parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()._copy()
+    elif base_url is not None:
+        parser = parser._copy()
+    if base_url is not None:
+        parser._setBaseURL(base_url)
+    result = await _afeed_parser(parser, source, executor, chunk_size)
+    if parser.target is not None:
+        return result
+    return (<_Element>result).getroottree()
+
+
 def adopt_external_document(capsule, _BaseParser parser=None):
     """adopt_external_document(capsule, parser=None)
 
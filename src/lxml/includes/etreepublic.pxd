@@ -49,6 +49,13 @@ cdef extern from "etree_api.h":
         cdef ElementClassLookup fallback
         cdef object (*_fallback_function)(object, _Document, tree.xmlNode*)
 
+    cdef class lxml.etree.ParserTargetBase [ object LxmlParserTargetBase ]:
+        cdef object (*_start_function)(object, object, object, object)
+        cdef object (*_end_function)(object, object)
+        cdef int (*_data_function)(object, object) except -1
+        cdef object (*_comment_function)(object, object)
+        cdef object (*_pi_function)(object, object, object)
+
 
     ##########################################################################
     # locking documents for reading and writing
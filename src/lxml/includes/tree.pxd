@@ -409,6 +409,12 @@ cdef extern from "libxml/tree.h" nogil:
     cdef void xmlBufferFree(xmlBuffer* buf)
     cdef const_xmlChar* xmlBufferContent(xmlBuffer* buf)
     cdef int xmlBufferLength(xmlBuffer* buf)
+    cdef void xmlBufferEmpty(xmlBuffer* buf)
+    cdef void xmlBufferWriteQuotedString(xmlBuffer* buf, const_xmlChar* string)
+    cdef void xmlAttrSerializeTxtContent(xmlBuffer* buf, xmlDoc* doc,
+                                         xmlAttr* attr, const_xmlChar* string)
+    cdef xmlDtd* xmlGetIntSubset(xmlDoc* doc)
+    cdef int xmlIsXHTML(const_xmlChar* systemID, const_xmlChar* publicID)
     cdef const_xmlChar* xmlBufContent(xmlBuf* buf) # new in libxml2 2.9
     cdef size_t xmlBufUse(xmlBuf* buf) # new in libxml2 2.9
     cdef int xmlKeepBlanksDefault(int val)
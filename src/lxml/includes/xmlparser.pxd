@@ -77,6 +77,7 @@ cdef extern from "libxml/tree.h" nogil:
         startElementSAXFunc             startElement
         endElementSAXFunc               endElement
         charactersSAXFunc               characters
+        charactersSAXFunc               ignorableWhitespace
         cdataBlockSAXFunc               cdataBlock
         referenceSAXFunc                reference
         getEntitySAXFunc                getEntity
@@ -183,6 +184,9 @@ cdef extern from "libxml/parser.h" nogil:
         bint validate
         xmlError lastError
         xmlNode* node
+        int nodelen
+        int nodemem
+        int nameNr  # depth of the open elements
         xmlSAXHandler* sax
         void* userData
         int* spaceTab
@@ -195,6 +199,7 @@ cdef extern from "libxml/parser.h" nogil:
         xmlParserInput* input
         int inputNr
         xmlParserInput* inputTab[]
+        const_xmlChar* encoding
 
     ctypedef enum xmlParserOption:
         XML_PARSE_RECOVER = 0x1                   # recover on errors
@@ -248,6 +253,8 @@ cdef extern from "libxml/parser.h" nogil:
     cdef void xmlClearParserCtxt(xmlParserCtxt* ctxt)
     cdef int xmlParseChunk(xmlParserCtxt* ctxt,
                            char* chunk, int size, int terminate)
+    cdef long xmlByteConsumed(xmlParserCtxt* ctxt)
+    cdef void xmlStopParser(xmlParserCtxt* ctxt)
     cdef xmlDoc* xmlCtxtReadDoc(xmlParserCtxt* ctxt,
                                 char* cur, char* URL, char* encoding,
                                 int options)
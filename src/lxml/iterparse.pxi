@@ -7,7 +7,9 @@ cdef class iterparse:
                   compact=True, resolve_entities='internal', remove_comments=False, \
                   remove_pis=False, strip_cdata=True, encoding=None, \
                   html=False, recover=None, huge_tree=False, schema=None, \
-                  chunk_size=65536)
+                  chunk_size=65536, compression=None, prune=False, extract=None, \
+                  checkpoints=False, resume=None, columnar=False, progress=None, \
+                  progress_interval=1048576)
 
     Incremental parser.
 
@@ -63,6 +65,47 @@ cdef class iterparse:
     - schema: an XMLSchema to validate against
     - chunk_size: the number of bytes to read from the 'source' in one chunk
       (default: 65536)
+    - compression: decompress the input, one of 'gzip', 'bz2', 'xz', 'zstd',
+      or 'auto' to detect the format from the input data (default: None)
+    - prune: discard each element of an 'end' event from the tree when
+      the iteration advances, together with everything that precedes it
+      in the document, except for its ancestors.  This keeps the memory
+      usage constant for arbitrarily long sequences of records that are
+      selected with the ``tag`` argument, which is required.  Elements
+      inside of a selected ancestor are kept until the 'end' event of
+      that ancestor.  Cannot be used together with DTD validation.
+      (default: False)
+    - extract: a dict that maps keys to simple paths, or a sequence of
+      paths, to extract from each element that the ``tag`` argument
+      selects.  Instead of event tuples, the iterator then returns a dict
+      (or tuple) of values per element, as ``findtext()`` would find them
+      for each path, or the attribute value for a path that ends with an
+      ``@name`` step.  No Element objects are created for this, and each
+      element is discarded from the tree after the extraction, together
+      with the content that precedes it in its parent.  Only child,
+      descendant and wildcard steps are supported.  Can only be used with
+      'end' events and not together with DTD validation.  (default: None)
+    - checkpoints: enable the ``checkpoint()`` method, which reports the
+      byte offset after the last top-level element whose 'end' event was
+      returned, together with the open ancestors.  (default: False)
+    - resume: a checkpoint to continue parsing from.  The ``source`` must
+      be seekable and is read from the checkpoint's offset on.  Cannot be
+      used together with ``compression``.  (default: None)
+    - columnar: instead of building a tree and returning event tuples, return
+      the 'start', 'end' and 'text' events in batches of C arrays, one batch
+      per chunk of input.  Their columns hold the event types, depths, tag
+      name ids, text offsets into a shared UTF-8 buffer and attribute ranges,
+      and support the buffer protocol for wrapping them without copies, e.g.
+      in NumPy.  Attributes are reported with 'start' events.  Cannot be used
+      with HTML or together with the ``tag``, ``prune``, ``extract``,
+      ``checkpoints``, ``resume`` and ``dtd_validation`` options.
+      (default: False)
+    - progress: a callable that receives a dict of counters each time another
+      ``progress_interval`` bytes (default: 1 MiB) of input were parsed and
+      once the input is complete, with the ``bytes_read``, the number of
+      ``events`` and ``elements`` so far, the current ``depth``, the
+      ``elapsed`` time in seconds and the ``elements_per_second``.
+      (default: None)
     """
     cdef _FeedParser _parser
     cdef object _tag
@@ -72,7 +115,9 @@ cdef class iterparse:
     cdef object _filename
     cdef object _error
     cdef object _chunk_size
+    cdef _Element _processed_element
     cdef bint _close_source_after_read
+    cdef bint _prune
 
     def __init__(self, source, events=("end",), *, tag=None,
                  attribute_defaults=False, dtd_validation=False,
@@ -80,7 +125,35 @@ cdef class iterparse:
                  compact=True, resolve_entities='internal', remove_comments=False,
                  remove_pis=False, strip_cdata=True, encoding=None,
                  html=False, recover=None, huge_tree=False, collect_ids=True,
-                 XMLSchema schema=None, int chunk_size=65536):
+                 XMLSchema schema=None, int chunk_size=65536, compression=None,
+                 bint prune=False, extract=None, bint checkpoints=False, resume=None,
+                 bint columnar=False, progress=None, progress_interval=1048576):
+        cdef _RecordExtraction extraction = None
+        cdef _EventColumnsBuilder columns = None
+        if columnar:
+            for option, value in [('html', html), ('tag', tag is not None), ('prune', prune),
+                                  ('extract', extract is not None), ('checkpoints', checkpoints),
+                                  ('resume', resume is not None), ('dtd_validation', dtd_validation)]:
+                if value:
+                    raise ValueError(f"cannot use '{option}' together with 'columnar'")
+            columns = _newEventColumnsBuilder(events)
+            events = ()
+        if resume is not None and compression is not None:
+            raise ValueError("cannot use 'resume' together with 'compression'")
+        if prune:
+            if dtd_validation:
+                raise ValueError("cannot use 'prune' together with 'dtd_validation'")
+            if tag is None or tag == '*':
+                raise ValueError("'prune' requires a 'tag' that selects the records")
+        if extract is not None:
+            if prune:
+                raise ValueError("cannot use 'extract' together with 'prune'")
+            if dtd_validation:
+                raise ValueError("cannot use 'extract' together with 'dtd_validation'")
+            if set(events) != {'end'}:
+                raise ValueError("'extract' can only be used with 'end' events")
+            extraction = _newRecordExtraction(tag, extract)
+            events, tag = (), None
         if not hasattr(source, 'read'):
             source = _getFSPathOrObject(source)
             self._filename = source
@@ -90,6 +163,8 @@ cdef class iterparse:
             self._filename = _getFilenameForFile(source)
             self._source = source
             self._close_source_after_read = False
+        if resume is not None:
+            self._source.seek(resume['offset'])
 
         if recover is None:
             recover = html
@@ -103,6 +178,7 @@ cdef class iterparse:
                 tag=tag,
                 recover=recover,
                 base_url=self._filename,
+                compression=compression,
                 encoding=encoding,
                 remove_blank_text=remove_blank_text,
                 remove_comments=remove_comments,
@@ -110,13 +186,18 @@ cdef class iterparse:
                 no_network=no_network,
                 target=None,  # TODO
                 schema=schema,
-                compact=compact)
+                compact=compact,
+                checkpoints=checkpoints,
+                resume=resume,
+                progress=progress,
+                progress_interval=progress_interval)
         else:
             parser = XMLPullParser(
                 events,
                 tag=tag,
                 recover=recover,
                 base_url=self._filename,
+                compression=compression,
                 encoding=encoding,
                 attribute_defaults=attribute_defaults,
                 dtd_validation=dtd_validation,
@@ -131,9 +212,16 @@ cdef class iterparse:
                 strip_cdata=strip_cdata,
                 collect_ids=True,
                 target=None,  # TODO
-                compact=compact)
+                compact=compact,
+                checkpoints=checkpoints,
+                resume=resume,
+                progress=progress,
+                progress_interval=progress_interval)
 
         self._chunk_size = chunk_size
+        self._prune = prune
+        (<_BaseParser>parser)._extraction = extraction
+        (<_BaseParser>parser)._columns = columns
         self._events = parser.read_events()
         self._parser = parser
 
@@ -154,6 +242,19 @@ cdef class iterparse:
         """The version of the underlying XML parser."""
         return self._parser.version
 
+    def checkpoint(self):
+        """checkpoint(self)
+
+        Returns a checkpoint for the position after the last top-level
+        element (i.e. child of the root element) whose 'end' event was
+        returned, or None if there is none yet.  Requires ``checkpoints=True``.
+
+        The checkpoint is a dict of plain values that can be stored as JSON.
+        Passing it as ``resume`` argument into a new ``iterparse()`` for the
+        same input continues parsing after that element.
+        """
+        return self._parser.checkpoint()
+
     def set_element_class_lookup(self, ElementClassLookup lookup = None):
         """set_element_class_lookup(self, lookup = None)
 
@@ -191,6 +292,60 @@ cdef class iterparse:
         return self
 
     def __next__(self):
+        if self._processed_element is not None:
+            element, self._processed_element = self._processed_element, None
+            _pruneProcessedElement(
+                element, <_SaxParserContext>self._parser._getPushParserContext())
+        event = self._next_event()
+        if self._prune and event[0] == 'end':
+            self._processed_element = event[1]
+        return event
+
+    def iter_batches(self, max_events=1024):
+        """iter_batches(self, max_events=1024)
+
+        Returns an iterator over lists of parse events, each with at least
+        one and at most ``max_events`` of them.  It reads input as needed
+        and continues from the current position of this iterator.  This
+        avoids the overhead of retrieving the events one by one.
+
+        With ``prune=True``, the elements of the 'end' events in a list are
+        discarded when requesting the next list.
+        """
+        cdef Py_ssize_t c_max_events = max_events
+        if c_max_events < 1:
+            raise ValueError(f"invalid number of events: {max_events}")
+        while True:
+            batch = self._next_batch(c_max_events)
+            if batch is None:
+                return
+            yield batch
+
+    @cython.final
+    cdef list _next_batch(self, Py_ssize_t max_events):
+        cdef Py_ssize_t i
+        if self._processed_element is not None:
+            element, self._processed_element = self._processed_element, None
+            _pruneProcessedElement(
+                element, <_SaxParserContext>self._parser._getPushParserContext())
+        batch = (<_ParseEventsIterator>self._events).next_batch(max_events)
+        if not batch:
+            try:
+                batch.append(self._next_event())
+            except StopIteration:
+                return None
+            if max_events > 1:
+                batch += (<_ParseEventsIterator>self._events).next_batch(max_events - 1)
+        if self._prune:
+            # discarding the last element also discards all elements before it
+            for i in range(len(batch) - 1, -1, -1):
+                if batch[i][0] == 'end':
+                    self._processed_element = batch[i][1]
+                    break
+        return batch
+
+    @cython.final
+    cdef _next_event(self):
         try:
             return next(self._events)
         except StopIteration:
@@ -234,11 +389,264 @@ cdef class iterparse:
                 self.root = self._parser.close()
             finally:
                 self._close_source()
+                if context._columns is not None:
+                    context._columns.flushInto(context.events_iterator._events, True)
             return True
-        self._parser.feed(data)
+        try:
+            self._parser.feed(data)
+        finally:
+            if context._columns is not None:
+                context._columns.flushInto(context.events_iterator._events, False)
         return False
 
 
+cdef int _pruneProcessedElement(_Element element, _SaxParserContext context) except -1:
+    """Discard an element from the tree that is being parsed, together with
+    all nodes that precede it in document order, except for its ancestors.
+
+    Elements inside of an ancestor that still awaits its own 'end' event
+    are kept, so that the ancestor is complete when it gets returned.
+    """
+    cdef xmlparser.xmlParserCtxt* c_ctxt = context._c_ctxt
+    cdef xmlNode* c_element = element._c_node
+    cdef xmlNode* c_node = c_element
+    cdef xmlNode* c_parent
+    if c_node is NULL or c_node.doc is not c_ctxt.myDoc:
+        # already moved to a different tree
+        return 0
+    c_parent = c_node.parent
+    if c_parent is NULL or not _isElement(c_parent):
+        # detached or root element
+        return 0
+    while c_parent is not NULL and _isElement(c_parent):
+        if context._matcher is None or context._matcher.matches(c_parent):
+            # pruned later on, together with the ancestor
+            return 0
+        c_parent = c_parent.parent
+    c_parent = c_node.parent
+    doc = element._doc
+    while c_parent is not NULL and _isElement(c_parent):
+        while c_parent.children is not c_node:
+            _removeNode(doc, c_parent.children)
+        c_node = c_parent
+        c_parent = c_node.parent
+    _removeNode(doc, c_element)
+    # The SAX2 tree builder tracks the buffer of the last text node for
+    # appending to it.  Make it use a safe (re-)allocation on append.
+    c_ctxt.nodemem = 0
+    return 0
+
+
+def iterparse_parallel(source, record_tag, *, workers=None, bint ordered=True,
+                       shard_size=16*1024*1024, _BaseParser parser=None):
+    """iterparse_parallel(source, record_tag, *, workers=None, ordered=True, \
+                          shard_size=16*1024*1024, parser=None)
+
+    Parse a document that consists of a root element wrapping many
+    independent records in parallel and return an iterator over the
+    record elements.
+
+    The ``source`` must be a local file, given as file name/path or as a
+    file object with a ``.fileno()``.  It gets memory mapped and cut into
+    shards of about ``shard_size`` bytes right before a start tag of a
+    record, which is found by its literal tag name ``record_tag`` as it
+    appears in the document, e.g. ``'record'`` or ``'p:record'``.
+
+    Each shard is wrapped in a copy of the document prolog and the root
+    start tag, which includes its namespace declarations, and parsed as a
+    separate document on a pool of ``workers`` threads (default: the number
+    of CPUs).  Each thread uses its own copy of the ``parser`` (or the
+    default parser).  Elements of the root that are not records are
+    discarded.  The parent of a record is a copy of the root element that
+    only holds the records of its shard.  Line numbers are counted per shard.
+
+    By default, the records are returned in document order.  Pass
+    ``ordered=False`` to receive the records of each shard as soon as it
+    is parsed.
+
+    The records must be self-contained.  Their start tag must not appear
+    inside of records, also not in comments or CDATA sections.  Documents
+    that do not use an ASCII compatible encoding like UTF-8, or where the
+    root element cannot be located, are parsed in one piece.
+
+    Parse errors are raised by the iterator when it reaches the failing
+    shard.  The iteration can continue afterwards.  Parser targets are not
+    supported.
+
+    To stop early, call the ``close()`` method of the iterator or use it as
+    a context manager.  This cancels the pending shards and unmaps the file.
+    """
+    cdef _ParseShardsIterator shards
+    if parser is None:
+        parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+    if parser.target is not None:
+        raise ValueError("iterparse_parallel() does not support parser targets")
+    if workers is None:
+        import os
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"invalid number of workers: {workers}")
+    if shard_size < 1:
+        raise ValueError(f"invalid shard size: {shard_size}")
+    tag_utf = _utf8(record_tag)
+    prefix_utf, _, name_utf = tag_utf.rpartition(b':')
+    _tagValidOrRaise(name_utf)
+    if prefix_utf:
+        _prefixValidOrRaise(prefix_utf)
+    else:
+        prefix_utf = None
+
+    data, url = _mapSourceFile(source)
+    header = footer = b''
+    bounds = [(0, len(data))]
+    match = _match_root_start_tag(data) if data[:4].find(b'\0') == -1 else None
+    if match is not None and data[match.end() - 2] != b'/'[0]:
+        end_tag = b'</' + match.group(1)
+        root_end = data.rfind(end_tag, match.end())
+        if root_end != -1:
+            header, footer = data[:match.end()], end_tag + b'>'
+            bounds = _iterShardBounds(data, match.end(), root_end, b'<' + tag_utf, shard_size)
+
+    shards = _ParseShardsIterator(bounds, parser, workers, ordered)
+    shards._data = data
+    shards._header = header
+    shards._footer = footer
+    shards._url = url
+    shards._name_utf = name_utf
+    shards._prefix_utf = prefix_utf
+    return shards
+
+
+cdef object _match_root_start_tag = re.compile(
+    br'(?:\xef\xbb\xbf)?'
+    br'(?:\s+|<\?.*?\?>|<!--.*?-->|<!DOCTYPE(?:[^\[>]|\[.*?\])*>)*'
+    br'<([^\s/>!?]+)(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.S).match
+
+
+cdef tuple _mapSourceFile(source):
+    """Return a read-only memory mapping of a local file (or its empty
+    content) and its URL.
+    """
+    import mmap, os
+    source = _getFSPathOrObject(source)
+    if _isString(source):
+        url = source
+        file = open(source, 'rb')
+    else:
+        url = _getFilenameForFile(source)
+        file = source
+        try:
+            file.fileno()
+        except (AttributeError, OSError, ValueError):
+            raise TypeError, f"cannot memory map '{python._fqtypename(source)}'"
+    try:
+        fileno = file.fileno()
+        if os.fstat(fileno).st_size == 0:
+            # Empty files cannot be mapped.
+            return b'', url
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ), url
+    finally:
+        if file is not source:
+            file.close()
+
+
+def _iterShardBounds(data, Py_ssize_t start, Py_ssize_t end, bytes marker,
+                     Py_ssize_t shard_size):
+    """Yield (start, end) tuples of the shards, splitting the data before a
+    marker that is followed by a character that terminates the tag name.
+    """
+    cdef Py_ssize_t split
+    while start < end:
+        split = start + shard_size
+        while split < end:
+            split = data.find(marker, split, end)
+            if split == -1:
+                break
+            if split + len(marker) < end and data[split + len(marker)] in b' \t\r\n/>':
+                break
+            split += 1
+        if split == -1 or split > end:
+            split = end
+        yield (start, split)
+        start = split
+
+
+@cython.final
+@cython.internal
+cdef class _ParseShardsIterator(_ParseManyIterator):
+    """Parses the shards of a memory mapped document on a thread pool and
+    returns their record elements.
+    """
+    cdef object _data
+    cdef bytes _header
+    cdef bytes _footer
+    cdef object _url
+    cdef bytes _name_utf
+    cdef bytes _prefix_utf
+
+    cdef list _records
+    cdef Py_ssize_t _record_index
+
+    def __next__(self):
+        while self._records is None or self._record_index >= len(self._records):
+            self._records = None
+            try:
+                self._records = _ParseManyIterator.__next__(self)
+            except StopIteration:
+                # all shards are parsed, so the mapping is no longer in use
+                self._closeData()
+                raise
+            self._record_index = 0
+        record = self._records[self._record_index]
+        self._record_index += 1
+        return record
+
+    def close(self):
+        """close(self)
+
+        Stops the iteration, cancels the pending parser runs and unmaps
+        the file after the running ones have finished.
+        """
+        self._records = None
+        self._shutdown(cancel=True, wait=True)
+        self._closeData()
+
+    cdef _closeData(self):
+        if self._data is not None and hasattr(self._data, 'close'):
+            self._data.close()
+        self._data = None
+
+    def _parse(self, bounds):
+        start, end = bounds
+        text = bytearray(self._header)
+        text += memoryview(self._data)[start:end]
+        text += self._footer
+        doc = _parseMemoryDocument(text, self._url, self._threadParser())
+        return _collectRecords(doc, self._name_utf, self._prefix_utf)
+
+
+cdef list _collectRecords(_Document doc, bytes name_utf, bytes prefix_utf):
+    """Return the child elements of the root that match the record name.
+    """
+    cdef xmlNode* c_node
+    records = []
+    c_node = tree.xmlDocGetRootElement(doc._c_doc)
+    if c_node is NULL:
+        return records
+    c_node = c_node.children
+    while c_node is not NULL:
+        if c_node.type == tree.XML_ELEMENT_NODE and \
+                tree.xmlStrcmp(c_node.name, _xcstr(name_utf)) == 0:
+            if prefix_utf is None:
+                if c_node.ns is NULL or c_node.ns.prefix is NULL:
+                    records.append(_elementFactory(doc, c_node))
+            elif c_node.ns is not NULL and c_node.ns.prefix is not NULL:
+                if tree.xmlStrcmp(c_node.ns.prefix, _xcstr(prefix_utf)) == 0:
+                    records.append(_elementFactory(doc, c_node))
+        c_node = c_node.next
+    return records
+
+
 cdef enum _IterwalkSkipStates:
     IWSKIP_NEXT_IS_START
     IWSKIP_SKIP_NEXT
@@ -246,8 +654,14 @@ cdef enum _IterwalkSkipStates:
     IWSKIP_CANNOT_SKIP
 
 
+cdef enum _IterwalkNodeStates:
+    IWNODE_ENTER      # 'start' event of the node is pending
+    IWNODE_DESCEND    # children of the node are pending
+    IWNODE_ASCEND     # 'end' event of the node is pending
+
+
 cdef class iterwalk:
-    """iterwalk(self, element_or_tree, events=("end",), tag=None)
+    """iterwalk(self, element_or_tree, events=("end",), tag=None, skip=None)
 
     A tree walker that generates events from an existing tree as if it
     was parsing XML data with ``iterparse()``.
@@ -257,9 +671,19 @@ cdef class iterwalk:
 
     After receiving a 'start' or 'start-ns' event, the children and
     descendants of the current element can be excluded from iteration
-    by calling the ``skip_subtree()`` method.
+    by calling the ``skip_subtree()`` method.  The ``skip`` argument
+    takes a tag or a sequence of tags whose elements are never descended
+    into, as if ``skip_subtree()`` was called for each of them.
+
+    When only 'start' and 'end' events are requested and a ``tag`` or
+    ``skip`` filter is used, the walker traverses the tree at the C level
+    and only creates Element objects for the elements that it returns.
     """
     cdef _MultiTagMatcher _matcher
+    cdef _MultiTagMatcher _skip_matcher
+    cdef _Element _top
+    cdef _Element _position
+    cdef _IterwalkNodeStates _position_state
     cdef list   _node_stack
     cdef list   _events
     cdef object _pop_event
@@ -268,7 +692,7 @@ cdef class iterwalk:
     cdef int    _event_filter
     cdef _IterwalkSkipStates _skip_state
 
-    def __init__(self, element_or_tree, events=("end",), tag=None):
+    def __init__(self, element_or_tree, events=("end",), tag=None, skip=None):
         cdef _Element root
         cdef int ns_count
         root = _rootNodeOrRaise(element_or_tree)
@@ -277,12 +701,35 @@ cdef class iterwalk:
             self._matcher = None
         else:
             self._matcher = _MultiTagMatcher.__new__(_MultiTagMatcher, tag)
+        if skip is None:
+            self._skip_matcher = None
+        else:
+            self._skip_matcher = _MultiTagMatcher.__new__(_MultiTagMatcher, skip)
         self._node_stack  = []
         self._events = []
         self._pop_event = self._events.pop
         self._skip_state = IWSKIP_CANNOT_SKIP  # ignore all skip requests by default
 
-        if self._event_filter:
+        if self._event_filter and (
+                self._matcher is not None or self._skip_matcher is not None) and not (
+                self._event_filter & ~(PARSE_EVENT_FILTER_START | PARSE_EVENT_FILTER_END)):
+            # Walk the C tree and create proxies only for the returned elements.
+            self._index = -1
+            self._top = root
+            doc = root._doc
+            doc.lock_read()
+            try:
+                if self._event_filter & PARSE_EVENT_FILTER_START:
+                    if self._matcher is not None:
+                        self._matcher.cacheTags(doc)
+                    if self._matcher is None or self._matcher.matches(root._c_node):
+                        self._events.append( ("start", root) )
+                        self._skip_state = IWSKIP_NEXT_IS_START
+            finally:
+                doc.unlock_read()
+            self._position = root
+            self._position_state = IWNODE_DESCEND
+        elif self._event_filter:
             self._index = 0
             doc = root._doc
             doc.lock_read()
@@ -319,14 +766,19 @@ cdef class iterwalk:
         cdef int ns_count = 0
         if self._events:
             return self._next_event()
+        if self._position is not None:
+            return self._walk_next()
 
         doc = None
         try:
-            if self._matcher is not None and self._index >= 0:
+            if (self._matcher is not None or self._skip_matcher is not None) and self._index >= 0:
                 node = self._node_stack[self._index][0]
                 doc = node._doc
                 doc.lock_read()
-                self._matcher.cacheTags(doc)
+                if self._matcher is not None:
+                    self._matcher.cacheTags(doc)
+                if self._skip_matcher is not None:
+                    self._skip_matcher.cacheTags(doc)
 
             # find next node
             while self._index >= 0:
@@ -339,7 +791,9 @@ cdef class iterwalk:
                     doc = node._doc
                     doc.lock_read()
 
-                if self._skip_state == IWSKIP_SKIP_NEXT:
+                if self._skip_state == IWSKIP_SKIP_NEXT or (
+                        self._skip_matcher is not None and
+                        self._skip_matcher.matches(node._c_node)):
                     c_child = NULL
                 else:
                     c_child = self._process_non_elements(
@@ -378,6 +832,73 @@ cdef class iterwalk:
 
         raise StopIteration
 
+    @cython.final
+    cdef _walk_next(self):
+        """Find the next 'start' or 'end' event by walking the C tree.
+
+        The element at the current position is kept alive by a proxy,
+        so that changes to the tree between events cannot free it.
+        """
+        cdef _Document doc = self._position._doc
+        cdef xmlNode* c_top = self._top._c_node
+        cdef xmlNode* c_node = self._position._c_node
+        cdef xmlNode* c_next
+        cdef xmlNode* c_end
+        cdef _IterwalkNodeStates state = self._position_state
+        cdef bint skip_children = self._skip_state == IWSKIP_SKIP_NEXT
+        self._skip_state = IWSKIP_CANNOT_SKIP
+        doc.lock_read()
+        try:
+            if self._matcher is not None:
+                self._matcher.cacheTags(doc)
+            if self._skip_matcher is not None:
+                self._skip_matcher.cacheTags(doc)
+
+            while c_node is not NULL:
+                if state == IWNODE_ENTER:
+                    state = IWNODE_DESCEND
+                    if self._event_filter & PARSE_EVENT_FILTER_START and (
+                            self._matcher is None or self._matcher.matches(c_node)):
+                        self._position = _elementFactory(doc, c_node)
+                        self._position_state = state
+                        self._skip_state = IWSKIP_CAN_SKIP
+                        return ("start", self._position)
+                elif state == IWNODE_DESCEND:
+                    if skip_children or (
+                            self._skip_matcher is not None and
+                            self._skip_matcher.matches(c_node)):
+                        c_next = NULL
+                    else:
+                        c_next = _nextTreeElement(_findChildForwards(c_node, 0))
+                    skip_children = False
+                    if c_next is NULL:
+                        state = IWNODE_ASCEND
+                    else:
+                        c_node = c_next
+                        state = IWNODE_ENTER
+                else:
+                    c_end = c_node
+                    c_next = NULL if c_node is c_top else _nextTreeElement(_nextElement(c_node))
+                    if c_next is not NULL:
+                        c_node = c_next
+                        state = IWNODE_ENTER
+                    elif c_node is c_top or c_node.parent is NULL or not _isElement(c_node.parent):
+                        # done, or the element was removed from the tree
+                        c_node = NULL
+                    else:
+                        c_node = c_node.parent
+                    if self._event_filter & PARSE_EVENT_FILTER_END and (
+                            self._matcher is None or self._matcher.matches(c_end)):
+                        event = ("end", _elementFactory(doc, c_end))
+                        self._position = None if c_node is NULL else _elementFactory(doc, c_node)
+                        self._position_state = state
+                        return event
+        finally:
+            doc.unlock_read()
+
+        self._position = None
+        raise StopIteration
+
     @cython.final
     cdef xmlNode* _process_non_elements(self, _Document doc, xmlNode* c_node):
         while c_node is not NULL and c_node.type != tree.XML_ELEMENT_NODE:
@@ -444,6 +965,13 @@ cdef class iterwalk:
         return node
 
 
+cdef inline xmlNode* _nextTreeElement(xmlNode* c_node) noexcept:
+    # skip over comments, PIs and entity references
+    while c_node is not NULL and c_node.type != tree.XML_ELEMENT_NODE:
+        c_node = _nextElement(c_node)
+    return c_node
+
+
 cdef int _countNsDefs(xmlNode* c_node) noexcept:
     cdef xmlNs* c_ns
     cdef int count
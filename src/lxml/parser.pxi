@@ -3,6 +3,8 @@
 from lxml.includes cimport xmlparser
 from lxml.includes cimport htmlparser
 
+from cpython.time cimport perf_counter_ns
+
 cdef object _GenericAlias
 try:
     from types import GenericAlias as _GenericAlias
@@ -44,6 +46,13 @@ class ParserError(LxmlError):
     """
 
 
+# Read-only string dictionary that new parser dictionaries are based on.
+# Strings in it are only looked up but never added after its creation,
+# which allows all threads to share it without further locking.
+cdef tree.xmlDict* _shared_parser_dict = NULL
+cdef cython.pymutex _shared_parser_dict_lock
+
+
 @cython.final
 @cython.internal
 cdef class _ParserDictionary:
@@ -52,7 +61,11 @@ cdef class _ParserDictionary:
     cdef tree.xmlDict* _c_dict
 
     def __cinit__(self):
-        self._c_dict = tree.xmlDictCreate()
+        with _shared_parser_dict_lock:
+            if _shared_parser_dict is not NULL:
+                self._c_dict = tree.xmlDictCreateSub(_shared_parser_dict)
+            else:
+                self._c_dict = tree.xmlDictCreate()
         if not self._c_dict:
             raise MemoryError()
 
@@ -74,6 +87,9 @@ cdef class _ParserDictionary:
     cdef size_t getDictSize(self) noexcept:
         return tree.xmlDictSize(self._c_dict)
 
+    cdef int addNames(self, names) except -1:
+        return _addDictNames(self._c_dict, names)
+
     cdef void initDictRef(self, tree.xmlDict** c_dict_ref) noexcept:
         c_dict = c_dict_ref[0]
         if c_dict is self._c_dict:
@@ -190,6 +206,80 @@ cdef class _ParserDictionaryContext:
 cdef _ParserDictionaryContext __GLOBAL_PARSER_CONTEXT = _ParserDictionaryContext()
 __GLOBAL_PARSER_CONTEXT.initMainParserContext()
 
+
+cdef int _addDictNames(tree.xmlDict* c_dict, names) except -1:
+    """Add the names of a tree or an iterable of names to a string dictionary.
+    """
+    cdef xmlNode* c_node
+    cdef xmlNode* c_top
+    cdef tree.xmlAttr* c_attr
+    cdef tree.xmlNs* c_ns
+    if isinstance(names, (_Element, _ElementTree, _Document)):
+        c_top = _rootNodeOrRaise(names)._c_node
+        c_node = c_top
+        tree.BEGIN_FOR_EACH_ELEMENT_FROM(c_top, c_node, 1)
+        _dictLookup(c_dict, c_node.name)
+        c_ns = c_node.nsDef
+        while c_ns is not NULL:
+            if c_ns.prefix is not NULL:
+                _dictLookup(c_dict, c_ns.prefix)
+            c_ns = c_ns.next
+        c_attr = c_node.properties
+        while c_attr is not NULL:
+            _dictLookup(c_dict, c_attr.name)
+            c_attr = c_attr.next
+        tree.END_FOR_EACH_ELEMENT_FROM(c_node)
+    else:
+        for name in names:
+            ns, name = _getNsTag(name)
+            _dictLookup(c_dict, _xcstr(name))
+    return 0
+
+
+cdef inline int _dictLookup(tree.xmlDict* c_dict, const_xmlChar* c_name) except -1:
+    if tree.xmlDictLookup(c_dict, c_name, -1) is NULL:
+        raise MemoryError()
+    return 0
+
+
+def freeze_parser_dict(names=None):
+    """freeze_parser_dict(names=None)
+
+    Creates a read-only string dictionary from the given tag and attribute
+    names and shares it between all parser dictionaries that get created
+    afterwards, in all threads.
+
+    The ``names`` can be an iterable of names (also in ``{namespace}name``
+    notation) or a sample document (ElementTree or Element) whose tag names,
+    attribute names and namespace prefixes are used.
+
+    Parsers look up known names in the shared dictionary without copying
+    them into their own dictionary.  This avoids the warm-up and the memory
+    for each parser (and thus each thread) that parses the same kind of
+    documents.  Moving trees between parsers or threads also does not need
+    to re-assign names that are contained in the shared dictionary.
+
+    Only parser dictionaries that are created after this call, i.e. when a
+    parser is used for the first time, are based on the new dictionary.
+    Calling this function without names stops sharing a dictionary.
+    """
+    global _shared_parser_dict
+    cdef tree.xmlDict* c_dict = NULL
+    if names is not None:
+        c_dict = tree.xmlDictCreate()
+        if c_dict is NULL:
+            raise MemoryError()
+        try:
+            _addDictNames(c_dict, names)
+        except:
+            tree.xmlDictFree(c_dict)
+            raise
+    with _shared_parser_dict_lock:
+        c_dict, _shared_parser_dict = _shared_parser_dict, c_dict
+    if c_dict is not NULL:
+        # parser dictionaries that are based on it keep their own reference
+        tree.xmlDictFree(c_dict)
+
 ############################################################
 ## support for Python unicode I/O
 ############################################################
@@ -258,6 +348,43 @@ cdef const_char* _findEncodingName(const_xmlChar* buffer, int size) noexcept:
         # returns a constant char*, no need to free it
         return tree.xmlGetCharEncodingName(enc)
 
+# Python codec names of encodings that libxml2 decodes with its own
+# built-in handlers, mapped to the names it knows them by.  Other names
+# for them (like "utf8" or "latin1") would make libxml2 look for a
+# generic and slower iconv converter instead.
+cdef dict _BUILTIN_PARSER_ENCODINGS = {
+    'ascii': b'ASCII',
+    'iso8859-1': b'ISO-8859-1',
+    'utf-8': b'UTF-8',
+    'utf-16-be': b'UTF-16BE',
+    'utf-16-le': b'UTF-16LE',
+}
+
+# cache of validated encoding names of parsers
+cdef dict _parser_encoding_names = {}
+
+cdef bytes _findParserEncodingName(encoding):
+    """Return the name of the encoding under which libxml2 finds its
+    preferred decoder, or raise LookupError for unknown encodings.
+    """
+    cdef tree.xmlCharEncodingHandler* enchandler
+    c_name = _parser_encoding_names.get(encoding)
+    if c_name is not None:
+        return c_name
+    if isinstance(encoding, str):
+        try:
+            c_name = _BUILTIN_PARSER_ENCODINGS.get(codecs_lookup(encoding).name)
+        except LookupError:
+            pass  # maybe known to libxml2
+    if c_name is None:
+        c_name = _utf8(encoding)
+        enchandler = tree.xmlFindCharEncodingHandler(_cstr(c_name))
+        if enchandler is NULL:
+            raise LookupError, f"unknown encoding: '{c_name.decode('UTF-8')}'"
+        tree.xmlCharEncCloseFunc(enchandler)
+    _parser_encoding_names[encoding] = c_name
+    return c_name
+
 # Python 3.12 removed support for "Py_UNICODE".
 if python.PY_VERSION_HEX < 0x030C0000:
     _setupPythonUnicode()
@@ -308,6 +435,8 @@ cdef class _FileReaderContext:
     cdef Py_ssize_t _bytes_read
     cdef const char* _c_url
     cdef bint _close_file_after_read
+    cdef _ParseStats _stats
+    cdef _ParseProgress _progress
 
     def __cinit__(self, filelike, exc_context not None, url, encoding=None, bint close_file=False):
         self._exc_context = exc_context
@@ -393,7 +522,13 @@ cdef class _FileReaderContext:
             return result  # swallow any exceptions
 
     cdef bytes _readBytes(self, count):
-        data = self._filelike.read(count)
+        cdef stdint.int64_t start_time
+        if self._stats is not None:
+            start_time = perf_counter_ns()
+            data = self._filelike.read(count)
+            self._stats._io_time_ns += perf_counter_ns() - start_time
+        else:
+            data = self._filelike.read(count)
         if isinstance(data, bytes):
             return <bytes> data
         elif isinstance(data, str):
@@ -428,6 +563,11 @@ cdef class _FileReaderContext:
                 if remaining == 0:
                     self._bytes_read = -1
                     self._close_file()
+                    if self._stats is not None:
+                        self._stats._bytes_read += c_byte_count
+                    if self._progress is not None:
+                        self._progress._bytes_read += c_byte_count
+                        self._progress.update()
                     return c_byte_count
                 self._bytes_read = 0
 
@@ -436,6 +576,11 @@ cdef class _FileReaderContext:
                 cstring_h.memcpy(c_buffer, c_start, c_requested)
                 c_byte_count += c_requested
                 self._bytes_read += c_requested
+            if self._stats is not None:
+                self._stats._bytes_read += c_byte_count
+            if self._progress is not None:
+                self._progress._bytes_read += c_byte_count
+                self._progress.update()
         except:
             c_byte_count = -1
             self._exc_context._store_raised()
@@ -483,6 +628,233 @@ cdef class _UnicodeStringReader:
         return data
 
 
+@cython.final
+@cython.internal
+cdef class _ByteBufferReader:
+    # Reads chunks from a bytes-like object that exceeds the size limit of the memory parser.
+    cdef object _data
+    cdef Py_ssize_t _pos
+
+    def __cinit__(self, data):
+        self._data = memoryview(data).cast('B')
+        self._pos = 0
+
+    def read(self, Py_ssize_t count):
+        cdef Py_ssize_t pos = self._pos
+        chunk = self._data[pos : pos + count] if count >= 0 else self._data[pos:]
+        self._pos = pos + len(chunk)
+        if self._pos >= len(self._data):
+            self._data = b''  # a good time to release the buffer
+        return bytes(chunk)
+
+
+############################################################
+## support for compressed input
+############################################################
+
+cdef tuple _COMPRESSION_FORMATS = ('auto', 'gzip', 'bz2', 'xz', 'zstd')
+
+
+cdef object _detectCompression(bytes header):
+    "Guess the compression format from the magic bytes at the start of the input."
+    if header.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    elif header.startswith(b'BZh'):
+        return 'bz2'
+    elif header.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    elif header.startswith(b'\x28\xb5\x2f\xfd'):
+        return 'zstd'
+    return None
+
+
+# Upper limit for the size of each decompressed chunk, so that highly
+# compressed input cannot inflate into huge byte strings in one go.
+cdef Py_ssize_t _DECOMPRESSED_CHUNK_SIZE = 2**18
+
+# The 'zstandard' package cannot limit the output size of a single call,
+# so it receives its input in small pieces instead.
+cdef Py_ssize_t _UNBOUNDED_DECOMPRESSOR_INPUT_SIZE = 2**12
+
+
+cdef tuple _newDecompressor(compression):
+    """Return a new decompressor and whether it supports limiting its output size.
+    """
+    # The stdlib decompressors release the GIL while decompressing.
+    if compression == 'gzip':
+        import zlib
+        return zlib.decompressobj(16 + zlib.MAX_WBITS), True
+    elif compression == 'bz2':
+        import bz2
+        return bz2.BZ2Decompressor(), True
+    elif compression == 'xz':
+        import lzma
+        return lzma.LZMADecompressor(), True
+    elif compression == 'zstd':
+        try:
+            from compression.zstd import ZstdDecompressor  # Python 3.14+
+        except ImportError:
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError(
+                    "Decompressing zstd input requires Python 3.14 or the 'zstandard' package")
+            return zstandard.ZstdDecompressor().decompressobj(), False
+        return ZstdDecompressor(), True
+    raise ValueError, f"unsupported compression format: {compression!r}"
+
+
+@cython.final
+@cython.internal
+cdef class _StreamDecompressor:
+    """Incrementally decompresses a stream of compressed input chunks.
+
+    Input is passed with ``push()``, the decompressed output is then read
+    with ``read()`` in chunks of limited size until it returns None.
+
+    The compression 'auto' detects the format from the magic bytes at the
+    start of the stream and passes uncompressed input through unchanged.
+    """
+    cdef object _compression
+    cdef object _format  # None for uncompressed input
+    cdef object _decompressor
+    cdef bint _bounded  # decompressor supports 'max_length'
+    cdef bint _has_output  # decompressor may hold more output without further input
+    cdef bytes _header
+    cdef object _input  # pending input data
+
+    def __cinit__(self, compression):
+        if compression not in _COMPRESSION_FORMATS:
+            raise ValueError, f"unsupported compression format: {compression!r}"
+        self._compression = compression
+        self._header = b''
+
+    cdef int push(self, data) except -1:
+        "Pass the next chunk of input data."
+        if self._decompressor is None:
+            if self._compression != 'auto':
+                self._format = self._compression
+            elif self._header is None or isinstance(data, unicode):
+                # uncompressed input
+                self._header = None
+                self._input = data
+                return 0
+            else:
+                data = self._header + bytes(data)
+                if len(data) < 6:
+                    # wait for enough input to see the magic bytes
+                    self._header = data
+                    return 0
+                self._format = _detectCompression(data)
+                if self._format is None:
+                    self._header = None
+                    self._input = data
+                    return 0
+                self._header = b''
+            self._decompressor, self._bounded = _newDecompressor(self._format)
+        if self._input:
+            self._input = bytes(self._input) + bytes(data)
+        else:
+            self._input = data
+        return 0
+
+    cdef read(self):
+        """Return the next chunk of decompressed data, or None if more input is needed.
+        """
+        if self._decompressor is None:
+            data, self._input = self._input, None
+            return data
+        while True:
+            decompressor = self._decompressor
+            if getattr(decompressor, 'eof', False):
+                # concatenated streams, e.g. multi-member gzip files
+                data = decompressor.unused_data
+                if self._input:
+                    data = data + bytes(self._input)
+                self._input = None
+                if not data:
+                    return None
+                self._decompressor, self._bounded = _newDecompressor(self._format)
+                self._input = data
+                self._has_output = False
+                continue
+            data = self._input
+            if not data and not self._has_output:
+                return None
+            self._input = None
+            if data is None:
+                data = b''
+            if self._bounded:
+                result = decompressor.decompress(data, _DECOMPRESSED_CHUNK_SIZE)
+                # zlib keeps the input that it did not process yet in 'unconsumed_tail',
+                # the other decompressors buffer it internally.
+                self._input = getattr(decompressor, 'unconsumed_tail', None) or None
+                self._has_output = (
+                    len(result) >= _DECOMPRESSED_CHUNK_SIZE or
+                    not getattr(decompressor, 'needs_input', True))
+            else:
+                if len(data) > _UNBOUNDED_DECOMPRESSOR_INPUT_SIZE:
+                    self._input = data[_UNBOUNDED_DECOMPRESSOR_INPUT_SIZE:]
+                    data = data[:_UNBOUNDED_DECOMPRESSOR_INPUT_SIZE]
+                result = decompressor.decompress(data)
+            if result:
+                return result
+
+    cdef flush(self):
+        "Return any pending input at the end of the stream and reset for the next stream."
+        data = self._header or b''
+        if data:
+            # short input in 'auto' mode
+            compression = _detectCompression(data)
+            if compression is not None:
+                data = _newDecompressor(compression)[0].decompress(data)
+        self._header = b''
+        self._format = None
+        self._decompressor = None
+        self._input = None
+        self._has_output = False
+        return data
+
+
+@cython.final
+@cython.internal
+cdef class _DecompressingReader:
+    # Iterates over the decompressed chunks of a compressed file-like source.
+    cdef object _source
+    cdef _StreamDecompressor _decompressor
+    cdef bint _close_source
+
+    def __cinit__(self, source, compression, bint close_source=False):
+        self._decompressor = _StreamDecompressor(compression)
+        self._source = source
+        self._close_source = close_source
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self._source is not None:
+            data = self._decompressor.read()
+            if data:
+                return data
+            elif data is not None:
+                continue
+            data = self._source.read(2**16)
+            if not data:
+                data = self._decompressor.flush()
+                self.close()
+                if data:
+                    return data
+                break
+            self._decompressor.push(data)
+        raise StopIteration
+
+    def close(self):
+        source, self._source = self._source, None
+        if source is not None and self._close_source:
+            source.close()
+
+
 ############################################################
 ## support for custom document loaders
 ############################################################
@@ -525,7 +897,10 @@ cdef xmlerror.xmlParserErrors _local_resource_loader_internal(
             url = _decodeFilename(<const_xmlChar*> c_url) if c_url is not NULL else None
             pubid = funicodeOrNone(<const_xmlChar*> c_pubid)  # always UTF-8
 
-            doc_ref = context._resolvers.resolve(url, pubid, context)
+            if isinstance(context, _ParserContext) and (<_ParserContext>context)._stats is not None:
+                doc_ref = (<_ParserContext>context)._stats.resolve(url, pubid, context)
+            else:
+                doc_ref = context._resolvers.resolve(url, pubid, context)
 
             if doc_ref is not None:
                 c_error = _resolve_doc_ref(doc_ref, c_context, context, url, &c_input)
@@ -658,6 +1033,127 @@ cdef void _reset_resource_loader(xmlparser.xmlExternalEntityLoader old) noexcept
 ## Parsers
 ############################################################
 
+@cython.final
+@cython.internal
+cdef class _ParseStats:
+    """Counters and timings of a single parser run.
+    """
+    cdef xmlDoc* _c_doc  # only for identifying the result document, never dereferenced
+    cdef Py_ssize_t _bytes_read
+    cdef Py_ssize_t _elements
+    cdef Py_ssize_t _attributes
+    cdef Py_ssize_t _resolver_calls
+    cdef size_t _dict_size_start
+    cdef size_t _dict_size
+    cdef stdint.int64_t _start_time_ns
+    cdef stdint.int64_t _end_time_ns
+    cdef stdint.int64_t _io_time_ns
+
+    cdef void start(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
+        self._dict_size_start = self._dict_size = tree.xmlDictSize(c_ctxt.dict)
+        self._start_time_ns = perf_counter_ns()
+
+    cdef void finish(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
+        self._end_time_ns = perf_counter_ns()
+        self._dict_size = tree.xmlDictSize(c_ctxt.dict)
+
+    cdef resolve(self, url, pubid, _ResolverContext context):
+        cdef stdint.int64_t start_time
+        cdef _ResolverRegistry resolvers = context._resolvers
+        if not resolvers._resolvers and resolvers._default_resolver is None:
+            # nothing to call
+            return None
+        start_time = perf_counter_ns()
+        self._resolver_calls += 1
+        try:
+            return resolvers.resolve(url, pubid, context)
+        finally:
+            self._io_time_ns += perf_counter_ns() - start_time
+
+    cdef dict as_dict(self):
+        return {
+            'bytes_read': self._bytes_read,
+            'elements': self._elements,
+            'attributes': self._attributes,
+            'dict_size': self._dict_size,
+            'dict_growth': self._dict_size - self._dict_size_start,
+            'resolver_calls': self._resolver_calls,
+            'parse_time': (self._end_time_ns - self._start_time_ns) / 1e9,
+            'io_time': self._io_time_ns / 1e9,
+        }
+
+
+@cython.final
+@cython.internal
+cdef class _ParseProgress:
+    """Counters of a running parser that are passed to a progress callback.
+    """
+    cdef object _callback
+    cdef xmlparser.xmlParserCtxt* _c_ctxt
+    cdef _ParseEventsIterator _events  # of pull parsers
+    cdef Py_ssize_t _events_start
+    cdef Py_ssize_t _interval
+    cdef Py_ssize_t _next_report
+    cdef Py_ssize_t _bytes_read
+    cdef Py_ssize_t _bytes_reported
+    cdef Py_ssize_t _elements
+    cdef stdint.int64_t _start_time_ns
+    cdef bint _native_input  # libxml2 reads the input itself
+
+    cdef void start(self, xmlparser.xmlParserCtxt* c_ctxt, callback, Py_ssize_t interval) noexcept:
+        self._callback = callback
+        self._c_ctxt = c_ctxt
+        self._interval = interval
+        self._next_report = interval
+        self._start_time_ns = perf_counter_ns()
+
+    cdef int elementStarted(self) except -1:
+        """Count a new element.  Input that libxml2 reads itself is not seen
+        by lxml, so its position is taken from the parser here.
+        """
+        cdef long c_consumed
+        self._elements += 1
+        if not self._native_input or self._c_ctxt.inputNr > 1:
+            # external entities and DTDs have their own input positions
+            return 0
+        c_consumed = xmlparser.xmlByteConsumed(self._c_ctxt)
+        if c_consumed > self._bytes_read:
+            self._bytes_read = c_consumed
+            self.update()
+        return 0
+
+    cdef int update(self) except -1:
+        """Call the callback if the input passed the next reporting threshold.
+        """
+        if self._bytes_read < self._next_report:
+            return 0
+        self._next_report = self._bytes_read - self._bytes_read % self._interval + self._interval
+        return self._report()
+
+    cdef int finish(self, Py_ssize_t bytes_read=0) except -1:
+        """Report the end of the input after a completed parse, unless the
+        last report already covered it.
+        """
+        if bytes_read > self._bytes_read:
+            self._bytes_read = bytes_read
+        if self._bytes_read > self._bytes_reported:
+            self._report()
+        return 0
+
+    cdef int _report(self) except -1:
+        self._bytes_reported = self._bytes_read
+        elapsed = (perf_counter_ns() - self._start_time_ns) / 1e9
+        self._callback({
+            'bytes_read': self._bytes_read,
+            'events': self._events.emitted() - self._events_start if self._events is not None else 0,
+            'elements': self._elements,
+            'depth': self._c_ctxt.nameNr,
+            'elapsed': elapsed,
+            'elements_per_second': self._elements / elapsed if elapsed > 0 else 0.0,
+        })
+        return 0
+
+
 @cython.no_gc_clear  # May have to call "self._validator.disconnect()" on dealloc.
 @cython.internal
 cdef class _ParserContext(_ResolverContext):
@@ -670,6 +1166,12 @@ cdef class _ParserContext(_ResolverContext):
     cdef cython.pymutex _lock
     cdef unsigned long _lock_owner_tid
     cdef bint _collect_ids
+    cdef bint _collect_stats
+    cdef _ParseStats _stats  # of the current parser run
+    cdef _ParseStats _last_stats
+    cdef object _progress_callback
+    cdef Py_ssize_t _progress_interval
+    cdef _ParseProgress _progress  # of the current parser run
 
     def __cinit__(self):
         self._collect_ids = True
@@ -691,6 +1193,9 @@ cdef class _ParserContext(_ResolverContext):
         cdef _ParserContext context
         context = self.__class__()
         context._collect_ids = self._collect_ids
+        context._collect_stats = self._collect_stats
+        context._progress_callback = self._progress_callback
+        context._progress_interval = self._progress_interval
         context._validator = self._validator.copy()
         _initParserContext(context, self._resolvers._copy(), NULL)
         return context
@@ -726,6 +1231,12 @@ cdef class _ParserContext(_ResolverContext):
             self._lock_owner_tid = current_tid
         self._error_log.clear()
         self._doc = None
+        if self._collect_stats:
+            self._stats = _ParseStats.__new__(_ParseStats)
+            self._stats.start(self._c_ctxt)
+        if self._progress_callback is not None and self._progress is None:
+            self._progress = _ParseProgress.__new__(_ParseProgress)
+            self._progress.start(self._c_ctxt, self._progress_callback, self._progress_interval)
         # Connect the lxml error log with libxml2's error handling. In the case of parsing
         # HTML, ctxt->sax is not set to null, so this always works. The libxml2 function
         # that does this is htmlInitParserCtxt in HTMLparser.c. For HTML (and possibly XML
@@ -739,6 +1250,7 @@ cdef class _ParserContext(_ResolverContext):
             try:
                 self._validator.connect(self._c_ctxt, self._error_log)
             except:
+                self._progress = None
                 if config.ENABLE_THREADING:
                     self._lock_owner_tid = 0
                     self._lock.release()
@@ -749,6 +1261,11 @@ cdef class _ParserContext(_ResolverContext):
         if self._orig_loader is not NULL:
             _reset_resource_loader(self._orig_loader)
         try:
+            if self._stats is not None:
+                self._stats.finish(self._c_ctxt)
+                self._last_stats = self._stats
+                self._stats = None
+            self._progress = None
             if self._validator is not None:
                 self._validator.disconnect()
             self._resetParserContext()
@@ -761,20 +1278,40 @@ cdef class _ParserContext(_ResolverContext):
                 self._lock.release()
         return 0
 
+    cdef int _finishProgress(self, xmlDoc* result, Py_ssize_t bytes_read=0) noexcept:
+        """Send the final progress report of a parse that produced a document.
+        Errors are raised when handling the parse result.
+        """
+        if self._progress is None or result is NULL or self._has_raised():
+            return 0
+        if not self._c_ctxt.wellFormed and not self._c_ctxt.recovery:
+            return 0
+        try:
+            self._progress.finish(bytes_read)
+        except:
+            self._store_raised()
+        return 0
+
     cdef object _handleParseResult(self, _BaseParser parser,
                                    xmlDoc* result, filename):
+        cdef _Document doc
         c_doc = self._handleParseResultDoc(parser, result, filename)
         if self._doc is not None and self._doc._c_doc is c_doc:
-            return self._doc
+            doc = self._doc
         else:
-            return _documentFactory(c_doc, parser)
+            doc = _documentFactory(c_doc, parser)
+        doc._parse_stats = self._stats
+        return doc
 
     cdef xmlDoc* _handleParseResultDoc(self, _BaseParser parser,
                                        xmlDoc* result, filename) except NULL:
         recover = parser._parse_options & xmlparser.XML_PARSE_RECOVER
-        return _handleParseResult(self, self._c_ctxt, result,
-                                  filename, recover,
-                                  free_doc=self._doc is None)
+        c_doc = _handleParseResult(self, self._c_ctxt, result,
+                                   filename, recover,
+                                   free_doc=self._doc is None)
+        if self._stats is not None:
+            self._stats._c_doc = c_doc
+        return c_doc
 
 cdef _initParserContext(_ParserContext context,
                         _ResolverRegistry resolvers,
@@ -969,6 +1506,8 @@ cdef extern from *:
         unsigned int strip_cdata: 1;
         unsigned int collect_ids: 1;
         unsigned int resolve_external_entities: 1;
+        unsigned int collect_stats: 1;
+        unsigned int mmap: 1;
     } __lxml_ParserFlags;
     """
     ctypedef struct ParserFlags "__lxml_ParserFlags":
@@ -978,6 +1517,8 @@ cdef extern from *:
         bint strip_cdata
         bint collect_ids
         bint resolve_external_entities
+        bint collect_stats
+        bint mmap
 
 
 @cython.internal
@@ -994,13 +1535,21 @@ cdef class _BaseParser:
     cdef readonly object target
     cdef object _default_encoding
     cdef tuple _events_to_collect  # (event_types, tag)
+    cdef _ParseProjection _projection
+    cdef _RecordExtraction _extraction
+    cdef _EventColumnsBuilder _columns
+    cdef bint _track_checkpoints
+    cdef bint _split_documents
+    cdef object _progress_callback
+    cdef Py_ssize_t _progress_interval
 
     def __cinit__(self):
         self._lock = RWLock()
 
     def __init__(self, int parse_options, bint for_html, XMLSchema schema,
                  remove_comments, remove_pis, strip_cdata, collect_ids,
-                 target, encoding, bint resolve_external_entities=True):
+                 target, encoding, bint resolve_external_entities=True,
+                 bint collect_stats=False, bint mmap=False):
         cdef tree.xmlCharEncodingHandler* enchandler
         cdef int c_encoding
         if not isinstance(self, (XMLParser, HTMLParser)):
@@ -1017,6 +1566,8 @@ cdef class _BaseParser:
             strip_cdata=strip_cdata,
             collect_ids=collect_ids,
             resolve_external_entities=resolve_external_entities,
+            collect_stats=collect_stats,
+            mmap=mmap,
         )
 
         self.target = target
@@ -1026,12 +1577,7 @@ cdef class _BaseParser:
         if encoding is None:
             self._default_encoding = None
         else:
-            encoding = _utf8(encoding)
-            enchandler = tree.xmlFindCharEncodingHandler(_cstr(encoding))
-            if enchandler is NULL:
-                raise LookupError, f"unknown encoding: '{encoding}'"
-            tree.xmlCharEncCloseFunc(enchandler)
-            self._default_encoding = encoding
+            self._default_encoding = _findParserEncodingName(encoding)
 
     cdef _setBaseURL(self, base_url):
         self._filename = _encodeFilename(base_url)
@@ -1044,6 +1590,25 @@ cdef class _BaseParser:
             _buildParseEventFilter(event_types)  # purely for validation
         self._events_to_collect = (event_types, tag)
 
+    cdef _setProgress(self, progress, progress_interval):
+        if progress is None:
+            self._progress_callback = None
+            return
+        if not callable(progress):
+            raise TypeError, "progress callback must be callable"
+        if progress_interval < 1:
+            raise ValueError, f"invalid progress interval: {progress_interval}"
+        self._progress_callback = progress
+        self._progress_interval = progress_interval
+
+    cdef _setProjection(self, keep):
+        if keep is None:
+            self._projection = None
+            return
+        if self.target is not None:
+            raise ValueError, "cannot use 'keep' together with a parser target"
+        self._projection = _newParseProjection(keep)
+
     cdef _ParserContext _getParserContext(self):
         cdef xmlparser.xmlParserCtxt* pctxt
         context = self._parser_context
@@ -1053,6 +1618,9 @@ cdef class _BaseParser:
         context = self._createContext(self.target, None)
 
         context._collect_ids = self._flags.collect_ids
+        context._collect_stats = self._flags.collect_stats
+        context._progress_callback = self._progress_callback
+        context._progress_interval = self._progress_interval
         if self._parse_options & xmlparser.XML_PARSE_HUGE:
             context._dict.disableSizeLimit()
 
@@ -1081,6 +1649,9 @@ cdef class _BaseParser:
         context = self._createContext(self.target, self._events_to_collect)
 
         context._collect_ids = self._flags.collect_ids
+        context._collect_stats = self._flags.collect_stats
+        context._progress_callback = self._progress_callback
+        context._progress_interval = self._progress_interval
         if self._parse_options & xmlparser.XML_PARSE_HUGE:
             context._dict.disableSizeLimit()
 
@@ -1108,7 +1679,9 @@ cdef class _BaseParser:
         if target is not None:
             sax_context = _TargetParserContext(self)
             (<_TargetParserContext>sax_context)._setTarget(target)
-        elif events_to_collect:
+        elif (events_to_collect or self._projection is not None or
+                self._extraction is not None or self._columns is not None or
+                self._progress_callback is not None or self._flags.collect_stats):
             sax_context = _SaxParserContext(self)
         else:
             # nothing special to configure
@@ -1116,6 +1689,16 @@ cdef class _BaseParser:
         if events_to_collect:
             events, tag = events_to_collect
             sax_context._setEventFilter(events, tag)
+        if self._projection is not None:
+            sax_context._projection = self._projection.copy()
+        if self._extraction is not None:
+            sax_context._extraction = self._extraction.copy()
+        if self._columns is not None:
+            sax_context._columns = self._columns.copy()
+        if self._track_checkpoints:
+            from collections import deque
+            sax_context.events_iterator._record_ends = deque()
+        sax_context._split_documents = self._split_documents
         return sax_context
 
     @cython.final
@@ -1210,6 +1793,22 @@ cdef class _BaseParser:
         """The version of the underlying XML parser."""
         return "libxml2 %d.%d.%d" % LIBXML_VERSION
 
+    def prime_dict(self, names):
+        """prime_dict(self, names)
+
+        Adds tag and attribute names to the string dictionary of this parser,
+        so that parsing does not need to add them later.
+
+        The ``names`` can be an iterable of names (also in ``{namespace}name``
+        notation) or a sample document (ElementTree or Element) whose tag
+        names, attribute names and namespace prefixes are used.
+
+        Note that copies of this parser use their own dictionaries.  Use
+        ``freeze_parser_dict()`` to share names between parsers and threads.
+        """
+        self._getParserContext()._dict.addNames(names)
+        self._getPushParserContext()._dict.addNames(names)
+
     @property
     def dict_size(self):
         cdef size_t size = 0
@@ -1219,6 +1818,37 @@ cdef class _BaseParser:
             size += self._push_parser_context._dict.getDictSize()
         return size
 
+    @property
+    def stats(self):
+        """Statistics of the last parser run as a dict, or None if the parser
+        was not created with ``collect_stats=True`` or has not run yet.
+
+        The dict contains the number of input bytes passed to the parser
+        (``bytes_read``), the number of ``elements`` and ``attributes`` that
+        the parser created, the size of the parser dictionary (``dict_size``)
+        and how many names were added to it (``dict_growth``), the number of
+        calls to custom resolvers (``resolver_calls``), and the time in
+        seconds spent in the whole parser run (``parse_time``) and in reading
+        from Python file-like objects and resolvers (``io_time``).  Files and
+        URLs that libxml2 reads by itself are not included in the ``io_time``.
+        """
+        cdef _ParseStats stats = None
+        for context in (self._parser_context, self._push_parser_context):
+            if context is not None and (<_ParserContext>context)._last_stats is not None:
+                if stats is None or stats._end_time_ns < (<_ParserContext>context)._last_stats._end_time_ns:
+                    stats = (<_ParserContext>context)._last_stats
+        return stats.as_dict() if stats is not None else None
+
+    cdef _ParseStats _getParseStats(self, xmlDoc* c_doc):
+        """Return the statistics of the last parser run if it produced c_doc.
+        """
+        if not self._flags.collect_stats or self._parser_context is None:
+            return None
+        stats = self._parser_context._last_stats
+        if stats is not None and (<_ParseStats>stats)._c_doc is c_doc:
+            return stats
+        return None
+
     def set_element_class_lookup(self, ElementClassLookup lookup = None):
         """set_element_class_lookup(self, lookup = None)
 
@@ -1241,6 +1871,13 @@ cdef class _BaseParser:
         parser._default_encoding = self._default_encoding
         parser._schema = self._schema
         parser._events_to_collect = self._events_to_collect
+        parser._projection = self._projection
+        parser._extraction = self._extraction
+        parser._columns = self._columns
+        parser._track_checkpoints = self._track_checkpoints
+        parser._split_documents = self._split_documents
+        parser._progress_callback = self._progress_callback
+        parser._progress_interval = self._progress_interval
         return parser
 
     def copy(self):
@@ -1305,6 +1942,8 @@ cdef class _BaseParser:
         context = self._getParserContext()
         context.prepare()
         try:
+            if context._stats is not None:
+                context._stats._bytes_read = buffer_len
             pctxt = context._c_ctxt
             orig_options = pctxt.options
             with nogil:
@@ -1337,6 +1976,8 @@ cdef class _BaseParser:
         context = self._getParserContext()
         context.prepare()
         try:
+            if context._stats is not None:
+                context._stats._bytes_read = c_len
             if self._default_encoding is not None:
                 c_encoding = _cstr(self._default_encoding)
             else:
@@ -1375,6 +2016,9 @@ cdef class _BaseParser:
         context = self._getParserContext()
         context.prepare()
         try:
+            if context._progress is not None:
+                # libxml2 reads the file itself, ask it for the input position
+                context._progress._native_input = True
             if self._default_encoding is not None:
                 c_encoding = _cstr(self._default_encoding)
 
@@ -1393,6 +2037,15 @@ cdef class _BaseParser:
                         pctxt, c_filename, c_encoding, self._parse_options)
             pctxt.options = orig_options # work around libxml2 problem
 
+            if context._stats is not None:
+                # libxml2 reads the file itself, so count what the file provides
+                context._stats._bytes_read = _localFileSize(c_filename)
+            if context._progress is not None and result is not NULL:
+                # compressed input can be longer than the file
+                bytes_read = _localFileSize(c_filename)
+                if pctxt.inputNr > 0 and pctxt.input is not NULL:
+                    bytes_read = max(bytes_read, xmlparser.xmlByteConsumed(pctxt))
+                context._finishProgress(result, bytes_read)
             return context._handleParseResultDoc(self, result, c_filename)
         finally:
             context.cleanup()
@@ -1410,13 +2063,125 @@ cdef class _BaseParser:
             file_context = _FileReaderContext(
                 filelike, context, filename,
                 encoding or self._default_encoding)
+            file_context._stats = context._stats
+            file_context._progress = context._progress
             result = file_context._readDoc(context._c_ctxt, self._parse_options)
+            context._finishProgress(result)
 
             return context._handleParseResultDoc(
                 self, result, filename)
         finally:
             context.cleanup()
 
+    cdef xmlDoc* _parseDocFromChunks(self, chunks, bytes filename) except NULL:
+        """Parse a document by pushing the bytes-like chunks of an iterable
+        into libxml2's push parser, without copying them.
+        """
+        cdef const char* c_filename = _cstr(filename) if filename is not None else NULL
+        cdef _ParserContext context
+        cdef xmlparser.xmlParserCtxt* pctxt
+        cdef const unsigned char[::1] data
+        cdef const char* c_data
+        cdef const char* c_encoding = NULL
+        cdef xmlNode* c_node
+        cdef xmlDoc* result
+        cdef Py_ssize_t c_len, c_chunk_len
+        cdef int buffer_len, error = 0, fixup_error = 0
+        cdef bint started = False
+        cdef bint recover = self._parse_options & xmlparser.XML_PARSE_RECOVER
+
+        context = self._getParserContext()
+        pctxt = context._c_ctxt
+        orig_progressive = pctxt.progressive
+        context.prepare()
+        try:
+            if self._default_encoding is not None:
+                c_encoding = _cstr(self._default_encoding)
+            orig_options = pctxt.options
+            for chunk in chunks:
+                data = _asByteBuffer(chunk)
+                c_len = c_chunk_len = data.shape[0]
+                if not c_len:
+                    continue
+                c_data = <const char*>&data[0]
+                if context._stats is not None:
+                    context._stats._bytes_read += c_len
+                if not started:
+                    # Give the parser enough input to detect the encoding.
+                    buffer_len = 4 if c_len > 4 else <int>c_len
+                    if self._flags.for_html:
+                        error = _htmlCtxtResetPush(
+                            pctxt, c_data, buffer_len, c_filename, c_encoding,
+                            self._parse_options)
+                    else:
+                        xmlparser.xmlCtxtUseOptions(pctxt, self._parse_options)
+                        error = xmlparser.xmlCtxtResetPush(
+                            pctxt, c_data, buffer_len, c_filename, c_encoding)
+                    if error:
+                        raise MemoryError()
+                    started = True
+                    c_data += buffer_len
+                    c_len -= buffer_len
+                while c_len > 0:
+                    buffer_len = <int>c_len if c_len <= limits.INT_MAX else limits.INT_MAX
+                    error, fixup_error = _parse_data_chunk(pctxt, c_data, buffer_len)
+                    c_data += buffer_len
+                    c_len -= buffer_len
+                    if fixup_error:
+                        raise MemoryError()
+                    if error and not pctxt.replaceEntities and not pctxt.validate:
+                        # in this mode, we ignore errors about undefined entities
+                        for entry in context._error_log.filter_from_errors():
+                            if entry.type != ErrorTypes.WAR_UNDECLARED_ENTITY and \
+                                    entry.type != ErrorTypes.ERR_UNDECLARED_ENTITY:
+                                break
+                        else:
+                            error = 0
+                    if error and not recover or context._has_raised():
+                        break
+                data = None
+                if error and not recover or context._has_raised():
+                    break
+                if context._progress is not None:
+                    context._progress._bytes_read += c_chunk_len
+                    context._progress.update()
+
+            if not started and not context._has_raised():
+                # Empty input, which the push parser does not report as such.
+                with nogil:
+                    if self._flags.for_html:
+                        result = htmlparser.htmlCtxtReadMemory(
+                            pctxt, "", 0, c_filename, c_encoding, self._parse_options)
+                        if result is not NULL:
+                            if _fixHtmlDictNames(pctxt.dict, result) < 0:
+                                tree.xmlFreeDoc(result)
+                                result = NULL
+                    else:
+                        result = xmlparser.xmlCtxtReadMemory(
+                            pctxt, "", 0, c_filename, c_encoding, self._parse_options)
+                pctxt.options = orig_options # work around libxml2 problem
+                return context._handleParseResultDoc(self, result, filename)
+
+            if not context._has_raised():
+                c_node = pctxt.node
+                with nogil:
+                    if self._flags.for_html:
+                        htmlparser.htmlParseChunk(pctxt, NULL, 0, 1)
+                        if pctxt.myDoc is not NULL:
+                            fixup_error = _fixHtmlDictSubtreeNames(pctxt.dict, pctxt.myDoc, c_node)
+                    else:
+                        xmlparser.xmlParseChunk(pctxt, NULL, 0, 1)
+                if fixup_error:
+                    raise MemoryError()
+            pctxt.options = orig_options # work around libxml2 problem
+
+            context._finishProgress(pctxt.myDoc)
+            return context._handleParseResultDoc(self, pctxt.myDoc, filename)
+        finally:
+            # libxml2 keeps the context in push mode, which breaks later reads from files
+            pctxt.progressive = orig_progressive
+            context.cleanup()
+
 
 cdef tree.xmlEntity* _getInternalEntityOnly(void* ctxt, const_xmlChar* name) noexcept nogil:
     """
@@ -1538,6 +2303,7 @@ cdef int _detectBOMEncoding(const char* c_text, int c_len, const char** c_encodi
 cdef class _FeedParser(_BaseParser):
     cdef bint _feed_parser_running
     cdef cython.pymutex _feed_lock
+    cdef _StreamDecompressor _decompressor
 
     @property
     def feed_error_log(self):
@@ -1553,7 +2319,9 @@ cdef class _FeedParser(_BaseParser):
 
         Feeds data to the parser.  The argument should be an 8-bit string
         buffer containing encoded data, although Unicode is supported as long
-        as both string types are not mixed.
+        as both string types are not mixed.  Any other contiguous object that
+        supports the buffer protocol (bytearray, memoryview, mmap, ...) is
+        parsed in place, without copying its content into a byte string.
 
         This is the main entry point to the consumer interface of a
         parser.  The parser will parse as much of the XML stream as it
@@ -1567,14 +2335,70 @@ cdef class _FeedParser(_BaseParser):
         the ``parse()`` function concurrently.
         """
         with self._feed_lock:
-            self._feed(data)
+            if self._decompressor is None:
+                self._feed(data)
+            else:
+                self._decompressor.push(data)
+                while True:
+                    data = self._decompressor.read()
+                    if data is None:
+                        break
+                    if data:
+                        self._feed(data)
+            context = self._push_parser_context
+            if context is not None and context._progress is not None:
+                context._progress.update()
 
     @cython.final
     cdef _feed(self, data):
+        cdef const unsigned char[::1] buffer_data
+        cdef Py_ssize_t start, end
+        cdef bint is_unicode
+        if not self._split_documents:
+            self._feedDocumentData(data, 0)
+            return
+        is_unicode = isinstance(data, unicode)
+        if is_unicode:
+            data = (<unicode>data).encode('UTF-8')
+        buffer_data = _asByteBuffer(data)
+        end = 0
+        while True:
+            if not self._feed_parser_running:
+                # Skip whitespace between documents.
+                start = end
+                while end < buffer_data.shape[0] and buffer_data[end] in b' \t\r\n':
+                    end += 1
+                if self._push_parser_context is not None and self._push_parser_context._progress is not None:
+                    self._push_parser_context._progress._bytes_read += end - start
+                if end == buffer_data.shape[0]:
+                    break
+            end = self._feedDocumentData(data, end, is_unicode)
+            if end < 0:
+                break
+            # The root element ended, continue with the next document.
+            progress = self._push_parser_context._progress
+            self._close(final=False)
+            # keep counting the progress across the documents
+            self._push_parser_context._progress = progress
+
+    @cython.final
+    cdef Py_ssize_t _feedDocumentData(self, data, Py_ssize_t start, bint utf8_encoded=False) except -2:
+        """Feed the data from the start offset on into the current document.
+
+        Byte data that was encoded from a unicode string is passed with
+        ``utf8_encoded=True`` to make the parser ignore the XML declaration.
+
+        When splitting documents, returns the offset after the end of the
+        root element once it was parsed, and -1 otherwise.
+        """
         cdef _ParserContext context
+        cdef _SaxParserContext split_context = None
+        cdef const_char* c_data_start
+        cdef long long fed_before
         cdef bytes bstring
+        cdef const unsigned char[::1] buffer_data
         cdef xmlparser.xmlParserCtxt* pctxt
-        cdef Py_ssize_t py_buffer_len, ustart
+        cdef Py_ssize_t py_buffer_len, ustart, total_len, end
         cdef const_char* char_data
         cdef const_char* c_encoding
         cdef int buffer_len
@@ -1582,7 +2406,9 @@ cdef class _FeedParser(_BaseParser):
         cdef bint recover = self._parse_options & xmlparser.XML_PARSE_RECOVER
 
         if isinstance(data, bytes):
-            if self._default_encoding is None:
+            if utf8_encoded:
+                c_encoding = b"UTF-8"
+            elif self._default_encoding is None:
                 c_encoding = NULL
             else:
                 c_encoding = self._default_encoding
@@ -1591,15 +2417,40 @@ cdef class _FeedParser(_BaseParser):
             ustart = 0
         elif isinstance(data, unicode):
             c_encoding = b"UTF-8"
-            char_data = NULL
             py_buffer_len = len(<unicode> data)
+            if (python.PyUnicode_IS_READY(data) and python.PyUnicode_KIND(data) == 1 and
+                    python.PyUnicode_MAX_CHAR_VALUE(data) <= 127):
+                # ASCII strings are valid UTF-8, so parse them in place
+                char_data = <const_char*>python.PyUnicode_DATA(data)
+            else:
+                char_data = NULL
             ustart = 0
         else:
-            raise TypeError, "Parsing requires string data"
+            # Keep the buffer exported while parsing from it.
+            buffer_data = _asByteBuffer(data)
+            if self._default_encoding is None:
+                c_encoding = NULL
+            else:
+                c_encoding = self._default_encoding
+            py_buffer_len = buffer_data.shape[0]
+            if py_buffer_len:
+                char_data = <const_char*>&buffer_data[0]
+            else:
+                char_data = b''
+            ustart = 0
+
+        if start:
+            char_data += start
+            py_buffer_len -= start
+        c_data_start = char_data
+        total_len = py_buffer_len
 
         context = self._getPushParserContext()
         pctxt = context._c_ctxt
+        if self._split_documents:
+            split_context = <_SaxParserContext>context
         error = 0
+        buffer_len = 0
         if not self._feed_parser_running:
             context.prepare(set_document_loader=False)
             self._feed_parser_running = 1
@@ -1627,6 +2478,14 @@ cdef class _FeedParser(_BaseParser):
             char_data += buffer_len
             if error:
                 raise MemoryError()
+            if split_context is not None:
+                split_context._document_fed = buffer_len
+
+        if char_data is not NULL:
+            if context._stats is not None:
+                context._stats._bytes_read += py_buffer_len + buffer_len
+            if context._progress is not None:
+                context._progress._bytes_read += py_buffer_len + buffer_len
 
         #print pctxt.charset, 'NONE' if c_encoding is NULL else c_encoding
 
@@ -1636,13 +2495,32 @@ cdef class _FeedParser(_BaseParser):
                 # Unicode parsing by converting chunks to UTF-8
                 buffer_len = 2**19  # len(bytes) <= 4 * (2**19) == 2 MiB
                 bstring = (<unicode> data)[ustart : ustart+buffer_len].encode('UTF-8')
+                if context._stats is not None:
+                    context._stats._bytes_read += len(bstring)
+                if context._progress is not None:
+                    context._progress._bytes_read += len(bstring)
                 ustart += buffer_len
                 py_buffer_len -= buffer_len  # may end up < 0
                 error, fixup_error = _parse_data_chunk(pctxt, <const char*> bstring, <int> len(bstring))
             else:
                 # Direct byte string parsing.
                 buffer_len = <int>py_buffer_len if py_buffer_len <= limits.INT_MAX else limits.INT_MAX
+                if (self._track_checkpoints or self._split_documents) and buffer_len > 4096:
+                    # libxml2 can only map the parser position back to the input
+                    # bytes if not too much decoded input is pending.
+                    buffer_len = 4096
                 error, fixup_error = _parse_data_chunk(pctxt, char_data, buffer_len)
+                if split_context is not None:
+                    fed_before = split_context._document_fed
+                    split_context._document_fed += buffer_len
+                    if split_context._document_end >= 0:
+                        # the parser stopped after the end of the root element
+                        end = (char_data - c_data_start) + start + (
+                            split_context._document_end - fed_before)
+                        if context._progress is not None:
+                            # the remaining data is fed again into the next document
+                            context._progress._bytes_read -= total_len - (end - start)
+                        return end
                 py_buffer_len -= buffer_len
                 char_data += buffer_len
 
@@ -1664,6 +2542,15 @@ cdef class _FeedParser(_BaseParser):
                 else:
                     error = 0
 
+        if isinstance(context, _SaxParserContext) and not context._has_raised():
+            # Pass the text parsed so far on to the target without waiting for more input.
+            try:
+                (<_SaxParserContext>context).flushTargetData()
+            except:
+                context._store_raised()
+                recover = 0
+                error = 1
+
         if not pctxt.wellFormed and xmlparser.xmlCtxtIsStopped(pctxt) and context._has_raised():
             # propagate Python exceptions immediately
             recover = 0
@@ -1675,23 +2562,75 @@ cdef class _FeedParser(_BaseParser):
                 context._handleParseResult(self, pctxt.myDoc, None)
             finally:
                 context.cleanup()
+        return -1
 
     def close(self):
         """close(self)
 
         Terminates feeding data to this parser.  This tells the parser to
         process any remaining data in the feed buffer, and then returns the
-        root Element of the tree that was parsed.
+        root Element of the tree that was parsed.  When splitting documents,
+        it finishes the last document and returns None, as the roots of all
+        documents are reported through the parse events.
 
         This method must be called after passing the last chunk of data into
         the ``feed()`` method.  It should only be called when using the feed
         parser interface, all other usage is undefined.
         """
         with self._feed_lock:
+            if self._decompressor is not None:
+                data = self._decompressor.flush()
+                if data:
+                    self._feed(data)
+            if self._split_documents:
+                # The roots of the documents are only reported as parse events.
+                if self._feed_parser_running:
+                    self._close()
+                else:
+                    self._finishSplitProgress()
+                return None
             return self._close()
 
+    def reset(self):
+        """reset(self)
+
+        Discards the document that is currently being parsed, together with
+        any pending parse events, and prepares the parser for a new document.
+        The parser context and its configuration are kept and reused.
+        """
+        cdef _ParserContext context
+        cdef xmlparser.xmlParserCtxt* pctxt
+        with self._feed_lock:
+            if self._decompressor is not None:
+                self._decompressor = _StreamDecompressor(self._decompressor._compression)
+            if self._push_parser_context is None:
+                return
+            context = self._push_parser_context
+            if isinstance(context, _SaxParserContext):
+                (<_SaxParserContext>context).clearEvents()
+            if not self._feed_parser_running:
+                return
+            self._feed_parser_running = 0
+            pctxt = context._c_ctxt
+            if pctxt.myDoc is not NULL:
+                if context._doc is None or context._doc._c_doc is not pctxt.myDoc:
+                    tree.xmlFreeDoc(pctxt.myDoc)
+                pctxt.myDoc = NULL
+            context.cleanup()
+
+    @cython.final
+    cdef _finishSplitProgress(self):
+        """Report the end of the input after the last of the split documents.
+        """
+        context = self._push_parser_context
+        if context is None or context._progress is None:
+            return
+        progress = context._progress
+        context._progress = None
+        progress.finish()
+
     @cython.final
-    cdef _close(self):
+    cdef _close(self, bint final=True):
         if not self._feed_parser_running:
             raise XMLSyntaxError("no element found",
                                  xmlerror.XML_ERR_INTERNAL_ERROR, 0, 0,
@@ -1711,6 +2650,8 @@ cdef class _FeedParser(_BaseParser):
             # apply any left-over 'end' events
             (<_SaxParserContext>context).flushEvents()
 
+        if final:
+            context._finishProgress(pctxt.myDoc)
         try:
             result = context._handleParseResult(self, pctxt.myDoc, None)
         finally:
@@ -1787,7 +2728,9 @@ cdef class XMLParser(_FeedParser):
                  recover=False, schema: XMLSchema =None, huge_tree=False, \
                  remove_blank_text=False, resolve_entities='internal', \
                  remove_comments=False, remove_pis=False, strip_cdata=True, \
-                 collect_ids=True, target=None, compact=True)
+                 collect_ids=True, target=None, compact=True, keep=None, \
+                 collect_stats=False, mmap=False, progress=None, \
+                 progress_interval=1048576)
 
     The XML parser.
 
@@ -1825,6 +2768,10 @@ cdef class XMLParser(_FeedParser):
       (default: True, always True with DTD validation)
     - huge_tree: disable security restrictions and support very deep trees
       and very long text content
+    - collect_stats: record statistics of each parser run, available from
+      ``parser.stats`` and ``tree.docinfo.parse_stats`` (default: False)
+    - mmap: let ``parse()`` read local files from a memory mapping by
+      default (see ``parse()``).  Other input is read as usual.
 
     **Other keyword arguments:**
 
@@ -1835,6 +2782,20 @@ cdef class XMLParser(_FeedParser):
     - encoding: override the document encoding (note: libiconv encoding name)
     - target: a parser target object that will receive the parse events
     - schema: an XMLSchema to validate against
+    - keep: an ElementPath expression or a sequence of them, relative to the
+      root element, that selects the subtrees to keep in the parsed tree.
+      All other elements are discarded while parsing, except for the
+      ancestors of selected elements.  Only child, descendant ('//') and
+      wildcard steps are supported.  Cannot be used with a parser target.
+    - progress: a callable that receives a dict of counters each time another
+      ``progress_interval`` bytes (default: 1 MiB) of input were read from a
+      file or passed into ``feed()``.  The dict contains the number of input
+      bytes passed to the parser (``bytes_read``), the number of parse events
+      of pull parsers (``events``), the number of ``elements`` that were
+      started, the ``depth`` of the currently open elements, the time in
+      seconds since the parser run started (``elapsed``) and the resulting
+      ``elements_per_second``.  A last report is sent when the parser has
+      completed the input.  Parsing from memory does not report progress.
 
     Note that you should avoid sharing parsers between threads.  While this is
     not harmful, it is more efficient to use separate parsers.  This does not
@@ -1845,7 +2806,9 @@ cdef class XMLParser(_FeedParser):
                  ns_clean=False, recover=False, XMLSchema schema=None,
                  huge_tree=False, remove_blank_text=False, resolve_entities='internal',
                  remove_comments=False, remove_pis=False, strip_cdata=True,
-                 collect_ids=True, target=None, compact=True):
+                 collect_ids=True, target=None, compact=True, keep=None,
+                 collect_stats=False, mmap=False, progress=None,
+                 progress_interval=1048576):
         cdef int parse_options
         cdef bint resolve_external = True
         parse_options = _XML_DEFAULT_PARSE_OPTIONS
@@ -1881,7 +2844,10 @@ cdef class XMLParser(_FeedParser):
 
         _BaseParser.__init__(self, parse_options, False, schema,
                              remove_comments, remove_pis, strip_cdata,
-                             collect_ids, target, encoding, resolve_external)
+                             collect_ids, target, encoding, resolve_external,
+                             collect_stats, mmap)
+        self._setProjection(keep)
+        self._setProgress(progress, progress_interval)
 
     # Allow subscripting XMLParser in type annotations (PEP 560)
     def __class_getitem__(cls, item):
@@ -1905,17 +2871,81 @@ cdef class XMLPullParser(XMLParser):
 
     To support loading external dependencies relative to the input
     source, you can pass the ``base_url``.
+
+    To feed compressed data, pass the ``compression`` format, one of
+    ``'gzip'``, ``'bz2'``, ``'xz'``, ``'zstd'``, or ``'auto'`` to detect
+    it from the input.
+
+    To parse a stream of concatenated documents, pass
+    ``split_documents=True``.  The parser then starts a new document
+    after the end of each root element, skipping whitespace in between.
+
+    To make the parser report checkpoints of its progress through
+    the ``checkpoint()`` method, pass ``checkpoints=True``.  To continue
+    parsing a document from such a checkpoint, pass it as ``resume``
+    and feed the input data from the checkpoint's byte offset on.
     """
-    def __init__(self, events=None, *, tag=None, base_url=None, **kwargs):
+    def __init__(self, events=None, *, tag=None, base_url=None, compression=None,
+                 checkpoints=False, resume=None, split_documents=False, **kwargs):
+        if resume is not None and kwargs.get('encoding') is None:
+            kwargs['encoding'] = resume['encoding']
         XMLParser.__init__(self, **kwargs)
+        if split_documents and self.target is not None:
+            raise ValueError, "cannot split documents when parsing into a parser target"
+        self._split_documents = split_documents
         if events is None:
             events = ('end',)
         self._setBaseURL(base_url)
         self._collectEvents(events, tag)
+        if compression is not None:
+            self._decompressor = _StreamDecompressor(compression)
+        self._track_checkpoints = checkpoints or resume is not None
+        if resume is not None:
+            _resumeFromCheckpoint(self, resume)
 
     def read_events(self):
         return (<_SaxParserContext?>self._getPushParserContext()).events_iterator
 
+    def read_events_batch(self, max_events=None):
+        """read_events_batch(self, max_events=None)
+
+        Returns a list of the currently available parse events, at most
+        ``max_events`` of them, and removes them from ``read_events()``.
+        The list is empty if no events are available.
+        """
+        return _readEventsBatch(self, max_events)
+
+    def checkpoint(self):
+        """checkpoint(self)
+
+        Returns a checkpoint for the position after the last top-level
+        element (i.e. child of the root element) whose 'end' event was read,
+        or None if there is none yet.  Requires ``checkpoints=True``.
+
+        The checkpoint is a dict of plain values that can be stored as JSON.
+        It holds the byte ``offset`` in the input data, the ``encoding``
+        of the input and the start tags of the open ``ancestors`` with
+        their namespace declarations.  The parser can continue from it
+        without re-reading the preceding data.  Note that entities from an
+        internal DTD subset are not restored, and line numbers are counted
+        from the checkpoint.
+        """
+        return _buildCheckpoint(self)
+
+    def aread_events(self, source, *, executor=None, chunk_size=65536):
+        """aread_events(self, source, *, executor=None, chunk_size=65536)
+
+        Returns an async iterator over the parse events of the data read
+        from ``source``, which can be an async iterable of data chunks or
+        an object with an async ``.read(size)`` method, e.g. an
+        ``asyncio.StreamReader``.
+
+        Each chunk is parsed in the ``executor`` (default: the event loop's
+        default executor) without holding the GIL, while the event loop
+        reads the next chunk.  The parser is closed at the end of the input.
+        """
+        return _aread_pull_events(self, source, executor, chunk_size)
+
 
 cdef class ETCompatXMLParser(XMLParser):
     """ETCompatXMLParser(self, encoding=None, attribute_defaults=False, \
@@ -2007,7 +3037,8 @@ cdef class HTMLParser(_FeedParser):
     """HTMLParser(self, encoding=None, remove_blank_text=False, \
                    remove_comments=False, remove_pis=False, \
                    no_network=True, decompress=False, target=None, schema: XMLSchema =None, \
-                   recover=True, compact=True, collect_ids=True, huge_tree=False)
+                   recover=True, compact=True, collect_ids=True, huge_tree=False, keep=None, \
+                   collect_stats=False, mmap=False, progress=None, progress_interval=1048576)
 
     The HTML parser.
 
@@ -2033,12 +3064,19 @@ cdef class HTMLParser(_FeedParser):
     - collect_ids: use a hash table of XML IDs for fast access (default: True)
     - huge_tree: disable security restrictions and support very deep trees and
       very long text content
+    - collect_stats: record statistics of each parser run (see XMLParser)
+    - mmap: let ``parse()`` read local files from a memory mapping by
+      default (see XMLParser)
 
     **Other keyword arguments:**
 
     - encoding: override the document encoding (note: libiconv encoding name)
     - target: a parser target object that will receive the parse events
     - schema: an XMLSchema to validate against
+    - keep: an ElementPath expression or a sequence of them that selects the
+      subtrees to keep in the parsed tree (see XMLParser)
+    - progress: a callable that receives a dict of counters every
+      ``progress_interval`` bytes of input (see XMLParser)
 
     Note that you should avoid sharing parsers between threads for performance
     reasons.
@@ -2047,7 +3085,8 @@ cdef class HTMLParser(_FeedParser):
                  remove_comments=False, remove_pis=False, strip_cdata=_UNUSED,
                  no_network=True, decompress=False, target=None, XMLSchema schema=None,
                  recover=True, compact=True, default_doctype=True,
-                 collect_ids=True, huge_tree=False):
+                 collect_ids=True, huge_tree=False, keep=None, collect_stats=False,
+                 mmap=False, progress=None, progress_interval=1048576):
         cdef int parse_options
         parse_options = _HTML_DEFAULT_PARSE_OPTIONS
         if remove_blank_text:
@@ -2072,7 +3111,9 @@ cdef class HTMLParser(_FeedParser):
                 DeprecationWarning)
         _BaseParser.__init__(self, parse_options, True, schema,
                              remove_comments, remove_pis, strip_cdata,
-                             collect_ids, target, encoding)
+                             collect_ids, target, encoding, True, collect_stats, mmap)
+        self._setProjection(keep)
+        self._setProgress(progress, progress_interval)
 
     # Allow subscripting HTMLParser in type annotations (PEP 560)
     def __class_getitem__(cls, item):
@@ -2100,17 +3141,236 @@ cdef class HTMLPullParser(HTMLParser):
 
     To support loading external dependencies relative to the input
     source, you can pass the ``base_url``.
+
+    To feed compressed data, pass the ``compression`` format, one of
+    ``'gzip'``, ``'bz2'``, ``'xz'``, ``'zstd'``, or ``'auto'`` to detect
+    it from the input.
+
+    To make the parser report checkpoints of its progress through
+    the ``checkpoint()`` method, pass ``checkpoints=True``.  To continue
+    parsing a document from such a checkpoint, pass it as ``resume``
+    and feed the input data from the checkpoint's byte offset on.
     """
-    def __init__(self, events=None, *, tag=None, base_url=None, **kwargs):
+    def __init__(self, events=None, *, tag=None, base_url=None, compression=None,
+                 checkpoints=False, resume=None, **kwargs):
+        if resume is not None and kwargs.get('encoding') is None:
+            kwargs['encoding'] = resume['encoding']
         HTMLParser.__init__(self, **kwargs)
         if events is None:
             events = ('end',)
         self._setBaseURL(base_url)
         self._collectEvents(events, tag)
+        if compression is not None:
+            self._decompressor = _StreamDecompressor(compression)
+        self._track_checkpoints = checkpoints or resume is not None
+        if resume is not None:
+            _resumeFromCheckpoint(self, resume)
 
     def read_events(self):
         return (<_SaxParserContext?>self._getPushParserContext()).events_iterator
 
+    def read_events_batch(self, max_events=None):
+        """read_events_batch(self, max_events=None)
+
+        Returns a list of the currently available parse events, at most
+        ``max_events`` of them, and removes them from ``read_events()``.
+        The list is empty if no events are available.
+        """
+        return _readEventsBatch(self, max_events)
+
+    def checkpoint(self):
+        """checkpoint(self)
+
+        Returns a checkpoint for the position after the last top-level
+        element (i.e. child of the root element) whose 'end' event was read,
+        or None if there is none yet.  Requires ``checkpoints=True``.
+
+        The checkpoint is a dict of plain values that can be stored as JSON.
+        It holds the byte ``offset`` in the input data, the ``encoding``
+        of the input and the start tags of the open ``ancestors`` with
+        their namespace declarations.  The parser can continue from it
+        without re-reading the preceding data.  Note that entities from an
+        internal DTD subset are not restored, and line numbers are counted
+        from the checkpoint.
+        """
+        return _buildCheckpoint(self)
+
+    def aread_events(self, source, *, executor=None, chunk_size=65536):
+        """aread_events(self, source, *, executor=None, chunk_size=65536)
+
+        Returns an async iterator over the parse events of the data read
+        from ``source``, which can be an async iterable of data chunks or
+        an object with an async ``.read(size)`` method, e.g. an
+        ``asyncio.StreamReader``.
+
+        Each chunk is parsed in the ``executor`` (default: the event loop's
+        default executor) without holding the GIL, while the event loop
+        reads the next chunk.  The parser is closed at the end of the input.
+        """
+        return _aread_pull_events(self, source, executor, chunk_size)
+
+
+cdef list _readEventsBatch(_FeedParser parser, max_events):
+    cdef Py_ssize_t c_max_events = -1
+    if max_events is not None:
+        c_max_events = max_events
+        if c_max_events < 1:
+            raise ValueError(f"invalid number of events: {max_events}")
+    events = (<_SaxParserContext?>parser._getPushParserContext()).events_iterator
+    return (<_ParseEventsIterator>events).next_batch(c_max_events)
+
+
+cdef dict _buildCheckpoint(_FeedParser parser):
+    events = (<_SaxParserContext?>parser._getPushParserContext()).events_iterator
+    cdef _ParseEventsIterator events_iterator = <_ParseEventsIterator>events
+    if events_iterator._record_ends is None:
+        raise ValueError("checkpoints were not enabled for this parser")
+    if events_iterator._checkpoint is None:
+        return None
+    offset, encoding, ancestors = events_iterator._checkpoint
+    return {'offset': offset, 'encoding': encoding, 'ancestors': list(ancestors)}
+
+
+cdef int _resumeFromCheckpoint(_FeedParser parser, checkpoint) except -1:
+    """Feed the start tags of the open ancestors of a checkpoint into the
+    parser, so that it continues at the checkpoint's byte offset.
+    """
+    cdef _ParseEventsIterator events_iterator
+    offset = checkpoint['offset']
+    encoding = checkpoint['encoding']
+    prefix = ''.join(checkpoint['ancestors']).encode(encoding or 'UTF-8')
+    parser.feed(prefix)
+    events_iterator = (<_SaxParserContext?>parser._getPushParserContext()).events_iterator
+    # the events of the ancestors were already reported before the checkpoint
+    del events_iterator._events[:]
+    events_iterator._event_index = 0
+    events_iterator._offset_base = offset - len(prefix)
+    return 0
+
+
+############################################################
+## parser pool
+############################################################
+
+cdef class ParserPool:
+    """ParserPool(self, factory=XMLParser, size=None, **parser_options)
+
+    A thread-safe pool of pre-configured parsers.
+
+    The pool creates ``size`` parsers up front (default: the number of CPUs)
+    by calling ``factory(**parser_options)``, e.g. ``XMLParser`` or
+    ``HTMLParser``.  Threads can then check out a parser for exclusive use::
+
+        pool = ParserPool(XMLParser, size=8, remove_blank_text=True)
+
+        with pool.checkout() as parser:
+            root = etree.fromstring(data, parser)
+
+    Compared to sharing a single parser between threads, this avoids
+    contention on the parser lock.  Compared to creating a new parser
+    for each parse, it keeps reusing the parser contexts and their string
+    dictionaries.  If all parsers are in use, ``checkout()`` waits until
+    one becomes available, or raises ``TimeoutError`` when the optional
+    ``timeout`` (in seconds) expires.
+
+    The ``stats`` property gives some usage statistics of the pool.
+    """
+    cdef object _condition
+    cdef list _idle_parsers
+    cdef readonly Py_ssize_t size
+    cdef Py_ssize_t _checkouts
+    cdef Py_ssize_t _waits
+    cdef Py_ssize_t _in_use
+    cdef Py_ssize_t _max_in_use
+
+    def __init__(self, factory=XMLParser, size=None, **parser_options):
+        cdef _BaseParser parser
+        import threading
+        if size is None:
+            import os
+            size = os.cpu_count() or 1
+        elif size < 1:
+            raise ValueError(f"invalid pool size: {size}")
+        parsers = []
+        for _ in range(size):
+            parser = factory(**parser_options)
+            if not isinstance(parser, _BaseParser):
+                raise TypeError, f"parser factory returned '{python._fqtypename(parser)}' instead of a parser"
+            # Set up the parser context now to avoid doing it during the first parse.
+            parser._getParserContext()
+            parsers.append(parser)
+        self._idle_parsers = parsers
+        self._condition = threading.Condition()
+        self.size = size
+
+    def checkout(self, timeout=None):
+        """checkout(self, timeout=None)
+
+        Returns a context manager that takes a parser from the pool on entry
+        and returns it to the pool on exit.
+        """
+        return _ParserPoolCheckout(self, timeout)
+
+    @property
+    def stats(self):
+        """A dict of usage statistics: the number of ``checkouts``, the number
+        of ``waits`` for a parser to become available, the number of parsers
+        currently ``in_use`` and the maximum number that was used concurrently
+        (``max_in_use``).
+        """
+        with self._condition:
+            return {
+                'size': self.size,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'in_use': self._in_use,
+                'max_in_use': self._max_in_use,
+            }
+
+    @cython.final
+    cdef _BaseParser _acquire(self, timeout):
+        with self._condition:
+            if not self._idle_parsers:
+                self._waits += 1
+                if not self._condition.wait_for(lambda: self._idle_parsers, timeout):
+                    raise TimeoutError("no parser available in pool")
+            parser = self._idle_parsers.pop()
+            self._checkouts += 1
+            self._in_use += 1
+            if self._in_use > self._max_in_use:
+                self._max_in_use = self._in_use
+            return parser
+
+    @cython.final
+    cdef _release(self, _BaseParser parser):
+        with self._condition:
+            self._idle_parsers.append(parser)
+            self._in_use -= 1
+            self._condition.notify()
+
+
+@cython.final
+@cython.internal
+cdef class _ParserPoolCheckout:
+    cdef ParserPool _pool
+    cdef _BaseParser _parser
+    cdef object _timeout
+
+    def __cinit__(self, ParserPool pool not None, timeout):
+        self._pool = pool
+        self._timeout = timeout
+
+    def __enter__(self):
+        if self._parser is not None:
+            raise RuntimeError("parser is already checked out")
+        self._parser = self._pool._acquire(self._timeout)
+        return self._parser
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        parser, self._parser = self._parser, None
+        if parser is not None:
+            self._pool._release(parser)
+
 
 ############################################################
 ## helper functions for document creation
@@ -2158,13 +3418,37 @@ cdef xmlDoc* _parseDoc_bytes(text: bytes, filename, const char* c_filename, _Bas
 
 
 cdef xmlDoc* _parseDoc_charbuffer(text, filename, const char* c_filename, _BaseParser parser) except NULL:
-    cdef const unsigned char[::1] data = memoryview(text).cast('B')  # cast to 'unsigned char' buffer
-    cdef Py_ssize_t c_len = len(data)
+    cdef const unsigned char[::1] data = _asByteBuffer(text)
+    cdef Py_ssize_t c_len = data.shape[0]
     if c_len > limits.INT_MAX:
-        return parser._parseDocFromFilelike(BytesIO(text), filename, None)
+        return parser._parseDocFromFilelike(_ByteBufferReader(text), filename, None)
+    if not c_len:
+        return parser._parseDoc(b'', 0, c_filename)
     return parser._parseDoc(<const char*>&data[0], c_len, c_filename)
 
 
+cdef const unsigned char[::1] _asByteBuffer(data) except *:
+    "Return a contiguous 'unsigned char' view of a buffer object, without copying it."
+    try:
+        view = memoryview(data)
+    except TypeError:
+        raise TypeError, f"Parsing requires string data or a bytes-like object, got '{python._fqtypename(data)}'"
+    if not view.c_contiguous:
+        raise BufferError, "Parsing requires a C-contiguous buffer"
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
+cdef Py_ssize_t _localFileSize(const char* c_filename) noexcept:
+    if c_filename is NULL:
+        return 0
+    import os
+    try:
+        return os.stat(_decodeFilename(<const_xmlChar*>c_filename)).st_size
+    except OSError:
+        return 0
+
 cdef xmlDoc* _parseDocFromFile(filename8, _BaseParser parser) except NULL:
     if parser is None:
         parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
@@ -2271,6 +3555,11 @@ cdef _Document _parseDocument(source, _BaseParser parser, base_url):
     if hasattr(source, 'getvalue') and hasattr(source, 'tell'):
         # StringIO - reading from start?
         if source.tell() == 0:
+            if parser is None:
+                parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+            if parser._progress_callback is not None and hasattr(source, 'getbuffer'):
+                # BytesIO - push its buffer in pieces to report the progress
+                return _parseBufferDocument(source.getbuffer(), url, parser)
             return _parseMemoryDocument(source.getvalue(), url, parser)
 
     # Support for file-like objects (urlgrabber.urlopen, ...)
@@ -2279,9 +3568,15 @@ cdef _Document _parseDocument(source, _BaseParser parser, base_url):
 
     raise TypeError, f"cannot parse from '{python._fqtypename(source)}'"
 
+cdef _Document _parsedDocumentFactory(xmlDoc* c_doc, _BaseParser parser):
+    cdef _Document doc = _documentFactory(c_doc, parser)
+    if parser is not None:
+        doc._parse_stats = parser._getParseStats(c_doc)
+    return doc
+
 cdef _Document _parseDocumentFromURL(url, _BaseParser parser):
     c_doc = _parseDocFromFile(url, parser)
-    return _documentFactory(c_doc, parser)
+    return _parsedDocumentFactory(c_doc, parser)
 
 cdef _Document _parseMemoryDocument(text, url, _BaseParser parser):
     if isinstance(text, unicode):
@@ -2290,8 +3585,346 @@ cdef _Document _parseMemoryDocument(text, url, _BaseParser parser):
                 "Unicode strings with encoding declaration are not supported. "
                 "Please use bytes input or XML fragments without declaration.")
     c_doc = _parseDoc(text, url, parser)
-    return _documentFactory(c_doc, parser)
+    return _parsedDocumentFactory(c_doc, parser)
 
 cdef _Document _parseFilelikeDocument(source, url, _BaseParser parser):
     c_doc = _parseDocFromFilelike(source, url, parser)
-    return _documentFactory(c_doc, parser)
+    return _parsedDocumentFactory(c_doc, parser)
+
+cdef _Document _parseBufferDocument(view, url, _BaseParser parser):
+    try:
+        c_doc = _parseDocFromSlices(
+            view, parser._progress_interval, _encodeFilenameUTF8(url) if url else None, parser)
+    finally:
+        view.release()
+    return _parsedDocumentFactory(c_doc, parser)
+
+cdef xmlDoc* _parseDocFromSlices(view, Py_ssize_t slice_size, bytes filename,
+                                 _BaseParser parser) except NULL:
+    """Push the bytes of a memoryview into the parser in slices of at most
+    slice_size bytes.  The slices are released before returning.
+    """
+    slices = [view[start : start + slice_size] for start in range(0, len(view), slice_size)]
+    try:
+        return parser._parseDocFromChunks(slices, filename)
+    finally:
+        for piece in slices:
+            piece.release()
+
+cdef _Document _parseCompressedDocument(source, _BaseParser parser, base_url, compression):
+    cdef _DecompressingReader reader
+    source = _getFSPathOrObject(source)
+    if _isString(source):
+        url = source
+        reader = _DecompressingReader(open(source, 'rb'), compression, close_source=True)
+    elif hasattr(source, 'read'):
+        url = _getFilenameForFile(source)
+        reader = _DecompressingReader(source, compression)
+    else:
+        raise TypeError, f"cannot parse from '{python._fqtypename(source)}'"
+    if base_url is not None:
+        url = base_url
+    if parser is None:
+        parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+    try:
+        c_doc = parser._parseDocFromChunks(
+            reader, _encodeFilenameUTF8(url) if url else None)
+    finally:
+        reader.close()
+    return _parsedDocumentFactory(c_doc, parser)
+
+
+cdef bint _mapsFile(source, _BaseParser parser) except -1:
+    """Check if the parser memory maps its input files by default and the
+    source is a local file that can be mapped.
+    """
+    if parser is None:
+        parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+    if not parser._flags.mmap:
+        return False
+    source = _getFSPathOrObject(source)
+    if _isString(source):
+        return _isFilePath(_xcstr(_encodeFilename(source)))
+    try:
+        source.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
+
+
+# Largest part of a memory mapped file that is parsed in one piece.
+cdef Py_ssize_t _MMAP_SLICE_SIZE = limits.INT_MAX
+
+cdef _Document _parseMappedFileDocument(source, _BaseParser parser, base_url):
+    """Parse a local file from a read-only memory mapping of its content,
+    without reading it through Python byte strings.
+    """
+    cdef const unsigned char[::1] data
+    cdef const char* c_filename
+    cdef xmlDoc* c_doc = NULL
+    import mmap, os
+
+    source = _getFSPathOrObject(source)
+    if _isString(source):
+        url = source
+        file = open(source, 'rb')
+    else:
+        url = _getFilenameForFile(source)
+        file = source
+        try:
+            file.fileno()
+        except (AttributeError, OSError, ValueError):
+            raise TypeError, f"cannot memory map '{python._fqtypename(source)}'"
+    if base_url is not None:
+        url = base_url
+
+    try:
+        fileno = file.fileno()
+        # Parse file objects from their current position, as when reading them.
+        offset = file.tell() if file is source else 0
+        size = os.fstat(fileno).st_size - offset
+        if size <= 0:
+            # Empty files cannot be mapped.
+            if file is not source:
+                file.close()
+                file = None
+            return _parseDocument(source, parser, base_url)
+
+        if parser is None:
+            parser = __GLOBAL_PARSER_CONTEXT.getDefaultParser()
+        url_utf = _encodeFilenameUTF8(url) if url else None
+        c_filename = _cstr(url_utf) if url_utf is not None else NULL
+
+        # The mapping must start at a multiple of the allocation granularity.
+        map_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+        mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ, offset=map_offset)
+        try:
+            if hasattr(mapping, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            slice_size = _MMAP_SLICE_SIZE
+            if parser._progress_callback is not None:
+                slice_size = min(slice_size, parser._progress_interval)
+            elif size <= slice_size:
+                data = mapping
+                try:
+                    c_doc = parser._parseDoc(
+                        <const char*>&data[offset - map_offset], <int>size, c_filename)
+                finally:
+                    data = None  # release the buffer before closing the mapping
+            if c_doc is NULL:
+                # Too large for the libxml2 memory parser or reporting the
+                # progress, push it in slices.
+                view = memoryview(mapping)
+                content = view[offset - map_offset : offset - map_offset + size]
+                try:
+                    c_doc = _parseDocFromSlices(content, slice_size, url_utf, parser)
+                finally:
+                    # release the buffers before closing the mapping
+                    content.release()
+                    view.release()
+        finally:
+            mapping.close()
+        if file is source:
+            file.seek(offset + size)
+    finally:
+        if file is not None and file is not source:
+            file.close()
+    return _parsedDocumentFactory(c_doc, parser)
+
+
+############################################################
+## parallel parsing of multiple documents
+############################################################
+
+@cython.internal
+cdef class _ParseManyIterator:
+    """Parses documents on a thread pool and returns the resulting trees.
+
+    Each worker thread parses with its own copy of the template parser,
+    so that the parser contexts (and their locks) are never shared.
+    """
+    cdef _BaseParser _parser
+    cdef object _sources
+    cdef object _executor
+    cdef object _pending
+    cdef object _thread_local
+    cdef Py_ssize_t _max_pending
+    cdef bint _ordered
+
+    def __cinit__(self, sources, _BaseParser parser not None, int workers, bint ordered):
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import local
+        self._parser = parser
+        self._sources = iter(sources)
+        self._ordered = ordered
+        self._pending = deque()
+        self._max_pending = 2 * workers
+        self._thread_local = local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="lxml-parse_many")
+
+    def __del__(self):
+        # Runs before the GC clears the references, unlike __dealloc__().
+        if self._executor is not None:
+            self._shutdown(cancel=True)
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """close(self)
+
+        Stops the iteration, cancels the pending parser runs and shuts down
+        the worker threads.
+        """
+        self._shutdown(cancel=True)
+
+    def __next__(self):
+        self._submit_pending()
+        if not self._pending:
+            self._shutdown()
+            raise StopIteration
+        if self._ordered:
+            future = self._pending.popleft()
+        else:
+            from concurrent.futures import wait, FIRST_COMPLETED
+            future = next(iter(wait(self._pending, return_when=FIRST_COMPLETED)[0]))
+            self._pending.remove(future)
+        return future.result()
+
+    def _parse(self, source):
+        cdef _BaseParser parser = self._threadParser()
+        if _mapsFile(source, parser):
+            return _elementTreeFactory(_parseMappedFileDocument(source, parser, None), None)
+        return _elementTreeFactory(_parseDocument(source, parser, None), None)
+
+    @cython.final
+    cdef _BaseParser _threadParser(self):
+        cdef _BaseParser parser = getattr(self._thread_local, 'parser', None)
+        if parser is None:
+            parser = self._parser._copy()
+            self._thread_local.parser = parser
+        return parser
+
+    @cython.final
+    cdef _submit_pending(self):
+        while self._sources is not None and len(self._pending) < self._max_pending:
+            try:
+                source = next(self._sources)
+            except StopIteration:
+                self._sources = None
+                break
+            self._pending.append(self._executor.submit(self._parse, source))
+
+    @cython.final
+    cdef _shutdown(self, bint cancel=False, bint wait=False):
+        if cancel:
+            self._sources = None
+            if self._pending is not None:
+                self._pending.clear()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=wait, cancel_futures=cancel)
+
+
+############################################################
+## asynchronous parsing
+############################################################
+
+async def _aread_data_chunks(source, Py_ssize_t chunk_size):
+    """Yield the data chunks of an async iterable or an async reader
+    with a ``.read(size)`` coroutine method.
+    """
+    read = getattr(source, 'read', None)
+    if read is not None:
+        while True:
+            data = await read(chunk_size)
+            if not data:
+                break
+            yield data
+    elif hasattr(source, '__aiter__'):
+        async for data in source:
+            yield data
+    else:
+        raise TypeError(
+            "Input source needs an async .read() method or must be an async iterable")
+
+
+async def _afeed_parser(_FeedParser parser, source, executor, Py_ssize_t chunk_size):
+    """Feed all data from an async source into the parser and close it.
+
+    Each chunk is parsed in the executor while the event loop reads the
+    next one.  Returns the result of ``parser.close()``.  If feeding fails
+    or gets cancelled, the parser is reset for its next use.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    feeding = None
+    completed = False
+    try:
+        async for data in _aread_data_chunks(source, chunk_size):
+            if feeding is not None:
+                # Cancelling the task must not abandon the running feed() call.
+                await asyncio.shield(feeding)
+            feeding = loop.run_in_executor(executor, parser.feed, data)
+        if feeding is not None:
+            await asyncio.shield(feeding)
+        feeding = loop.run_in_executor(executor, parser.close)
+        result = await asyncio.shield(feeding)
+        feeding = None
+        completed = True
+        return result
+    finally:
+        if not completed:
+            await _afinish_parser(parser, feeding)
+
+
+async def _aread_pull_events(_FeedParser parser, source, executor, Py_ssize_t chunk_size):
+    """Feed all data from an async source into a pull parser and yield
+    its parse events after each chunk.  If feeding fails, gets cancelled
+    or the iteration is abandoned, the parser is reset for its next use.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    feeding = None
+    completed = False
+    try:
+        async for data in _aread_data_chunks(source, chunk_size):
+            if feeding is not None:
+                await asyncio.shield(feeding)
+                feeding = None
+                for event in parser.read_events():
+                    yield event
+            feeding = loop.run_in_executor(executor, parser.feed, data)
+        if feeding is not None:
+            await asyncio.shield(feeding)
+        feeding = loop.run_in_executor(executor, parser.close)
+        await asyncio.shield(feeding)
+        feeding = None
+        completed = True
+    finally:
+        if not completed:
+            await _afinish_parser(parser, feeding)
+    for event in parser.read_events():
+        yield event
+
+
+async def _afinish_parser(_FeedParser parser, feeding):
+    """Wait for a pending feed() or close() call in the executor to finish
+    and reset the parser.
+    """
+    import asyncio
+    if feeding is not None:
+        if not feeding.done():
+            await asyncio.wait([feeding])
+        if not feeding.cancelled():
+            # An earlier exception is already being raised.
+            feeding.exception()
+    parser.reset()
@@ -117,6 +117,77 @@ cdef class _PythonSaxParserTarget(_SaxParserTarget):
         return self._target_comment(comment)
 
 
+# C level parser targets
+
+ctypedef public object (*_target_start_function)(object, object, object, object)
+ctypedef public object (*_target_end_function)(object, object)
+ctypedef public int (*_target_data_function)(object, object) except -1
+ctypedef public object (*_target_comment_function)(object, object)
+ctypedef public object (*_target_pi_function)(object, object, object)
+
+# class to store parser target callback functions
+cdef public class ParserTargetBase [ type LxmlParserTargetBaseType,
+                                     object LxmlParserTargetBase ]:
+    """ParserTargetBase(self)
+    Superclass of parser targets that are implemented in C or Cython.
+
+    Subclasses set the C callback functions when they are created.
+    The parser calls them directly, without looking up Python methods.
+    Callbacks that are left unset disable the respective event.
+    Python subclasses behave like any other parser target.
+    """
+    cdef _target_start_function _start_function
+    cdef _target_end_function _end_function
+    cdef _target_data_function _data_function
+    cdef _target_comment_function _comment_function
+    cdef _target_pi_function _pi_function
+
+    def close(self):
+        """close(self)
+
+        Returns the parse result.  Returns None by default.
+        """
+        return None
+
+
+@cython.final
+@cython.internal
+cdef class _CParserTarget(_SaxParserTarget):
+    """Dispatches the SAX events to the C functions of a ParserTargetBase.
+    """
+    cdef ParserTargetBase _target
+
+    def __cinit__(self, ParserTargetBase target not None):
+        cdef int event_filter = 0
+        self._target = target
+        if target._start_function is not NULL:
+            event_filter |= SAX_EVENT_START
+        if target._end_function is not NULL:
+            event_filter |= SAX_EVENT_END
+        if target._data_function is not NULL:
+            event_filter |= SAX_EVENT_DATA
+        if target._comment_function is not NULL:
+            event_filter |= SAX_EVENT_COMMENT
+        if target._pi_function is not NULL:
+            event_filter |= SAX_EVENT_PI
+        self._sax_event_filter = event_filter
+
+    cdef _handleSaxStart(self, tag, attrib, nsmap):
+        return self._target._start_function(self._target, tag, attrib, nsmap)
+
+    cdef _handleSaxEnd(self, tag):
+        return self._target._end_function(self._target, tag)
+
+    cdef int _handleSaxData(self, data) except -1:
+        return self._target._data_function(self._target, data)
+
+    cdef _handleSaxPi(self, target, data):
+        return self._target._pi_function(self._target, target, data)
+
+    cdef _handleSaxComment(self, comment):
+        return self._target._comment_function(self._target, comment)
+
+
 @cython.final
 @cython.internal
 cdef class _TargetParserContext(_SaxParserContext):
@@ -125,8 +196,11 @@ cdef class _TargetParserContext(_SaxParserContext):
     cdef object _python_target
     cdef int _setTarget(self, target) except -1:
         self._python_target = target
-        if not isinstance(target, _SaxParserTarget) or \
-                hasattr(target, '__dict__'):
+        if hasattr(target, '__dict__'):
+            target = _PythonSaxParserTarget(target)
+        elif isinstance(target, ParserTargetBase):
+            target = _CParserTarget(target)
+        elif not isinstance(target, _SaxParserTarget):
             target = _PythonSaxParserTarget(target)
         self._setSaxParserTarget(target)
         return 0
@@ -153,6 +227,7 @@ cdef class _TargetParserContext(_SaxParserContext):
             if self._has_raised():
                 self._cleanupTargetParserContext(result)
                 self._raise_if_stored()
+            self.flushTargetData()
             if not self._c_ctxt.wellFormed and not recover:
                 _raiseParseError(self._c_ctxt, filename, self._error_log)
         except:
@@ -170,6 +245,7 @@ cdef class _TargetParserContext(_SaxParserContext):
         try:
             self._cleanupTargetParserContext(result)
             self._raise_if_stored()
+            self.flushTargetData()
             if not self._c_ctxt.wellFormed and not recover:
                 _raiseParseError(self._c_ctxt, filename, self._error_log)
         except:
@@ -78,6 +78,7 @@ cdef class _SaxParserContext(_ParserContext):
     """
     cdef _SaxParserTarget _target
     cdef _BaseParser _parser
+    cdef list _target_data  # pending character data for the target
     cdef xmlparser.startElementNsSAX2Func _origSaxStart
     cdef xmlparser.endElementNsSAX2Func   _origSaxEnd
     cdef xmlparser.startElementSAXFunc    _origSaxStartNoNs
@@ -99,9 +100,24 @@ cdef class _SaxParserContext(_ParserContext):
     cdef _Element  _root
     cdef _MultiTagMatcher _matcher
 
+    # for structural projection
+    cdef _ParseProjection _projection
+
+    # for record extraction
+    cdef _RecordExtraction _extraction
+
+    # for columnar event output
+    cdef _EventColumnsBuilder _columns
+
+    # for splitting concatenated documents
+    cdef bint _split_documents
+    cdef long long _document_fed
+    cdef long long _document_end
+
     def __cinit__(self, _BaseParser parser):
         self._ns_stack = []
         self._node_stack = []
+        self._target_data = []
         self._parser = parser
         self.events_iterator = _ParseEventsIterator()
 
@@ -110,9 +126,13 @@ cdef class _SaxParserContext(_ParserContext):
 
     cdef void _initParserContext(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
         _ParserContext._initParserContext(self, c_ctxt)
-        if self._target is not None:
+        if self._columns is not None:
+            self._connectColumns(c_ctxt)
+        elif self._target is not None:
             self._connectTarget(c_ctxt)
-        elif self._event_filter:
+        elif (self._event_filter or self._projection is not None or
+                self._extraction is not None or self._split_documents or
+                self._progress_callback is not None or self._collect_stats):
             self._connectEvents(c_ctxt)
 
     cdef void _connectTarget(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
@@ -121,23 +141,28 @@ cdef class _SaxParserContext(_ParserContext):
         sax = c_ctxt.sax
         self._origSaxStart = sax.startElementNs = NULL
         self._origSaxStartNoNs = sax.startElement = NULL
-        if self._target._sax_event_filter & (SAX_EVENT_START |
-                                             SAX_EVENT_START_NS |
-                                             SAX_EVENT_END_NS):
+        # Character data is collected until the next element starts or ends.
+        if self._progress_callback is not None or self._collect_stats or \
+                self._target._sax_event_filter & (SAX_EVENT_START |
+                                                  SAX_EVENT_START_NS |
+                                                  SAX_EVENT_END_NS |
+                                                  SAX_EVENT_DATA):
             # intercept => overwrite orig callback
             # FIXME: also intercept on when collecting END events
             if sax.initialized == xmlparser.XML_SAX2_MAGIC:
                 sax.startElementNs = _handleSaxTargetStart
-            if self._target._sax_event_filter & SAX_EVENT_START:
+            if self._progress_callback is not None or self._collect_stats or \
+                    self._target._sax_event_filter & (SAX_EVENT_START | SAX_EVENT_DATA):
                 sax.startElement = _handleSaxTargetStartNoNs
 
         self._origSaxEnd = sax.endElementNs = NULL
         self._origSaxEndNoNs = sax.endElement = NULL
         if self._target._sax_event_filter & (SAX_EVENT_END |
-                                             SAX_EVENT_END_NS):
+                                             SAX_EVENT_END_NS |
+                                             SAX_EVENT_DATA):
             if sax.initialized == xmlparser.XML_SAX2_MAGIC:
                 sax.endElementNs = _handleSaxEnd
-            if self._target._sax_event_filter & SAX_EVENT_END:
+            if self._target._sax_event_filter & (SAX_EVENT_END | SAX_EVENT_DATA):
                 sax.endElement = _handleSaxEndNoNs
 
         self._origSaxData = sax.characters = sax.cdataBlock = NULL
@@ -161,16 +186,39 @@ cdef class _SaxParserContext(_ParserContext):
         sax.reference = NULL
         c_ctxt.replaceEntities = 1
 
+    cdef void _connectColumns(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
+        """Replace the SAX2 tree building callbacks to collect columnar events.
+        """
+        sax = c_ctxt.sax
+        self._origSaxStart = sax.startElementNs = <xmlparser.startElementNsSAX2Func>_handleColumnsStart
+        self._origSaxEnd = sax.endElementNs = <xmlparser.endElementNsSAX2Func>_handleColumnsEnd
+        self._origSaxStartNoNs = sax.startElement = NULL
+        self._origSaxEndNoNs = sax.endElement = NULL
+        if sax.ignorableWhitespace is sax.characters:
+            sax.ignorableWhitespace = <xmlparser.charactersSAXFunc>_handleColumnsData
+        self._origSaxData = sax.characters = <xmlparser.charactersSAXFunc>_handleColumnsData
+        sax.cdataBlock = <xmlparser.cdataBlockSAXFunc>_handleColumnsData
+        self._origSaxPI = sax.processingInstruction = NULL
+        self._origSaxComment = sax.comment = NULL
+
+        # enforce entity replacement
+        sax.reference = NULL
+        c_ctxt.replaceEntities = 1
+
     cdef void _connectEvents(self, xmlparser.xmlParserCtxt* c_ctxt) noexcept:
         """Wrap original SAX2 callbacks to collect parse events without parser target.
         """
         sax = c_ctxt.sax
         self._origSaxStartDocument = sax.startDocument
-        sax.startDocument = _handleSaxStartDocument
+        if self._event_filter:
+            # a plain projection does not need a document proxy while parsing
+            sax.startDocument = _handleSaxStartDocument
 
         # only override "start" event handler if needed
         self._origSaxStart = sax.startElementNs
         if self._event_filter == 0 or c_ctxt.html or \
+               self._projection is not None or \
+               self._progress_callback is not None or self._collect_stats or \
                self._event_filter & (PARSE_EVENT_FILTER_START |
                                      PARSE_EVENT_FILTER_END |
                                      PARSE_EVENT_FILTER_START_NS |
@@ -179,6 +227,8 @@ cdef class _SaxParserContext(_ParserContext):
 
         self._origSaxStartNoNs = sax.startElement
         if self._event_filter == 0 or c_ctxt.html or \
+               self._projection is not None or \
+               self._progress_callback is not None or self._collect_stats or \
                self._event_filter & (PARSE_EVENT_FILTER_START |
                                      PARSE_EVENT_FILTER_END):
             sax.startElement = <xmlparser.startElementSAXFunc>_handleSaxStartNoNs
@@ -186,12 +236,15 @@ cdef class _SaxParserContext(_ParserContext):
         # only override "end" event handler if needed
         self._origSaxEnd = sax.endElementNs
         if self._event_filter == 0 or \
+               self._projection is not None or \
+               self._split_documents or \
                self._event_filter & (PARSE_EVENT_FILTER_END |
                                      PARSE_EVENT_FILTER_END_NS):
             sax.endElementNs = <xmlparser.endElementNsSAX2Func>_handleSaxEnd
 
         self._origSaxEndNoNs = sax.endElement
         if self._event_filter == 0 or \
+               self._projection is not None or \
                self._event_filter & PARSE_EVENT_FILTER_END:
             sax.endElement = <xmlparser.endElementSAXFunc>_handleSaxEndNoNs
 
@@ -203,6 +256,63 @@ cdef class _SaxParserContext(_ParserContext):
         if self._event_filter & PARSE_EVENT_FILTER_PI:
             sax.processingInstruction = <xmlparser.processingInstructionSAXFunc>_handleSaxPIEvent
 
+    cdef int prepare(self, bint set_document_loader=True) except -1:
+        _ParserContext.prepare(self, set_document_loader)
+        if self._projection is not None:
+            self._projection.reset()
+        if self._extraction is not None:
+            self._extraction.reset()
+        if self._columns is not None:
+            self._columns.reset()
+        del self._target_data[:]
+        if self._progress is not None and self._progress._events is None:
+            self._progress._events = self.events_iterator
+            self._progress._events_start = self.events_iterator.emitted()
+        self.events_iterator.resetCheckpoints()
+        self._document_fed = 0
+        self._document_end = -1
+        return 0
+
+    cdef int flushTargetData(self) except -1:
+        """Pass the collected character data to the target in a single call.
+        """
+        cdef list chunks = self._target_data
+        if not chunks:
+            return 0
+        data = (<bytes>chunks[0] if len(chunks) == 1 else b''.join(chunks)).decode('utf8')
+        del chunks[:]
+        self._target._handleSaxData(data)
+        return 0
+
+    cdef int clearEvents(self) except -1:
+        """Discard all pending events and the state of open elements.
+        """
+        del self.events_iterator._events[:]
+        self.events_iterator._event_index = 0
+        del self._node_stack[:]
+        del self._ns_stack[:]
+        return 0
+
+    cdef int countElement(self, int c_nb_attributes, int c_nb_defaulted) except -1:
+        """Update the counters of the current parser run for a new element.
+        """
+        if self._stats is not None:
+            self._stats._elements += 1
+            if c_nb_defaulted > 0 and self._c_ctxt.loadsubset & xmlparser.XML_COMPLETE_ATTRS == 0:
+                # default attributes only get added if we asked for them
+                c_nb_attributes -= c_nb_defaulted
+            self._stats._attributes += c_nb_attributes
+        if self._progress is not None:
+            self._progress.elementStarted()
+        return 0
+
+    cdef int countElementNoNs(self, const_xmlChar** c_attributes) except -1:
+        cdef int c_nb_attributes = 0
+        if self._stats is not None and c_attributes is not NULL:
+            while c_attributes[c_nb_attributes * 2] is not NULL:
+                c_nb_attributes += 1
+        return self.countElement(c_nb_attributes, 0)
+
     cdef _setEventFilter(self, events, tag):
         self._event_filter = _buildParseEventFilter(events)
         if not self._event_filter or tag is None or tag == '*':
@@ -253,6 +363,14 @@ cdef class _ParseEventsIterator:
     """A reusable parse events iterator"""
     cdef list _events
     cdef int _event_index
+    cdef Py_ssize_t _events_read
+
+    # for checkpoints
+    cdef object _record_ends  # deque of (node address, end offset) of top-level elements
+    cdef long long _offset_base
+    cdef tuple _ancestors  # start tags of the open ancestors of top-level elements
+    cdef object _encoding
+    cdef tuple _checkpoint  # (offset, encoding, ancestors) of the last returned element
 
     def __cinit__(self):
         self._events = []
@@ -272,9 +390,733 @@ cdef class _ParseEventsIterator:
             if event_index >= len(events):
                 raise StopIteration
         item = events[event_index]
+        # do not keep processed elements alive
+        events[event_index] = None
         self._event_index = event_index + 1
+        self._events_read += 1
+        if self._record_ends:
+            self._trackCheckpoint(item)
         return item
 
+    cdef list next_batch(self, Py_ssize_t max_events):
+        """Return a list of up to max_events pending events, or all of them
+        if max_events is negative.
+        """
+        cdef Py_ssize_t event_index = self._event_index
+        events = self._events
+        end = len(events)
+        if 0 <= max_events < end - event_index:
+            end = event_index + max_events
+        batch = events[event_index:end]
+        if end * 2 >= len(events):
+            # clean up once the processed events make up half of the list
+            del events[:end]
+            end = 0
+        else:
+            # do not keep processed elements alive
+            events[event_index:end] = [None] * (end - event_index)
+        self._event_index = <int>end
+        self._events_read += len(batch)
+        if self._record_ends:
+            for item in batch:
+                self._trackCheckpoint(item)
+        return batch
+
+    cdef Py_ssize_t emitted(self) noexcept:
+        """The number of events that were read or are pending.
+        """
+        return self._events_read + len(self._events) - self._event_index
+
+    cdef void resetCheckpoints(self) noexcept:
+        if self._record_ends is not None:
+            self._record_ends.clear()
+        self._offset_base = 0
+        self._ancestors = None
+        self._encoding = None
+        self._checkpoint = None
+
+    cdef int _trackCheckpoint(self, item) except -1:
+        cdef tuple event
+        if type(item) is not tuple:
+            return 0
+        event = <tuple>item
+        if event[0] != 'end' or not isinstance(event[1], _Element):
+            return 0
+        if <size_t>(<_Element>event[1])._c_node == self._record_ends[0][0]:
+            offset = self._record_ends.popleft()[1]
+            self._checkpoint = (offset, self._encoding, self._ancestors)
+        return 0
+
+    cdef int recordEnd(self, _SaxParserContext context, xmlNode* c_node) except -1:
+        """Remember the input offset after the end tag of a top-level element.
+        """
+        cdef xmlNode* c_parent = c_node.parent
+        if c_parent is NULL or not _isElement(c_parent):
+            return 0
+        if c_parent.parent is not NULL and _isElement(c_parent.parent):
+            return 0
+        offset = xmlparser.xmlByteConsumed(context._c_ctxt)
+        if offset < 0:
+            return 0
+        if self._ancestors is None:
+            self._ancestors = (_startTagString(_elementFactory(context._doc, c_parent)),)
+            self._encoding = funicodeOrNone(context._c_ctxt.encoding)
+        self._record_ends.append((<size_t>c_node, self._offset_base + offset))
+        return 0
+
+
+cdef unicode _startTagString(_Element element):
+    """Serialise the start tag of an element with its attributes and all
+    namespace declarations that are in scope.
+    """
+    empty = element.makeelement(element.tag, element.attrib, element.nsmap)
+    return tostring(empty, encoding='unicode')[:-2] + '>'
+
+
+@cython.final
+@cython.internal
+cdef class _ParseProjection:
+    """Discards all subtrees during parsing that are not selected by one of
+    a set of ElementPath expressions, evaluated relative to the root element.
+
+    Selected elements are kept with their complete subtree, together with
+    their ancestors.  Everything else is freed as soon as it was parsed.
+    """
+    cdef tuple _paths  # tuple of paths, each a tuple of (is_descendant, matcher) steps
+    cdef bint _keep_all
+    cdef bint _has_descendant_steps
+    cdef Py_ssize_t _depth
+    cdef Py_ssize_t _kept_depth  # depth of the selected subtree that we are in
+    cdef Py_ssize_t _dead_depth  # depth of the subtree that cannot contain selected elements
+
+    cdef _ParseProjection copy(self):
+        """Create a copy with separate tag matchers for a new parser context.
+        """
+        cdef _ParseProjection projection = _ParseProjection.__new__(_ParseProjection)
+        projection._keep_all = self._keep_all
+        projection._has_descendant_steps = self._has_descendant_steps
+        projection._paths = tuple([
+            tuple([(is_descendant, (<_MultiTagMatcher>matcher).copy())
+                   for is_descendant, matcher in path])
+            for path in self._paths
+        ])
+        return projection
+
+    cdef void reset(self) noexcept:
+        self._depth = 0
+        self._kept_depth = -1
+        self._dead_depth = -1
+
+    cdef int startElement(self, xmlNode* c_node) except -1:
+        cdef tuple path
+        cdef bint alive
+        self._depth += 1
+        if self._kept_depth != -1 or self._dead_depth != -1:
+            return 0
+        if self._depth == 1:
+            if self._keep_all:
+                self._kept_depth = 1
+            else:
+                for path in self._paths:
+                    for _, matcher in path:
+                        (<_MultiTagMatcher>matcher).cacheParserTags(c_node.doc)
+            return 0
+
+        # Without descendant steps, only elements that match the start
+        # of a path can have selected descendants.
+        alive = self._has_descendant_steps
+        for path in self._paths:
+            if not path:
+                continue
+            if self._matchesPath(path, len(path) - 1, c_node):
+                self._kept_depth = self._depth
+                return 0
+            if not alive and len(path) > self._depth - 1:
+                alive = self._matchesPath(path, self._depth - 2, c_node)
+        if not alive:
+            self._dead_depth = self._depth
+        return 0
+
+    cdef int endElement(self, xmlparser.xmlParserCtxt* c_ctxt, _Document doc,
+                        xmlNode* c_node) except -1:
+        cdef xmlNode* c_child
+        cdef Py_ssize_t depth = self._depth
+        self._depth -= 1
+        if self._kept_depth != -1:
+            if self._kept_depth == depth:
+                self._kept_depth = -1
+            return 0
+        if c_node is NULL or c_node.type != tree.XML_ELEMENT_NODE:
+            return 0
+        if self._dead_depth != -1:
+            if self._dead_depth != depth:
+                # discarded together with the top-most element of the subtree
+                return 0
+            self._dead_depth = -1
+        else:
+            if depth <= 1:
+                # always keep the root element
+                return 0
+            # Non-selected children were already discarded at their end,
+            # so any remaining child element makes this an ancestor to keep.
+            c_child = c_node.children
+            while c_child is not NULL:
+                if c_child.type == tree.XML_ELEMENT_NODE:
+                    return 0
+                c_child = c_child.next
+
+        if doc is not None:
+            _removeNode(doc, c_node)
+        else:
+            tree.xmlUnlinkNode(c_node)
+            tree.xmlFreeNode(c_node)
+        # The SAX2 tree builder tracks the buffer of the last text node for
+        # appending to it.  The text before the discarded element may now be
+        # the last child, so make it use a safe (re-)allocation on append.
+        c_ctxt.nodemem = 0
+        return 0
+
+    cdef bint _matchesPath(self, tuple path, Py_ssize_t i, xmlNode* c_node):
+        """Match the path steps up to index i against c_node and its ancestors.
+        """
+        cdef tuple step = <tuple>path[i]
+        cdef bint is_descendant = step[0]
+        if not (<_MultiTagMatcher>step[1]).matches(c_node):
+            return False
+        c_node = c_node.parent
+        if i == 0:
+            # the first step matches children (or descendants) of the root element
+            return is_descendant or _isProjectionRoot(c_node)
+        while not _isProjectionRoot(c_node):
+            if self._matchesPath(path, i - 1, c_node):
+                return True
+            if not is_descendant:
+                return False
+            c_node = c_node.parent
+        return False
+
+
+cdef inline bint _isProjectionRoot(xmlNode* c_node) noexcept:
+    return c_node is NULL or c_node.parent is NULL or \
+        c_node.parent.type != tree.XML_ELEMENT_NODE
+
+
+cdef _ParseProjection _newParseProjection(keep):
+    """Compile one or more ElementPath expressions into a parse projection.
+    Only plain child, descendant and wildcard steps are supported.
+    """
+    cdef _ParseProjection projection = _ParseProjection.__new__(_ParseProjection)
+    if _isString(keep):
+        keep = (keep,)
+    paths = []
+    for path in keep:
+        steps = []
+        for selector in _build_path_iterator(path, None):
+            if isinstance(selector, _ChildPathEvaluator):
+                steps.append((False, (<_ChildPathEvaluator>selector)._matcher.copy()))
+            elif isinstance(selector, _DescendantPathEvaluator):
+                steps.append((True, (<_DescendantPathEvaluator>selector)._matcher.copy()))
+                projection._has_descendant_steps = True
+            elif isinstance(selector, _StarPathEvaluator):
+                steps.append((False, _newMultiTagMatcher('*')))
+            elif not isinstance(selector, _SelfPathEvaluator):
+                raise SyntaxError, f"unsupported path expression for parser projection: '{path}'"
+        if not steps:
+            projection._keep_all = True
+        paths.append(tuple(steps))
+    if not paths:
+        raise ValueError, "no paths provided for parser projection"
+    projection._paths = tuple(paths)
+    return projection
+
+
+@cython.final
+@cython.internal
+cdef class _RecordExtraction:
+    """Extracts the values of a fixed set of simple paths from each record
+    element when it ends, and then discards the record from the tree.
+
+    A path selects the text of the first matching element, or an attribute
+    value with a trailing ``@name`` step.  The values are collected into a
+    dict, or into a tuple if the paths were not given as a mapping, without
+    creating element proxies.
+    """
+    cdef _MultiTagMatcher _matcher
+    cdef tuple _keys  # None for tuple records
+    cdef tuple _paths  # tuple of (steps, attribute name), steps as (is_descendant, matcher)
+    cdef xmlDoc* _c_doc
+
+    cdef _RecordExtraction copy(self):
+        """Create a copy with separate tag matchers for a new parser context.
+        """
+        cdef _RecordExtraction extraction = _RecordExtraction.__new__(_RecordExtraction)
+        extraction._matcher = self._matcher.copy()
+        extraction._keys = self._keys
+        extraction._paths = tuple([
+            (tuple([(is_descendant, (<_MultiTagMatcher>matcher).copy())
+                    for is_descendant, matcher in steps]), attribute)
+            for steps, attribute in self._paths
+        ])
+        return extraction
+
+    cdef void reset(self) noexcept:
+        self._c_doc = NULL
+
+    cdef int endElement(self, xmlparser.xmlParserCtxt* c_ctxt, _SaxParserContext context,
+                        xmlNode* c_node) except -1:
+        cdef xmlNode* c_parent
+        cdef xmlNode* c_child
+        if c_node is NULL or c_node.type != tree.XML_ELEMENT_NODE:
+            return 0
+        if c_node.doc is not self._c_doc:
+            self._cacheTags(c_node.doc)
+        if not self._matcher.matches(c_node):
+            return 0
+        context.events_iterator._events.append(self._extract(c_node))
+
+        c_parent = c_node.parent
+        if c_parent is NULL or c_parent.type != tree.XML_ELEMENT_NODE:
+            # keep the root element
+            return 0
+        # No proxies exist for the discarded nodes, so we can free them right away.
+        while c_parent.children is not c_node:
+            c_child = c_parent.children
+            tree.xmlUnlinkNode(c_child)
+            tree.xmlFreeNode(c_child)
+        tree.xmlUnlinkNode(c_node)
+        tree.xmlFreeNode(c_node)
+        # The SAX2 tree builder tracks the buffer of the last text node for
+        # appending to it, which may have been freed.
+        c_ctxt.nodemem = 0
+        return 0
+
+    cdef int _cacheTags(self, xmlDoc* c_doc) except -1:
+        self._matcher.cacheParserTags(c_doc)
+        for steps, _ in self._paths:
+            for _, matcher in <tuple>steps:
+                (<_MultiTagMatcher>matcher).cacheParserTags(c_doc)
+        self._c_doc = c_doc
+        return 0
+
+    cdef _extract(self, xmlNode* c_node):
+        cdef tuple steps
+        cdef xmlNode* c_target
+        values = []
+        for steps, attribute in self._paths:
+            c_target = _findRecordPath(steps, 0, c_node)
+            if c_target is NULL:
+                value = None
+            elif attribute is not None:
+                value = _getNodeAttributeValue(c_target, attribute, None)
+            else:
+                value = _collectText(c_target.children) or ''
+            values.append(value)
+        if self._keys is None:
+            return tuple(values)
+        return dict(zip(self._keys, values))
+
+
+cdef xmlNode* _findRecordPath(tuple steps, Py_ssize_t i, xmlNode* c_node) noexcept:
+    """Find the first element in document order that matches the path steps
+    from index i on, starting from the children of c_node.
+    """
+    cdef xmlNode* c_child
+    cdef xmlNode* c_result
+    cdef tuple step
+    cdef _MultiTagMatcher matcher
+    cdef bint is_descendant
+    if i == len(steps):
+        return c_node
+    step = <tuple>steps[i]
+    is_descendant = step[0] is True
+    matcher = <_MultiTagMatcher>step[1]
+    c_child = c_node.children
+    while c_child is not NULL:
+        if c_child.type == tree.XML_ELEMENT_NODE:
+            if matcher.matches(c_child):
+                c_result = _findRecordPath(steps, i + 1, c_child)
+                if c_result is not NULL:
+                    return c_result
+            if is_descendant:
+                c_result = _findRecordPath(steps, i, c_child)
+                if c_result is not NULL:
+                    return c_result
+        c_child = c_child.next
+    return NULL
+
+
+cdef _RecordExtraction _newRecordExtraction(tag, extract):
+    """Compile the record tag and the extraction paths.  Only plain child,
+    descendant and wildcard steps are supported, optionally followed by an
+    attribute step.
+    """
+    cdef _RecordExtraction extraction = _RecordExtraction.__new__(_RecordExtraction)
+    if tag is None:
+        raise ValueError, "record extraction requires a 'tag' to select the records"
+    extraction._matcher = _newMultiTagMatcher(tag)
+    if isinstance(extract, dict):
+        extraction._keys = tuple(extract)
+        paths = [extract[key] for key in extraction._keys]
+    elif _isString(extract):
+        raise TypeError, "'extract' must be a dict or a sequence of paths"
+    else:
+        extraction._keys = None
+        paths = list(extract)
+    compiled = []
+    for path in paths:
+        if not _isString(path):
+            raise TypeError, f"extraction paths must be strings, got '{python._fqtypename(path)}'"
+        attribute = None
+        if path.startswith('@'):
+            path, attribute = '.', path[1:]
+        elif '/@' in path:
+            path, attribute = path.rsplit('/@', 1)
+        if attribute is not None and not attribute:
+            raise SyntaxError, f"missing attribute name in extraction path: '{path}/@'"
+        steps = []
+        for selector in _build_path_iterator(path, None):
+            if isinstance(selector, _ChildPathEvaluator):
+                steps.append((False, (<_ChildPathEvaluator>selector)._matcher.copy()))
+            elif isinstance(selector, _DescendantPathEvaluator):
+                steps.append((True, (<_DescendantPathEvaluator>selector)._matcher.copy()))
+            elif isinstance(selector, _StarPathEvaluator):
+                steps.append((False, _newMultiTagMatcher('*')))
+            elif not isinstance(selector, _SelfPathEvaluator):
+                raise SyntaxError, f"unsupported path expression for record extraction: '{path}'"
+        compiled.append((tuple(steps), attribute))
+    extraction._paths = tuple(compiled)
+    return extraction
+
+
+@cython.final
+@cython.internal
+cdef class _ColumnBuffer:
+    """A growable C array of fixed size items that exports its data
+    through the buffer protocol.
+    """
+    cdef char* _data
+    cdef Py_ssize_t _size
+    cdef Py_ssize_t _capacity
+    cdef Py_ssize_t _itemsize
+    cdef char* _format
+    cdef int _exports
+
+    def __dealloc__(self):
+        if self._data is not NULL:
+            python.lxml_free(self._data)
+
+    def __len__(self):
+        return self._size
+
+    def __getbuffer__(self, Py_buffer* buffer, int flags):
+        if flags & python.PyBUF_WRITABLE:
+            raise BufferError, "column data is read-only"
+        self._exports += 1
+        buffer.obj = self
+        buffer.buf = self._data
+        buffer.len = self._size * self._itemsize
+        buffer.itemsize = self._itemsize
+        buffer.readonly = 1
+        buffer.ndim = 1
+        buffer.format = self._format if flags & PyBUF_FORMAT else NULL
+        buffer.shape = &self._size if flags & PyBUF_ND else NULL
+        buffer.strides = &self._itemsize if flags & PyBUF_STRIDES else NULL
+        buffer.suboffsets = NULL
+        buffer.internal = NULL
+
+    def __releasebuffer__(self, Py_buffer* buffer):
+        self._exports -= 1
+
+    cdef int _reserve(self, Py_ssize_t count) except -1:
+        cdef char* c_data
+        cdef Py_ssize_t capacity
+        if self._size + count <= self._capacity:
+            return 0
+        if self._exports:
+            raise BufferError, "cannot resize exported column data"
+        capacity = max(self._capacity * 2, self._size + count, 1024)
+        c_data = <char*> python.lxml_realloc(self._data, capacity, self._itemsize)
+        if c_data is NULL:
+            raise MemoryError()
+        self._data = c_data
+        self._capacity = capacity
+        return 0
+
+    cdef int append(self, long long value) except -1:
+        if self._size == self._capacity:
+            self._reserve(1)
+        if self._itemsize == 1:
+            (<signed char*> self._data)[self._size] = <signed char> value
+        elif self._itemsize == sizeof(int):
+            (<int*> self._data)[self._size] = <int> value
+        else:
+            (<long long*> self._data)[self._size] = value
+        self._size += 1
+        return 0
+
+    cdef int extend(self, const_char* c_bytes, Py_ssize_t length) except -1:
+        # only for byte columns
+        self._reserve(length)
+        cstring_h.memcpy(self._data + self._size, c_bytes, length)
+        self._size += length
+        return 0
+
+    cdef void setLast(self, long long value) noexcept:
+        (<long long*> self._data)[self._size - 1] = value
+
+
+cdef _ColumnBuffer _newColumnBuffer(char* format, Py_ssize_t itemsize, bint offsets):
+    cdef _ColumnBuffer column = _ColumnBuffer.__new__(_ColumnBuffer)
+    column._format = format
+    column._itemsize = itemsize
+    if offsets:
+        column.append(0)
+    return column
+
+
+@cython.final
+@cython.internal
+cdef class _EventColumns:
+    """A batch of parse events in columnar form.
+
+    Each column is a read-only ``memoryview`` of a C array that NumPy,
+    Arrow and others can wrap without copying the data:
+
+    - ``event``: the event type (int8) as index into ``event_names``
+    - ``depth``: the element nesting depth (int32), 0 for the root element
+    - ``tag``: the tag name (int32) as index into ``names``, -1 for text
+    - ``text_offsets``: the start and end offsets (int64) of the text of
+      event ``i`` in the ``text`` buffer, at ``i`` and ``i+1``
+    - ``text``: the UTF-8 encoded text data (uint8)
+    - ``attr_offsets``: the range (int64) of the attributes of event ``i``
+      in the attribute columns, at ``i`` and ``i+1``
+    - ``attr_name``: the attribute name (int32) as index into ``names``
+    - ``attr_value_offsets``: the start and end offsets (int64) of the
+      value of attribute ``j`` in the ``attr_values`` buffer
+    - ``attr_values``: the UTF-8 encoded attribute values (uint8)
+
+    The offset columns follow the Arrow layout of variable-size data, with
+    one more entry than there are events or attributes.
+    """
+    event_names = ('start', 'end', 'text')
+
+    cdef readonly list names
+    cdef _ColumnBuffer _event
+    cdef _ColumnBuffer _depth
+    cdef _ColumnBuffer _tag
+    cdef _ColumnBuffer _text_offsets
+    cdef _ColumnBuffer _text
+    cdef _ColumnBuffer _attr_offsets
+    cdef _ColumnBuffer _attr_name
+    cdef _ColumnBuffer _attr_value_offsets
+    cdef _ColumnBuffer _attr_values
+
+    def __len__(self):
+        return self._event._size
+
+    def __repr__(self):
+        return f"<{python._fqtypename(self).decode('utf8')} with {self._event._size} events>"
+
+    @property
+    def event(self):
+        return memoryview(self._event)
+
+    @property
+    def depth(self):
+        return memoryview(self._depth)
+
+    @property
+    def tag(self):
+        return memoryview(self._tag)
+
+    @property
+    def text_offsets(self):
+        return memoryview(self._text_offsets)
+
+    @property
+    def text(self):
+        return memoryview(self._text)
+
+    @property
+    def attr_offsets(self):
+        return memoryview(self._attr_offsets)
+
+    @property
+    def attr_name(self):
+        return memoryview(self._attr_name)
+
+    @property
+    def attr_value_offsets(self):
+        return memoryview(self._attr_value_offsets)
+
+    @property
+    def attr_values(self):
+        return memoryview(self._attr_values)
+
+
+cdef enum _ColumnEventTypes:
+    COLUMN_EVENT_START = 0
+    COLUMN_EVENT_END = 1
+    COLUMN_EVENT_TEXT = 2
+
+
+@cython.final
+@cython.internal
+cdef class _EventColumnsBuilder:
+    """Collects the start, end and text events of the parser in columns
+    instead of building a tree.
+    """
+    cdef bint _collect_start
+    cdef bint _collect_end
+    cdef bint _collect_text
+    cdef list _names
+    cdef dict _name_ids        # name => index in _names
+    cdef dict _c_name_ids      # (namespace, name) pointers from the parser dict => index
+    cdef int _current_depth
+    cdef _EventColumns _columns
+
+    cdef _EventColumnsBuilder copy(self):
+        cdef _EventColumnsBuilder builder = _EventColumnsBuilder.__new__(_EventColumnsBuilder)
+        builder._collect_start = self._collect_start
+        builder._collect_end = self._collect_end
+        builder._collect_text = self._collect_text
+        builder._names = []
+        builder._name_ids = {}
+        builder._c_name_ids = {}
+        builder._columns = _newEventColumns(builder._names)
+        return builder
+
+    cdef void reset(self) noexcept:
+        # The parser dict may change between documents.
+        self._c_name_ids.clear()
+        self._current_depth = 0
+
+    cdef int _nameId(self, const_xmlChar* c_namespace, const_xmlChar* c_name) except -1:
+        key = (<stdint.uintptr_t> c_namespace, <stdint.uintptr_t> c_name)
+        name_id = self._c_name_ids.get(key)
+        if name_id is None:
+            name = _namespacedNameFromNsName(c_namespace, c_name)
+            name_id = self._name_ids.get(name)
+            if name_id is None:
+                name_id = self._name_ids[name] = len(self._names)
+                self._names.append(name)
+            self._c_name_ids[key] = name_id
+        return name_id
+
+    cdef int _appendEvent(self, _ColumnEventTypes event, int depth, int tag_id) except -1:
+        cdef _EventColumns columns = self._columns
+        columns._event.append(event)
+        columns._depth.append(depth)
+        columns._tag.append(tag_id)
+        columns._text_offsets.append(columns._text._size)
+        columns._attr_offsets.append(columns._attr_name._size)
+        return 0
+
+    cdef int startElement(self, xmlparser.xmlParserCtxt* c_ctxt,
+                          const_xmlChar* c_localname, const_xmlChar* c_namespace,
+                          int c_nb_attributes, int c_nb_defaulted,
+                          const_xmlChar** c_attributes) except -1:
+        cdef _EventColumns columns = self._columns
+        cdef int i
+        self._current_depth += 1
+        if not self._collect_start:
+            return 0
+        if c_nb_defaulted > 0:
+            # only add default attributes if we asked for them
+            if c_ctxt.loadsubset & xmlparser.XML_COMPLETE_ATTRS == 0:
+                c_nb_attributes -= c_nb_defaulted
+        for i in range(c_nb_attributes):
+            columns._attr_name.append(self._nameId(c_attributes[2], c_attributes[0]))
+            if c_attributes[3] is not NULL:
+                columns._attr_values.extend(
+                    <const_char*> c_attributes[3], c_attributes[4] - c_attributes[3])
+            columns._attr_value_offsets.append(columns._attr_values._size)
+            c_attributes += 5
+        self._appendEvent(
+            COLUMN_EVENT_START, self._current_depth - 1, self._nameId(c_namespace, c_localname))
+        return 0
+
+    cdef int endElement(self, const_xmlChar* c_localname, const_xmlChar* c_namespace) except -1:
+        self._current_depth -= 1
+        if self._collect_end:
+            self._appendEvent(
+                COLUMN_EVENT_END, self._current_depth, self._nameId(c_namespace, c_localname))
+        return 0
+
+    cdef int data(self, const_xmlChar* c_data, int data_len) except -1:
+        cdef _EventColumns columns = self._columns
+        if not self._collect_text or not data_len:
+            return 0
+        if self._isPendingText(columns):
+            # merge adjacent text into one event
+            columns._text.extend(<const_char*> c_data, data_len)
+            columns._text_offsets.setLast(columns._text._size)
+        else:
+            columns._text.extend(<const_char*> c_data, data_len)
+            self._appendEvent(COLUMN_EVENT_TEXT, self._current_depth, -1)
+        return 0
+
+    cdef bint _isPendingText(self, _EventColumns columns) noexcept:
+        return (columns._event._size > 0 and
+                (<signed char*> columns._event._data)[columns._event._size - 1] == COLUMN_EVENT_TEXT)
+
+    cdef int flushInto(self, list events, bint final) except -1:
+        """Append the collected events as a new batch to the event list.
+
+        Unless this is the final batch, a trailing text event is kept back
+        since more text may follow in the next chunk of input.
+        """
+        cdef _EventColumns columns = self._columns
+        cdef _EventColumns next_columns = _newEventColumns(self._names)
+        cdef Py_ssize_t text_start
+        if not final and self._isPendingText(columns):
+            text_start = (<long long*> columns._text_offsets._data)[columns._text_offsets._size - 2]
+            next_columns._text.extend(columns._text._data + text_start, columns._text._size - text_start)
+            next_columns._event.append(COLUMN_EVENT_TEXT)
+            next_columns._depth.append((<int*> columns._depth._data)[columns._depth._size - 1])
+            next_columns._tag.append(-1)
+            next_columns._text_offsets.append(next_columns._text._size)
+            next_columns._attr_offsets.append(0)
+            columns._text._size = text_start
+            columns._event._size -= 1
+            columns._depth._size -= 1
+            columns._tag._size -= 1
+            columns._text_offsets._size -= 1
+            columns._attr_offsets._size -= 1
+        self._columns = next_columns
+        if columns._event._size:
+            events.append(columns)
+        return 0
+
+
+cdef _EventColumns _newEventColumns(list names):
+    cdef _EventColumns columns = _EventColumns.__new__(_EventColumns)
+    columns.names = names
+    columns._event = _newColumnBuffer(b'b', sizeof(signed char), False)
+    columns._depth = _newColumnBuffer(b'i', sizeof(int), False)
+    columns._tag = _newColumnBuffer(b'i', sizeof(int), False)
+    columns._text_offsets = _newColumnBuffer(b'q', sizeof(long long), True)
+    columns._text = _newColumnBuffer(b'B', 1, False)
+    columns._attr_offsets = _newColumnBuffer(b'q', sizeof(long long), True)
+    columns._attr_name = _newColumnBuffer(b'i', sizeof(int), False)
+    columns._attr_value_offsets = _newColumnBuffer(b'q', sizeof(long long), True)
+    columns._attr_values = _newColumnBuffer(b'B', 1, False)
+    return columns
+
+
+cdef _EventColumnsBuilder _newEventColumnsBuilder(events):
+    cdef _EventColumnsBuilder builder = _EventColumnsBuilder.__new__(_EventColumnsBuilder)
+    for event in events:
+        if event == 'start':
+            builder._collect_start = True
+        elif event == 'end':
+            builder._collect_end = True
+        elif event == 'text':
+            builder._collect_text = True
+        else:
+            raise ValueError, f"invalid event name for columnar parsing: '{event}'"
+    return builder.copy()
+
 
 cdef list _build_prefix_uri_list(_SaxParserContext context, int c_nb_namespaces,
                                  const_xmlChar** c_namespaces):
@@ -301,6 +1143,7 @@ cdef void _handleSaxStart(
     context = <_SaxParserContext>c_ctxt._private
     cdef int event_filter = context._event_filter
     try:
+        context.countElement(c_nb_attributes, c_nb_defaulted)
         if (c_nb_namespaces and
                 event_filter & (PARSE_EVENT_FILTER_START_NS |
                                 PARSE_EVENT_FILTER_END_NS)):
@@ -323,6 +1166,8 @@ cdef void _handleSaxStart(
             c_localname = tree.xmlDictLookup(c_ctxt.dict, c_localname, -1)
             if c_localname is NULL:
                 raise MemoryError()
+        if context._projection is not None:
+            context._projection.startElement(c_ctxt.node)
 
         if event_filter & PARSE_EVENT_FILTER_END_NS:
             context._ns_stack.append(declared_namespaces)
@@ -351,6 +1196,8 @@ cdef void _handleSaxTargetStart(
     cdef int event_filter = context._event_filter
     cdef int sax_event_filter = context._target._sax_event_filter
     try:
+        context.countElement(c_nb_attributes, c_nb_defaulted)
+        context.flushTargetData()
         if c_nb_namespaces:
             declared_namespaces = _build_prefix_uri_list(
                 context, c_nb_namespaces, c_namespaces)
@@ -414,6 +1261,7 @@ cdef void _handleSaxStartNoNs(void* ctxt, const_xmlChar* c_name,
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
+        context.countElementNoNs(c_attributes)
         context._origSaxStartNoNs(c_ctxt, c_name, c_attributes)
         if c_ctxt.html:
             _fixHtmlDictNodeNames(c_ctxt.dict, c_ctxt.node)
@@ -423,6 +1271,8 @@ cdef void _handleSaxStartNoNs(void* ctxt, const_xmlChar* c_name,
             c_name = tree.xmlDictLookup(c_ctxt.dict, c_name, -1)
             if c_name is NULL:
                 raise MemoryError()
+        if context._projection is not None:
+            context._projection.startElement(c_ctxt.node)
         if context._event_filter & (PARSE_EVENT_FILTER_END |
                                     PARSE_EVENT_FILTER_START):
             _pushSaxStartEvent(context, c_ctxt, NULL, c_name, None)
@@ -439,17 +1289,23 @@ cdef void _handleSaxTargetStartNoNs(void* ctxt, const_xmlChar* c_name,
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
-        if c_attributes is NULL:
-            attrib = IMMUTABLE_EMPTY_MAPPING
+        context.countElementNoNs(c_attributes)
+        context.flushTargetData()
+        if not context._target._sax_event_filter & SAX_EVENT_START:
+            element = None
+        elif c_attributes is NULL:
+            element = _callTargetSaxStart(
+                context, c_ctxt, funicode(c_name),
+                IMMUTABLE_EMPTY_MAPPING, IMMUTABLE_EMPTY_MAPPING)
         else:
             attrib = {}
             while c_attributes[0] is not NULL:
                 name = funicode(c_attributes[0])
                 attrib[name] = funicodeOrEmpty(c_attributes[1])
                 c_attributes += 2
-        element = _callTargetSaxStart(
-            context, c_ctxt, funicode(c_name),
-            attrib, IMMUTABLE_EMPTY_MAPPING)
+            element = _callTargetSaxStart(
+                context, c_ctxt, funicode(c_name),
+                attrib, IMMUTABLE_EMPTY_MAPPING)
         if context._event_filter & (PARSE_EVENT_FILTER_END |
                                     PARSE_EVENT_FILTER_START):
             _pushSaxStartEvent(context, c_ctxt, NULL, c_name, element)
@@ -491,12 +1347,15 @@ cdef int _pushSaxStartEvent(_SaxParserContext context,
 cdef void _handleSaxEnd(void* ctxt, const_xmlChar* c_localname,
                         const_xmlChar* c_prefix,
                         const_xmlChar* c_namespace) noexcept with gil:
+    cdef xmlNode* c_node
     c_ctxt = <xmlparser.xmlParserCtxt*>ctxt
     if c_ctxt._private is NULL or xmlparser.xmlCtxtIsStopped(c_ctxt):
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
+        c_node = c_ctxt.node
         if context._target is not None:
+            context.flushTargetData()
             if context._target._sax_event_filter & SAX_EVENT_END:
                 node = context._target._handleSaxEnd(
                     _namespacedNameFromNsName(c_namespace, c_localname))
@@ -507,6 +1366,15 @@ cdef void _handleSaxEnd(void* ctxt, const_xmlChar* c_localname,
             node = None
         _pushSaxEndEvent(context, c_namespace, c_localname, node)
         _pushSaxNsEndEvents(context)
+        if context._projection is not None:
+            context._projection.endElement(c_ctxt, context._doc, c_node)
+        if context._extraction is not None:
+            context._extraction.endElement(c_ctxt, context, c_node)
+        if (context._split_documents and c_node is not NULL and
+                c_node.parent is not NULL and c_node.parent.type == tree.XML_DOCUMENT_NODE):
+            # Stop after the root element to start a new document with the remaining input.
+            context._document_end = xmlparser.xmlByteConsumed(c_ctxt)
+            xmlparser.xmlStopParser(c_ctxt)
     except:
         context._handleSaxException(c_ctxt)
     finally:
@@ -514,17 +1382,27 @@ cdef void _handleSaxEnd(void* ctxt, const_xmlChar* c_localname,
 
 
 cdef void _handleSaxEndNoNs(void* ctxt, const_xmlChar* c_name) noexcept with gil:
+    cdef xmlNode* c_node
     c_ctxt = <xmlparser.xmlParserCtxt*>ctxt
     if c_ctxt._private is NULL or xmlparser.xmlCtxtIsStopped(c_ctxt):
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
+        c_node = c_ctxt.node
         if context._target is not None:
-            node = context._target._handleSaxEnd(funicode(c_name))
+            context.flushTargetData()
+            if context._target._sax_event_filter & SAX_EVENT_END:
+                node = context._target._handleSaxEnd(funicode(c_name))
+            else:
+                node = None
         else:
             context._origSaxEndNoNs(c_ctxt, c_name)
             node = None
         _pushSaxEndEvent(context, NULL, c_name, node)
+        if context._projection is not None:
+            context._projection.endElement(c_ctxt, context._doc, c_node)
+        if context._extraction is not None:
+            context._extraction.endElement(c_ctxt, context, c_node)
     except:
         context._handleSaxException(c_ctxt)
     finally:
@@ -561,6 +1439,8 @@ cdef int _pushSaxEndEvent(_SaxParserContext context,
                 context._matcher.matchesNsTag(c_href, c_name)):
             if context._target is None:
                 node = context._node_stack.pop()
+                if context.events_iterator._record_ends is not None:
+                    context.events_iterator.recordEnd(context, (<_Element>node)._c_node)
             context.events_iterator._events.append(('end', node))
     return 0
 
@@ -572,8 +1452,55 @@ cdef void _handleSaxData(void* ctxt, const_xmlChar* c_data, int data_len) noexce
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
-        context._target._handleSaxData(
-            c_data[:data_len].decode('utf8'))
+        context._target_data.append(c_data[:data_len])
+    except:
+        context._handleSaxException(c_ctxt)
+    finally:
+        return  # swallow any further exceptions
+
+
+cdef void _handleColumnsStart(
+        void* ctxt, const_xmlChar* c_localname, const_xmlChar* c_prefix,
+        const_xmlChar* c_namespace, int c_nb_namespaces,
+        const_xmlChar** c_namespaces,
+        int c_nb_attributes, int c_nb_defaulted,
+        const_xmlChar** c_attributes) noexcept with gil:
+    c_ctxt = <xmlparser.xmlParserCtxt*>ctxt
+    if c_ctxt._private is NULL or xmlparser.xmlCtxtIsStopped(c_ctxt):
+        return
+    context = <_SaxParserContext>c_ctxt._private
+    try:
+        context.countElement(c_nb_attributes, c_nb_defaulted)
+        context._columns.startElement(
+            c_ctxt, c_localname, c_namespace, c_nb_attributes, c_nb_defaulted, c_attributes)
+    except:
+        context._handleSaxException(c_ctxt)
+    finally:
+        return  # swallow any further exceptions
+
+
+cdef void _handleColumnsEnd(void* ctxt, const_xmlChar* c_localname,
+                            const_xmlChar* c_prefix,
+                            const_xmlChar* c_namespace) noexcept with gil:
+    c_ctxt = <xmlparser.xmlParserCtxt*>ctxt
+    if c_ctxt._private is NULL or xmlparser.xmlCtxtIsStopped(c_ctxt):
+        return
+    context = <_SaxParserContext>c_ctxt._private
+    try:
+        context._columns.endElement(c_localname, c_namespace)
+    except:
+        context._handleSaxException(c_ctxt)
+    finally:
+        return  # swallow any further exceptions
+
+
+cdef void _handleColumnsData(void* ctxt, const_xmlChar* c_data, int data_len) noexcept with gil:
+    c_ctxt = <xmlparser.xmlParserCtxt*>ctxt
+    if c_ctxt._private is NULL or xmlparser.xmlCtxtIsStopped(c_ctxt):
+        return
+    context = <_SaxParserContext>c_ctxt._private
+    try:
+        context._columns.data(c_data, data_len)
     except:
         context._handleSaxException(c_ctxt)
     finally:
@@ -622,6 +1549,7 @@ cdef void _handleSaxTargetPI(void* ctxt, const_xmlChar* c_target,
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
+        context.flushTargetData()
         pi = context._target._handleSaxPi(
             funicodeOrNone(c_target),
             funicodeOrEmpty(c_data))
@@ -659,6 +1587,7 @@ cdef void _handleSaxTargetComment(void* ctxt, const_xmlChar* c_data) noexcept wi
         return
     context = <_SaxParserContext>c_ctxt._private
     try:
+        context.flushTargetData()
         comment = context._target._handleSaxComment(funicodeOrEmpty(c_data))
         if context._event_filter & PARSE_EVENT_FILTER_COMMENT:
             context.events_iterator._events.append(('comment', comment))
@@ -1,5 +1,9 @@
 # XML serialization and output functions
 
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_WRITABLE
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_Resize
+from libc.stdlib cimport qsort
+
 cdef object GzipFile
 from gzip import GzipFile
 
@@ -15,6 +19,20 @@ cdef enum _OutputMethods:
     OUTPUT_METHOD_TEXT
 
 
+# cached output of subtrees, see SerializationCache
+ctypedef struct _SplicedSubtree:
+    xmlNode* c_node
+    const char* c_data
+    Py_ssize_t c_len
+
+ctypedef struct _SpliceTable:
+    # both arrays are sorted by node address
+    _SplicedSubtree* subtrees
+    Py_ssize_t subtree_count
+    xmlNode** path
+    Py_ssize_t path_count
+
+
 cdef int _findOutputMethod(method) except -1:
     if method is None:
         return OUTPUT_METHOD_XML
@@ -88,10 +106,6 @@ cdef _tostring(_Element element, encoding, doctype, method,
     """
     cdef tree.xmlOutputBuffer* c_buffer
     cdef tree.xmlBuf* c_result_buffer
-    cdef tree.xmlCharEncodingHandler* enchandler
-    cdef const_char* c_enc
-    cdef const_xmlChar* c_version
-    cdef const_xmlChar* c_doctype
     cdef int c_method
     cdef int error_result
     if element is None:
@@ -105,6 +119,81 @@ cdef _tostring(_Element element, encoding, doctype, method,
             return _textToString(element._c_node, encoding, with_tail)
         finally:
             doc.unlock_read()
+    c_buffer = _serialiseToOutputBuffer(
+        element, encoding, doctype, c_method, write_xml_declaration,
+        write_complete_document, pretty_print, with_tail, standalone)
+    c_result_buffer = _outputBufferResult(c_buffer)
+    try:
+        if encoding is unicode:
+            result = (<unsigned char*>tree.xmlBufContent(
+                c_result_buffer))[:tree.xmlBufUse(c_result_buffer)].decode('UTF-8')
+        else:
+            result = <bytes>(<unsigned char*>tree.xmlBufContent(
+                c_result_buffer))[:tree.xmlBufUse(c_result_buffer)]
+    finally:
+        error_result = tree.xmlOutputBufferClose(c_buffer)
+    if error_result == -1:
+        _raiseSerialisationError(error_result)
+    return result
+
+
+cdef Py_ssize_t _tostringInto(_Element element, target, Py_ssize_t offset,
+                              encoding, doctype, method,
+                              bint write_xml_declaration,
+                              bint write_complete_document,
+                              bint pretty_print, bint with_tail,
+                              int standalone) except -1:
+    """Serialize an element into a writable buffer, starting at 'offset'.
+
+    Copies the serialised bytes straight out of the libxml2 output buffer,
+    without creating an intermediate bytes object.  Returns the number of
+    bytes written.
+    """
+    cdef tree.xmlOutputBuffer* c_buffer
+    cdef tree.xmlBuf* c_result_buffer
+    cdef int c_method
+    cdef int error_result
+    cdef Py_ssize_t c_len
+    _assertValidNode(element)
+    c_method = _findOutputMethod(method)
+    if c_method == OUTPUT_METHOD_TEXT:
+        doc = element._doc
+        doc.lock_read()
+        try:
+            text = _textToString(element._c_node, encoding, with_tail)
+        finally:
+            doc.unlock_read()
+        return _copyIntoBuffer(
+            target, offset, <const unsigned char*><const_char*>text, len(text))
+    c_buffer = _serialiseToOutputBuffer(
+        element, encoding, doctype, c_method, write_xml_declaration,
+        write_complete_document, pretty_print, with_tail, standalone)
+    c_result_buffer = _outputBufferResult(c_buffer)
+    try:
+        c_len = _copyIntoBuffer(
+            target, offset, tree.xmlBufContent(c_result_buffer),
+            tree.xmlBufUse(c_result_buffer))
+    finally:
+        error_result = tree.xmlOutputBufferClose(c_buffer)
+    if error_result == -1:
+        _raiseSerialisationError(error_result)
+    return c_len
+
+
+cdef tree.xmlOutputBuffer* _serialiseToOutputBuffer(
+        _Element element, encoding, doctype, int c_method,
+        bint write_xml_declaration, bint write_complete_document,
+        bint pretty_print, bint with_tail, int standalone) except NULL:
+    """Serialize an element into a new memory output buffer.
+
+    The caller owns the returned buffer and must close it with
+    xmlOutputBufferClose().
+    """
+    cdef tree.xmlOutputBuffer* c_buffer
+    cdef tree.xmlCharEncodingHandler* enchandler
+    cdef const_char* c_enc
+    cdef const_xmlChar* c_doctype
+    cdef int error_result
     if encoding is None or encoding is unicode:
         c_enc = NULL
     else:
@@ -129,34 +218,65 @@ cdef _tostring(_Element element, encoding, doctype, method,
 
     doc = element._doc
     doc.lock_read()
+    try:
+        splices = _prepareSplices(element, c_enc, c_method, pretty_print)
+    except:
+        doc.unlock_read()
+        tree.xmlOutputBufferClose(c_buffer)
+        raise
     with nogil:
         _writeNodeToBuffer(c_buffer, element._c_node, c_enc, c_doctype, c_method,
                         write_xml_declaration, write_complete_document,
-                        pretty_print, with_tail, standalone)
+                        pretty_print, with_tail, standalone,
+                        &splices._c_splices if splices is not None else NULL)
         tree.xmlOutputBufferFlush(c_buffer)
-        if c_buffer.conv is not NULL:
-            c_result_buffer = c_buffer.conv
-        else:
-            c_result_buffer = c_buffer.buffer
     doc.unlock_read()
 
     error_result = c_buffer.error
     if error_result != xmlerror.XML_ERR_OK:
         tree.xmlOutputBufferClose(c_buffer)
         _raiseSerialisationError(error_result)
+    return c_buffer
+
+
+cdef inline tree.xmlBuf* _outputBufferResult(tree.xmlOutputBuffer* c_buffer) noexcept:
+    if c_buffer.conv is not NULL:
+        return c_buffer.conv
+    return c_buffer.buffer
+
 
+cdef Py_ssize_t _copyIntoBuffer(target, Py_ssize_t offset,
+                                const unsigned char* c_data,
+                                Py_ssize_t c_len) except -1:
+    """Copy serialised data into a writable buffer at the given offset.
+
+    bytearrays are grown in place as needed, other buffers must be large
+    enough to hold the data.
+    """
+    cdef Py_buffer view
+    if offset < 0:
+        raise ValueError, f"offset must not be negative, got {offset}"
+    if isinstance(target, bytearray):
+        if offset > len(target):
+            raise ValueError, (
+                f"offset {offset} is beyond the end of the buffer ({len(target)} bytes)")
+        if offset + c_len > len(target):
+            PyByteArray_Resize(target, offset + c_len)
+        if c_len:
+            cstring_h.memcpy(PyByteArray_AS_STRING(target) + offset, c_data, c_len)
+        return c_len
+
+    PyObject_GetBuffer(target, &view, PyBUF_SIMPLE | PyBUF_WRITABLE)
     try:
-        if encoding is unicode:
-            result = (<unsigned char*>tree.xmlBufContent(
-                c_result_buffer))[:tree.xmlBufUse(c_result_buffer)].decode('UTF-8')
-        else:
-            result = <bytes>(<unsigned char*>tree.xmlBufContent(
-                c_result_buffer))[:tree.xmlBufUse(c_result_buffer)]
+        if offset > view.len or c_len > view.len - offset:
+            raise ValueError, (
+                f"buffer too small: {c_len} bytes needed at offset {offset}, "
+                f"but only {max(view.len - offset, 0)} available")
+        if c_len:
+            cstring_h.memcpy(<char*>view.buf + offset, c_data, c_len)
     finally:
-        error_result = tree.xmlOutputBufferClose(c_buffer)
-    if error_result == -1:
-        _raiseSerialisationError(error_result)
-    return result
+        PyBuffer_Release(&view)
+    return c_len
 
 
 cdef bytes _tostringC14N(element_or_tree, bint exclusive, bint with_comments, inclusive_ns_prefixes):
@@ -235,9 +355,44 @@ cdef void _writeNodeToBuffer(tree.xmlOutputBuffer* c_buffer,
                              int c_method, bint write_xml_declaration,
                              bint write_complete_document,
                              bint pretty_print, bint with_tail,
-                             int standalone) noexcept nogil:
+                             int standalone,
+                             const _SpliceTable* c_splices=NULL) noexcept nogil:
     cdef xmlNode* c_nsdecl_node
     cdef xmlDoc* c_doc = c_node.doc
+    _writeNodeProlog(c_buffer, c_node, encoding, c_doctype, c_method,
+                     write_xml_declaration, write_complete_document,
+                     pretty_print, standalone)
+
+    c_nsdecl_node = _createNsDeclNode(c_node)
+    if c_nsdecl_node is NULL:
+        c_buffer.error = xmlerror.XML_ERR_NO_MEMORY
+        return
+
+    # write node
+    if c_method == OUTPUT_METHOD_HTML:
+        tree.htmlNodeDumpFormatOutput(
+            c_buffer, c_doc, c_nsdecl_node, encoding, pretty_print)
+    elif c_splices is not NULL:
+        _writeSplicedNode(c_buffer, c_node, c_nsdecl_node, encoding, c_splices)
+    else:
+        tree.xmlNodeDumpOutput(
+            c_buffer, c_doc, c_nsdecl_node, 0, pretty_print, encoding)
+
+    _freeNsDeclNode(c_node, c_nsdecl_node)
+
+    if c_buffer.error:
+        return
+
+    _writeNodeEpilog(c_buffer, c_node, encoding, c_method,
+                     write_complete_document, pretty_print, with_tail)
+
+
+cdef void _writeNodeProlog(tree.xmlOutputBuffer* c_buffer,
+                           xmlNode* c_node, const_char* encoding, const_xmlChar* c_doctype,
+                           int c_method, bint write_xml_declaration,
+                           bint write_complete_document,
+                           bint pretty_print, int standalone) noexcept nogil:
+    cdef xmlDoc* c_doc = c_node.doc
     if write_xml_declaration and c_method == OUTPUT_METHOD_XML:
         _writeDeclarationToBuffer(c_buffer, c_doc.version, encoding, standalone)
 
@@ -253,44 +408,46 @@ cdef void _writeNodeToBuffer(tree.xmlOutputBuffer* c_buffer,
             _writeDtdToBuffer(c_buffer, c_doc, c_node.name, c_method, encoding)
         _writePrevSiblings(c_buffer, c_node, encoding, pretty_print)
 
-    c_nsdecl_node = c_node
+
+cdef void _writeNodeEpilog(tree.xmlOutputBuffer* c_buffer,
+                           xmlNode* c_node, const_char* encoding, int c_method,
+                           bint write_complete_document,
+                           bint pretty_print, bint with_tail) noexcept nogil:
+    # write tail, trailing comments, etc.
+    if with_tail:
+        _writeTail(c_buffer, c_node, encoding, c_method, pretty_print)
+    if write_complete_document:
+        _writeNextSiblings(c_buffer, c_node, encoding, pretty_print)
+    if pretty_print:
+        tree.xmlOutputBufferWrite(c_buffer, 1, "\n")
+
+
+cdef xmlNode* _createNsDeclNode(xmlNode* c_node) noexcept nogil:
+    """Returns the node itself if it is the root node, or a shallow copy
+    that also declares the namespaces of its parents.  Free the result with
+    _freeNsDeclNode().  Returns NULL on memory errors.
+    """
+    cdef xmlNode* c_nsdecl_node = c_node
     if not c_node.parent or c_node.parent.type != tree.XML_DOCUMENT_NODE:
         # copy the node and add namespaces from parents
         # this is required to make libxml write them
         c_nsdecl_node = tree.xmlCopyNode(c_node, 2)
         if not c_nsdecl_node:
-            c_buffer.error = xmlerror.XML_ERR_NO_MEMORY
-            return
+            return NULL
         _copyParentNamespaces(c_node, c_nsdecl_node)
 
         c_nsdecl_node.parent = c_node.parent
         c_nsdecl_node.children = c_node.children
         c_nsdecl_node.last = c_node.last
+    return c_nsdecl_node
 
-    # write node
-    if c_method == OUTPUT_METHOD_HTML:
-        tree.htmlNodeDumpFormatOutput(
-            c_buffer, c_doc, c_nsdecl_node, encoding, pretty_print)
-    else:
-        tree.xmlNodeDumpOutput(
-            c_buffer, c_doc, c_nsdecl_node, 0, pretty_print, encoding)
 
+cdef void _freeNsDeclNode(xmlNode* c_node, xmlNode* c_nsdecl_node) noexcept nogil:
     if c_nsdecl_node is not c_node:
         # clean up
         c_nsdecl_node.children = c_nsdecl_node.last = NULL
         tree.xmlFreeNode(c_nsdecl_node)
 
-    if c_buffer.error:
-        return
-
-    # write tail, trailing comments, etc.
-    if with_tail:
-        _writeTail(c_buffer, c_node, encoding, c_method, pretty_print)
-    if write_complete_document:
-        _writeNextSiblings(c_buffer, c_node, encoding, pretty_print)
-    if pretty_print:
-        tree.xmlOutputBufferWrite(c_buffer, 1, "\n")
-
 
 cdef void _writeDeclarationToBuffer(tree.xmlOutputBuffer* c_buffer,
                                     const_xmlChar* version, const_char* encoding,
@@ -429,6 +586,150 @@ cdef void _writeNextSiblings(tree.xmlOutputBuffer* c_buffer, xmlNode* c_node,
         c_sibling = c_sibling.next
 
 
+cdef const _SplicedSubtree* _findSplicedSubtree(const _SpliceTable* c_splices,
+                                                xmlNode* c_node) noexcept nogil:
+    cdef Py_ssize_t low = 0, high = c_splices.subtree_count - 1, middle
+    while low <= high:
+        middle = (low + high) // 2
+        if c_splices.subtrees[middle].c_node is c_node:
+            return &c_splices.subtrees[middle]
+        elif <size_t>c_splices.subtrees[middle].c_node < <size_t>c_node:
+            low = middle + 1
+        else:
+            high = middle - 1
+    return NULL
+
+
+cdef bint _isOnSplicePath(const _SpliceTable* c_splices, xmlNode* c_node) noexcept nogil:
+    cdef Py_ssize_t low = 0, high = c_splices.path_count - 1, middle
+    while low <= high:
+        middle = (low + high) // 2
+        if c_splices.path[middle] is c_node:
+            return True
+        elif <size_t>c_splices.path[middle] < <size_t>c_node:
+            low = middle + 1
+        else:
+            high = middle - 1
+    return False
+
+
+cdef void _writeSplicedNode(tree.xmlOutputBuffer* c_buffer, xmlNode* c_top,
+                            xmlNode* c_start_node, const_char* encoding,
+                            const _SpliceTable* c_splices) noexcept nogil:
+    """Write an element like xmlNodeDumpOutput() does, but copy the cached
+    output of the subtrees in the splice table instead of serialising them.
+
+    Only the elements on the path to the cached subtrees are written here,
+    all other nodes are left to libxml2.  The start tag of the top element
+    is taken from 'c_start_node', which may be a copy with the inherited
+    namespace declarations.
+    """
+    cdef xmlNode* c_parent = c_top
+    cdef xmlNode* c_node
+    cdef const _SplicedSubtree* c_subtree
+    cdef tree.xmlBuffer* c_tmp = tree.xmlBufferCreate()
+    if c_tmp is NULL:
+        c_buffer.error = xmlerror.XML_ERR_NO_MEMORY
+        return
+    _writeStartTag(c_buffer, c_start_node, c_tmp)
+    c_node = c_top.children
+    while not c_buffer.error:
+        if c_node is NULL:
+            # all children written, close the parent
+            _writeEndTag(c_buffer, c_start_node if c_parent is c_top else c_parent)
+            if c_parent is c_top:
+                break
+            c_node = c_parent.next
+            c_parent = c_parent.parent
+            continue
+        if c_node.type == tree.XML_ELEMENT_NODE:
+            c_subtree = _findSplicedSubtree(c_splices, c_node)
+            if c_subtree is not NULL:
+                _writeSplicedData(c_buffer, c_subtree.c_data, c_subtree.c_len)
+                c_node = c_node.next
+                continue
+            if _isOnSplicePath(c_splices, c_node):
+                _writeStartTag(c_buffer, c_node, c_tmp)
+                c_parent = c_node
+                c_node = c_node.children
+                continue
+        tree.xmlNodeDumpOutput(c_buffer, c_top.doc, c_node, 0, 0, encoding)
+        c_node = c_node.next
+    tree.xmlBufferFree(c_tmp)
+
+
+cdef void _writeSplicedData(tree.xmlOutputBuffer* c_buffer,
+                            const char* c_data, Py_ssize_t c_len) noexcept nogil:
+    while c_len > limits.INT_MAX:
+        tree.xmlOutputBufferWrite(c_buffer, limits.INT_MAX, c_data)
+        c_data += limits.INT_MAX
+        c_len -= limits.INT_MAX
+    tree.xmlOutputBufferWrite(c_buffer, <int>c_len, c_data)
+
+
+cdef inline void _writeQualifiedName(tree.xmlOutputBuffer* c_buffer, xmlNs* c_ns,
+                                     const_xmlChar* c_name) noexcept nogil:
+    if c_ns is not NULL and c_ns.prefix is not NULL:
+        tree.xmlOutputBufferWriteString(c_buffer, <const_char*>c_ns.prefix)
+        tree.xmlOutputBufferWrite(c_buffer, 1, ":")
+    tree.xmlOutputBufferWriteString(c_buffer, <const_char*>c_name)
+
+
+cdef inline void _writeTempBuffer(tree.xmlOutputBuffer* c_buffer,
+                                  tree.xmlBuffer* c_tmp) noexcept nogil:
+    tree.xmlOutputBufferWrite(c_buffer, tree.xmlBufferLength(c_tmp),
+                              <const_char*>tree.xmlBufferContent(c_tmp))
+    tree.xmlBufferEmpty(c_tmp)
+
+
+cdef void _writeStartTag(tree.xmlOutputBuffer* c_buffer, xmlNode* c_node,
+                         tree.xmlBuffer* c_tmp) noexcept nogil:
+    # Mirrors the output of non-empty elements in libxml2's xmlsave.c.
+    cdef xmlNs* c_ns
+    cdef xmlAttr* c_attr
+    cdef xmlNode* c_child
+    tree.xmlOutputBufferWrite(c_buffer, 1, "<")
+    _writeQualifiedName(c_buffer, c_node.ns, c_node.name)
+    c_ns = c_node.nsDef
+    while c_ns is not NULL:
+        # lxml's xmlStrEqual() does not accept NULL
+        if c_ns.href is not NULL and (
+                c_ns.prefix is NULL or not tree.xmlStrEqual(c_ns.prefix, <const_xmlChar*>"xml")):
+            if c_ns.prefix is NULL:
+                tree.xmlOutputBufferWrite(c_buffer, 7, " xmlns=")
+            else:
+                tree.xmlOutputBufferWrite(c_buffer, 7, " xmlns:")
+                tree.xmlOutputBufferWriteString(c_buffer, <const_char*>c_ns.prefix)
+                tree.xmlOutputBufferWrite(c_buffer, 1, "=")
+            tree.xmlBufferWriteQuotedString(c_tmp, c_ns.href)
+            _writeTempBuffer(c_buffer, c_tmp)
+        c_ns = c_ns.next
+    c_attr = c_node.properties
+    while c_attr is not NULL:
+        tree.xmlOutputBufferWrite(c_buffer, 1, " ")
+        _writeQualifiedName(c_buffer, c_attr.ns, c_attr.name)
+        tree.xmlOutputBufferWrite(c_buffer, 2, '="')
+        c_child = c_attr.children
+        while c_child is not NULL:
+            if c_child.type == tree.XML_TEXT_NODE:
+                tree.xmlAttrSerializeTxtContent(c_tmp, c_attr.doc, c_attr, c_child.content)
+                _writeTempBuffer(c_buffer, c_tmp)
+            elif c_child.type == tree.XML_ENTITY_REF_NODE:
+                tree.xmlOutputBufferWrite(c_buffer, 1, "&")
+                tree.xmlOutputBufferWriteString(c_buffer, <const_char*>c_child.name)
+                tree.xmlOutputBufferWrite(c_buffer, 1, ";")
+            c_child = c_child.next
+        tree.xmlOutputBufferWrite(c_buffer, 1, '"')
+        c_attr = c_attr.next
+    tree.xmlOutputBufferWrite(c_buffer, 1, ">")
+
+
+cdef void _writeEndTag(tree.xmlOutputBuffer* c_buffer, xmlNode* c_node) noexcept nogil:
+    tree.xmlOutputBufferWrite(c_buffer, 2, "</")
+    _writeQualifiedName(c_buffer, c_node.ns, c_node.name)
+    tree.xmlOutputBufferWrite(c_buffer, 1, ">")
+
+
 # copied and adapted from libxml2 (xmlBufAttrSerializeTxtContent())
 cdef _write_attr_string(tree.xmlOutputBuffer* buf, const char *string):
     cdef const char *base
@@ -708,6 +1009,7 @@ cdef _tofilelike(f, _Element element, encoding, doctype, method,
     cdef tree.xmlCharEncodingHandler* enchandler
     cdef const_char* c_enc
     cdef const_xmlChar* c_doctype
+    cdef const _SpliceTable* c_splices
     cdef int error_result
 
     c_method = _findOutputMethod(method)
@@ -747,15 +1049,23 @@ cdef _tofilelike(f, _Element element, encoding, doctype, method,
     doc = element._doc
     doc.lock_read()
     try:
+        try:
+            splices = _prepareSplices(element, c_enc, c_method, pretty_print)
+        except:
+            tree.xmlOutputBufferClose(c_buffer)
+            raise
+        c_splices = &splices._c_splices if splices is not None else NULL
         if writer is None:
             with nogil:
                 error_result = _serialise_node(
                     c_buffer, c_doctype, c_enc, element._c_node, c_method,
-                    write_xml_declaration, write_doctype, pretty_print, with_tail, standalone)
+                    write_xml_declaration, write_doctype, pretty_print, with_tail, standalone,
+                    c_splices)
         else:
             error_result = _serialise_node(
                 c_buffer, c_doctype, c_enc, element._c_node, c_method,
-                write_xml_declaration, write_doctype, pretty_print, with_tail, standalone)
+                write_xml_declaration, write_doctype, pretty_print, with_tail, standalone,
+                c_splices)
     finally:
         doc.unlock_read()
 
@@ -768,10 +1078,12 @@ cdef _tofilelike(f, _Element element, encoding, doctype, method,
 cdef int _serialise_node(tree.xmlOutputBuffer* c_buffer, const_xmlChar* c_doctype,
                          const_char* c_enc, xmlNode* c_node, int c_method,
                          bint write_xml_declaration, bint write_doctype, bint pretty_print,
-                         bint with_tail, int standalone) noexcept nogil:
+                         bint with_tail, int standalone,
+                         const _SpliceTable* c_splices) noexcept nogil:
     _writeNodeToBuffer(
         c_buffer, c_node, c_enc, c_doctype, c_method,
-        write_xml_declaration, write_doctype, pretty_print, with_tail, standalone)
+        write_xml_declaration, write_doctype, pretty_print, with_tail, standalone,
+        c_splices)
     error_result = c_buffer.error
     if error_result == xmlerror.XML_ERR_OK:
         error_result = tree.xmlOutputBufferClose(c_buffer)
@@ -942,55 +1254,45 @@ def canonicalize(xml_data=None, *, out=None, from_file=None, **options):
     if xml_data is None and from_file is None:
         raise ValueError("Either 'xml_data' or 'from_file' must be provided as input")
 
-    sio = None
-    if out is None:
-        sio = out = StringIO()
-
-    target = C14NWriterTarget(out.write, **options)
+    cdef _C14N2Writer writer = _C14N2Writer(
+        out.write if out is not None else None, **options)
 
     if xml_data is not None and not isinstance(xml_data, basestring):
-        _tree_to_target(xml_data, target)
-        return sio.getvalue() if sio is not None else None
+        writer._writeTree(xml_data)
+        return writer._getResult().decode('utf8') if out is None else None
+
+    cdef _FeedParser parser
+    if xml_data is None:
+        # Serialise the file while parsing it and discard the processed
+        # parts of the tree, instead of building the whole tree first.
+        from_file = _getFSPathOrObject(from_file)
+        close_source = not hasattr(from_file, 'read')
+        source = open(from_file, 'rb') if close_source else from_file
+        try:
+            parser = XMLPullParser(
+                ('start', 'end', 'comment', 'pi'),
+                base_url=from_file if close_source else _getFilenameForFile(source),
+                attribute_defaults=True,
+                collect_ids=False,
+                remove_comments=not writer._with_comments,
+            )
+            writer._writeParseEvents(parser, source)
+        finally:
+            if close_source:
+                source.close()
+        return writer._getResult().decode('utf8') if out is None else None
 
-    cdef _FeedParser parser = XMLParser(
-        target=target,
+    # Let libxml2 build the tree instead of passing each parser event
+    # through Python code.
+    parser = XMLParser(
         attribute_defaults=True,
         collect_ids=False,
     )
+    parser.feed(xml_data)
+    root = parser.close()
 
-    if xml_data is not None:
-        parser.feed(xml_data)
-        parser.close()
-    elif from_file is not None:
-        try:
-            _parseDocument(from_file, parser, base_url=None)
-        except _TargetParserResult:
-            pass
-
-    return sio.getvalue() if sio is not None else None
-
-
-cdef _tree_to_target(element, target):
-    for event, elem in iterwalk(element, events=('start', 'end', 'start-ns', 'comment', 'pi')):
-        text = None
-        if event == 'start':
-            target.start(elem.tag, elem.attrib)
-            text = elem.text
-        elif event == 'end':
-            target.end(elem.tag)
-            text = elem.tail
-        elif event == 'start-ns':
-            target.start_ns(*elem)
-            continue
-        elif event == 'comment':
-            target.comment(elem.text)
-            text = elem.tail
-        elif event == 'pi':
-            target.pi(elem.target, elem.text)
-            text = elem.tail
-        if text:
-            target.data(text)
-    return target.close()
+    writer._writeTree(_elementTreeFactory((<_Element>root)._doc, None))
+    return writer._getResult().decode('utf8') if out is None else None
 
 
 cdef object _looks_like_prefix_name = re.compile(r'^\w+:\w+$', re.UNICODE).match
@@ -1140,7 +1442,7 @@ cdef class C14NWriterTarget:
         if self._ignored_depth:
             return
         # we may have to resolve qnames in text content
-        if self._data:
+        if self._data or self._pending_start is not None:
             self._flush()
         self._ns_stack[-1].append((uri, prefix))
 
@@ -1149,7 +1451,7 @@ cdef class C14NWriterTarget:
                 self._ignored_depth or tag in self._exclude_tags):
             self._ignored_depth += 1
             return
-        if self._data:
+        if self._data or self._pending_start is not None:
             self._flush()
 
         new_namespaces = []
@@ -1232,14 +1534,19 @@ cdef class C14NWriterTarget:
     def end(self, tag):
         if self._ignored_depth:
             self._ignored_depth -= 1
+            if not self._ignored_depth:
+                # forget the namespaces declared by the excluded element
+                del self._ns_stack[-1][:]
             return
-        if self._data:
+        if self._data or self._pending_start is not None:
             self._flush()
         self._write(f'</{self._qname(tag)[0]}>')
         self._preserve_space.pop()
         self._root_done = len(self._preserve_space) == 1
         self._declared_ns_stack.pop()
         self._ns_stack.pop()
+        # also forget the namespaces that the element declared
+        del self._ns_stack[-1][:]
 
     def comment(self, text):
         if not self._with_comments:
@@ -1248,7 +1555,7 @@ cdef class C14NWriterTarget:
             return
         if self._root_done:
             self._write('\n')
-        elif self._root_seen and self._data:
+        elif self._pending_start is not None or self._root_seen and self._data:
             self._flush()
         self._write(f'<!--{_escape_cdata_c14n(text)}-->')
         if not self._root_seen:
@@ -1259,7 +1566,7 @@ cdef class C14NWriterTarget:
             return
         if self._root_done:
             self._write('\n')
-        elif self._root_seen and self._data:
+        elif self._pending_start is not None or self._root_seen and self._data:
             self._flush()
         self._write(
             f'<?{target} {_escape_cdata_c14n(data)}?>' if data else f'<?{target}?>')
@@ -1352,6 +1659,1499 @@ cdef unicode _escape_attrib_c14n(stext):
     return ''.join(substrings)
 
 
+# native C14N 2.0 serialisation of trees
+
+ctypedef struct _C14NNamespace:
+    const_xmlChar* href     # interned, "" for no namespace
+    const_xmlChar* prefix   # interned, "" for the default namespace
+
+ctypedef struct _C14NName:
+    const_xmlChar* href     # interned
+    const_xmlChar* name
+    const_xmlChar** prefix  # where to store the prefix assigned to the name
+
+ctypedef struct _C14NAttribute:
+    const_xmlChar* href     # interned
+    const_xmlChar* name
+    const_xmlChar* prefix
+    const_xmlChar* value
+    xmlChar* c_value_copy   # value that needs freeing, if any
+    const_xmlChar* qname_href    # resolved QName value, if any
+    const_xmlChar* qname_name
+    const_xmlChar* qname_prefix
+
+ctypedef struct _C14NElement:
+    const_xmlChar* prefix
+    const_xmlChar* name
+    bint preserve_space
+
+ctypedef struct _C14NBuffer:
+    char* data
+    size_t length
+    size_t size
+
+
+cdef int _c14nReserve(void** c_array, size_t* c_size, size_t needed,
+                      size_t item_size) except -1:
+    cdef void* c_new
+    cdef size_t size
+    if needed <= c_size[0]:
+        return 0
+    size = max(needed, c_size[0] * 2, 16)
+    c_new = python.lxml_realloc(c_array[0], size, item_size)
+    if c_new is NULL:
+        raise MemoryError()
+    c_array[0] = c_new
+    c_size[0] = size
+    return 0
+
+
+cdef inline int _c14nAppend(_C14NBuffer* c_buffer, const char* c_data,
+                            size_t c_len) except -1:
+    if c_buffer.length + c_len > c_buffer.size:
+        _c14nReserve(<void**>&c_buffer.data, &c_buffer.size,
+                     c_buffer.length + c_len, 1)
+    cstring_h.memcpy(c_buffer.data + c_buffer.length, c_data, c_len)
+    c_buffer.length += c_len
+    return 0
+
+
+cdef int _compareC14NNames(const void* a, const void* b) noexcept nogil:
+    # same order as sorting Python names by "name.split('}', 1)"
+    cdef const _C14NName* name1 = <const _C14NName*>a
+    cdef const _C14NName* name2 = <const _C14NName*>b
+    cdef int result
+    if name1.href[0] and name2.href[0]:
+        result = cstring_h.strcmp(<const_char*>name1.href, <const_char*>name2.href)
+        if result:
+            return result
+    elif name1.href[0]:
+        return c'{' - name2.name[0]
+    elif name2.href[0]:
+        return name1.name[0] - c'{'
+    return cstring_h.strcmp(<const_char*>name1.name, <const_char*>name2.name)
+
+
+cdef int _compareC14NNamespaces(const void* a, const void* b) noexcept nogil:
+    # same order as sorting the ("xmlns:prefix", href) declarations
+    cdef const _C14NNamespace* ns1 = <const _C14NNamespace*>a
+    cdef const _C14NNamespace* ns2 = <const _C14NNamespace*>b
+    cdef int result = cstring_h.strcmp(<const_char*>ns1.prefix, <const_char*>ns2.prefix)
+    if result:
+        return result
+    return cstring_h.strcmp(<const_char*>ns1.href, <const_char*>ns2.href)
+
+
+cdef int _compareC14NAttributes(const void* a, const void* b) noexcept nogil:
+    # same order as sorting Python names in "{href}name" notation
+    cdef const _C14NAttribute* attr1 = <const _C14NAttribute*>a
+    cdef const _C14NAttribute* attr2 = <const _C14NAttribute*>b
+    cdef const_xmlChar* c_href1 = attr1.href
+    cdef const_xmlChar* c_href2 = attr2.href
+    if c_href1[0] and c_href2[0]:
+        while c_href1[0] and c_href1[0] == c_href2[0]:
+            c_href1 += 1
+            c_href2 += 1
+        if c_href1[0] or c_href2[0]:
+            return ((c_href1[0] if c_href1[0] else c'}') -
+                    (c_href2[0] if c_href2[0] else c'}'))
+    elif c_href1[0]:
+        return c'{' - attr2.name[0]
+    elif c_href2[0]:
+        return attr1.name[0] - c'{'
+    return cstring_h.strcmp(<const_char*>attr1.name, <const_char*>attr2.name)
+
+
+@cython.final
+@cython.internal
+cdef class _C14N2Writer:
+    """Serialises trees to C14N 2.0 at the C level.
+
+    Follows the event handling of the C14NWriterTarget, but walks the
+    libxml2 tree directly and writes UTF-8 encoded output into a buffer.
+    """
+    cdef object _write
+    cdef tree.xmlDict* _c_dict
+    cdef _C14NBuffer _out
+    cdef _C14NBuffer _data
+    cdef xmlNode* _pending_start
+    cdef list _qname_aware_tags
+    cdef list _qname_aware_attrs
+    cdef list _exclude_tags
+    cdef list _exclude_attrs
+    cdef dict _prefix_map
+    cdef const_xmlChar* _c_empty
+    cdef const_xmlChar* _c_xml_href
+    cdef xmlNs* _c_last_ns
+    cdef const_xmlChar* _c_last_href
+
+    # user declared namespaces in scope, in groups per element
+    cdef _C14NNamespace* _namespaces
+    cdef size_t _namespaces_count, _namespaces_size
+    cdef size_t* _namespace_groups
+    cdef size_t _namespace_groups_count, _namespace_groups_size
+    # namespaces declared in the output, in groups per element
+    cdef _C14NNamespace* _declared
+    cdef size_t _declared_count, _declared_size
+    cdef size_t* _declared_groups
+    cdef size_t _declared_groups_count, _declared_groups_size
+
+    cdef _C14NElement* _elements
+    cdef size_t _elements_count, _elements_size
+    cdef _C14NAttribute* _attributes
+    cdef size_t _attributes_size
+    cdef _C14NName* _names
+    cdef size_t _names_size
+    cdef _C14NNamespace* _new_namespaces
+    cdef size_t _new_namespaces_size
+
+    cdef Py_ssize_t _ignored_depth
+    cdef bint _with_comments
+    cdef bint _strip_text
+    cdef bint _rewrite_prefixes
+    cdef bint _root_seen
+    cdef bint _root_done
+
+    def __cinit__(self):
+        self._c_dict = tree.xmlDictCreate()
+        if self._c_dict is NULL:
+            raise MemoryError()
+
+    def __init__(self, write=None, *,
+                 with_comments=False, strip_text=False, rewrite_prefixes=False,
+                 qname_aware_tags=None, qname_aware_attrs=None,
+                 exclude_attrs=None, exclude_tags=None):
+        self._write = write
+        self._with_comments = with_comments
+        self._strip_text = strip_text
+        self._rewrite_prefixes = rewrite_prefixes
+        self._qname_aware_tags = self._internNames(qname_aware_tags)
+        self._qname_aware_attrs = self._internNames(qname_aware_attrs)
+        self._exclude_tags = self._internNames(exclude_tags)
+        self._exclude_attrs = self._internNames(exclude_attrs)
+        self._prefix_map = {}
+        self._c_empty = self._intern(<const_xmlChar*>b"")
+        self._c_xml_href = self._intern(<const_xmlChar*>b"http://www.w3.org/XML/1998/namespace")
+
+        self._declared_groups_count = 0
+        self._pushGroup(&self._declared_groups, &self._declared_groups_count,
+                        &self._declared_groups_size, 0)
+        self._addNamespace(&self._declared, &self._declared_count, &self._declared_size,
+                           self._c_xml_href, self._intern(<const_xmlChar*>b"xml"))
+        if not rewrite_prefixes:
+            self._pushGroup(&self._namespace_groups, &self._namespace_groups_count,
+                            &self._namespace_groups_size, 0)
+            for href, prefix in _DEFAULT_NAMESPACE_PREFIXES.items():
+                self._addNamespace(&self._namespaces, &self._namespaces_count,
+                                   &self._namespaces_size,
+                                   self._intern(_xcstr(href)), self._intern(_xcstr(prefix)))
+        self._pushGroup(&self._namespace_groups, &self._namespace_groups_count,
+                        &self._namespace_groups_size, self._namespaces_count)
+
+    def __dealloc__(self):
+        python.lxml_free(self._out.data)
+        python.lxml_free(self._data.data)
+        python.lxml_free(self._namespaces)
+        python.lxml_free(self._namespace_groups)
+        python.lxml_free(self._declared)
+        python.lxml_free(self._declared_groups)
+        python.lxml_free(self._elements)
+        python.lxml_free(self._attributes)
+        python.lxml_free(self._names)
+        python.lxml_free(self._new_namespaces)
+        if self._c_dict is not NULL:
+            tree.xmlDictFree(self._c_dict)
+
+    cdef list _internNames(self, names):
+        # Keep (href, name) pairs of the names in "{href}name" notation.
+        cdef list result = []
+        if not names:
+            return None
+        for name in names:
+            href, name = _getNsTagWithEmptyNs(name)
+            if href is None:
+                href = b''
+            elif not href:
+                # "{}name" never matches a name
+                continue
+            result.append((<size_t>self._intern(_xcstr(href)), name))
+        return result
+
+    cdef const_xmlChar* _intern(self, const_xmlChar* c_text) except NULL:
+        c_text = tree.xmlDictLookup(self._c_dict, c_text, -1)
+        if c_text is NULL:
+            raise MemoryError()
+        return c_text
+
+    cdef const_xmlChar* _internHref(self, xmlNs* c_ns) except NULL:
+        if c_ns is NULL or c_ns.href is NULL:
+            return self._c_empty
+        if c_ns is not self._c_last_ns:
+            self._c_last_href = self._intern(c_ns.href)
+            self._c_last_ns = c_ns
+        return self._c_last_href
+
+    cdef bint _isInNames(self, list names, const_xmlChar* c_href, const_xmlChar* c_name):
+        for href, name in names:
+            if <size_t>c_href == <size_t>href and cstring_h.strcmp(
+                    <const_char*>c_name, _cstr(<bytes>name)) == 0:
+                return True
+        return False
+
+    cdef int _pushGroup(self, size_t** c_groups, size_t* c_count, size_t* c_size,
+                        size_t start) except -1:
+        _c14nReserve(<void**>c_groups, c_size, c_count[0] + 1, sizeof(size_t))
+        c_groups[0][c_count[0]] = start
+        c_count[0] += 1
+        return 0
+
+    cdef int _addNamespace(self, _C14NNamespace** c_namespaces, size_t* c_count,
+                           size_t* c_size, const_xmlChar* c_href,
+                           const_xmlChar* c_prefix) except -1:
+        _c14nReserve(<void**>c_namespaces, c_size, c_count[0] + 1, sizeof(_C14NNamespace))
+        c_namespaces[0][c_count[0]].href = c_href
+        c_namespaces[0][c_count[0]].prefix = c_prefix
+        c_count[0] += 1
+        return 0
+
+    # output
+
+    cdef inline int _writeBytes(self, const_char* c_data, size_t c_len) except -1:
+        return _c14nAppend(&self._out, c_data, c_len)
+
+    cdef inline int _writeString(self, const_xmlChar* c_text) except -1:
+        return _c14nAppend(&self._out, <const_char*>c_text,
+                           cstring_h.strlen(<const_char*>c_text))
+
+    cdef int _writeQName(self, const_xmlChar* c_prefix, const_xmlChar* c_name) except -1:
+        if c_prefix[0]:
+            self._writeString(c_prefix)
+            self._writeBytes(":", 1)
+        return self._writeString(c_name)
+
+    cdef int _writeEscaped(self, const_xmlChar* c_text, size_t c_len,
+                           bint attribute) except -1:
+        cdef size_t i, start = 0
+        cdef const_char* c_escape
+        for i in range(c_len):
+            ch = c_text[i]
+            if ch == c'&':
+                c_escape = "&amp;"
+            elif ch == c'<':
+                c_escape = "&lt;"
+            elif ch == c'>' and not attribute:
+                c_escape = "&gt;"
+            elif ch == c'"' and attribute:
+                c_escape = "&quot;"
+            elif ch == c'\t' and attribute:
+                c_escape = "&#x9;"
+            elif ch == c'\n' and attribute:
+                c_escape = "&#xA;"
+            elif ch == c'\r':
+                c_escape = "&#xD;"
+            else:
+                continue
+            if i > start:
+                self._writeBytes(<const_char*>c_text + start, i - start)
+            self._writeBytes(c_escape, cstring_h.strlen(c_escape))
+            start = i + 1
+        if c_len > start:
+            self._writeBytes(<const_char*>c_text + start, c_len - start)
+        return 0
+
+    cdef int _flushOutput(self, bint force) except -1:
+        if self._write is None or not self._out.length:
+            return 0
+        if force or self._out.length >= 64 * 1024:
+            text = self._out.data[:self._out.length].decode('utf8')
+            self._out.length = 0
+            self._write(text)
+        return 0
+
+    cdef bytes _getResult(self):
+        return self._out.data[:self._out.length]
+
+    # namespace handling
+
+    cdef const_xmlChar* _qnamePrefix(self, const_xmlChar* c_href,
+                                     const_xmlChar* c_name) except NULL:
+        cdef _C14NNamespace* c_ns
+        cdef size_t group, i, j, start, end
+        cdef bint prefix_seen, default_seen = False
+
+        # Look up the declared namespaces, innermost first.
+        end = self._declared_count
+        group = self._declared_groups_count
+        while group:
+            group -= 1
+            start = self._declared_groups[group]
+            for i in range(start, end):
+                c_ns = &self._declared[i]
+                if c_ns.href is c_href:
+                    # Must not be shadowed by an inner declaration of the prefix.
+                    prefix_seen = False
+                    for j in range(start, i):
+                        if self._declared[j].prefix is c_ns.prefix:
+                            prefix_seen = True
+                            break
+                    if not prefix_seen:
+                        for j in range(end, self._declared_count):
+                            if self._declared[j].prefix is c_ns.prefix:
+                                prefix_seen = True
+                                break
+                    if not prefix_seen:
+                        return c_ns.prefix
+                if not c_ns.prefix[0]:
+                    default_seen = True
+            end = start
+
+        # Not declared yet => add new declaration.
+        if self._rewrite_prefixes:
+            href = <bytes>c_href
+            prefix = self._prefix_map.get(href)
+            if prefix is None:
+                prefix = self._prefix_map[href] = f'n{len(self._prefix_map)}'.encode('ascii')
+            c_prefix = self._intern(_xcstr(prefix))
+            self._addNamespace(&self._declared, &self._declared_count, &self._declared_size,
+                               c_href, c_prefix)
+            return c_prefix
+
+        if not c_href[0] and not default_seen:
+            # No default namespace declared => no prefix needed.
+            return self._c_empty
+
+        end = self._namespaces_count
+        group = self._namespace_groups_count
+        while group:
+            group -= 1
+            start = self._namespace_groups[group]
+            for i in range(start, end):
+                c_ns = &self._namespaces[i]
+                if c_ns.href is c_href:
+                    self._addNamespace(&self._declared, &self._declared_count,
+                                       &self._declared_size, c_href, c_ns.prefix)
+                    return c_ns.prefix
+            end = start
+
+        if not c_href[0]:
+            # As soon as a default namespace is defined,
+            # anything that has no namespace (and thus, no prefix) goes there.
+            return self._c_empty
+
+        raise ValueError(
+            f'Namespace "{funicode(c_href)}" of name "{funicode(c_name)}" is not declared in scope')
+
+    cdef int _resolvePrefixName(self, prefixed_name, const_xmlChar** c_href,
+                                const_xmlChar** c_name) except -1:
+        cdef _C14NNamespace* c_ns
+        cdef size_t group, i, start, end
+        prefix, name = prefixed_name.split(':', 1)
+        c_prefix = self._intern(_xcstr(_utf8(prefix)))
+        end = self._namespaces_count
+        group = self._namespace_groups_count
+        while group:
+            group -= 1
+            start = self._namespace_groups[group]
+            for i in range(start, end):
+                c_ns = &self._namespaces[i]
+                if c_ns.prefix is c_prefix:
+                    c_href[0] = c_ns.href
+                    c_name[0] = self._intern(_xcstr(_utf8(name)))
+                    return 0
+            end = start
+        raise ValueError(f'Prefix {prefix} of QName "{prefixed_name}" is not declared in scope')
+
+    # events
+
+    cdef int _startNs(self, const_xmlChar* c_prefix, const_xmlChar* c_href) except -1:
+        if self._ignored_depth:
+            return 0
+        # we may have to resolve qnames in text content
+        if self._data.length or self._pending_start is not NULL:
+            self._flush()
+        self._addNamespace(&self._namespaces, &self._namespaces_count,
+                           &self._namespaces_size,
+                           self._intern(c_href),
+                           self._intern(c_prefix if c_prefix is not NULL else <const_xmlChar*>b""))
+        return 0
+
+    cdef int _start(self, xmlNode* c_node) except -1:
+        cdef const_xmlChar* c_href
+        if self._exclude_tags is not None and (
+                self._ignored_depth or
+                self._isInNames(self._exclude_tags, self._internHref(c_node.ns), c_node.name)):
+            self._ignored_depth += 1
+            return 0
+        if self._data.length or self._pending_start is not NULL:
+            self._flush()
+
+        self._pushGroup(&self._declared_groups, &self._declared_groups_count,
+                        &self._declared_groups_size, self._declared_count)
+
+        if self._qname_aware_tags is not None and self._isInNames(
+                self._qname_aware_tags, self._internHref(c_node.ns), c_node.name):
+            # Need to parse text first to see if it requires a prefix declaration.
+            self._pending_start = c_node
+            return 0
+        return self._startElement(c_node, None)
+
+    cdef int _startElement(self, xmlNode* c_node, qname_text) except -1:
+        cdef _C14NAttribute* c_attr
+        cdef _C14NName* c_name
+        cdef _C14NNamespace* c_ns
+        cdef xmlAttr* c_attribute
+        cdef const_xmlChar* c_tag_prefix = NULL
+        cdef const_xmlChar* c_text_href = NULL
+        cdef const_xmlChar* c_text_name = NULL
+        cdef const_xmlChar* c_text_prefix = NULL
+        cdef const_xmlChar* c_href
+        cdef size_t attr_count = 0, name_count = 0, ns_count, i
+        cdef bint preserve_space
+
+        c_attribute = c_node.properties
+        while c_attribute is not NULL:
+            if c_attribute.type == tree.XML_ATTRIBUTE_NODE:
+                attr_count += 1
+            c_attribute = c_attribute.next
+        _c14nReserve(<void**>&self._attributes, &self._attributes_size,
+                     attr_count, sizeof(_C14NAttribute))
+        _c14nReserve(<void**>&self._names, &self._names_size,
+                     2 * attr_count + 2, sizeof(_C14NName))
+
+        attr_count = 0
+        try:
+            c_attribute = c_node.properties
+            while c_attribute is not NULL:
+                if c_attribute.type != tree.XML_ATTRIBUTE_NODE:
+                    c_attribute = c_attribute.next
+                    continue
+                c_href = self._internHref(c_attribute.ns)
+                if self._exclude_attrs is not None and self._isInNames(
+                        self._exclude_attrs, c_href, c_attribute.name):
+                    c_attribute = c_attribute.next
+                    continue
+                c_attr = &self._attributes[attr_count]
+                attr_count += 1
+                c_attr.href = c_href
+                c_attr.name = c_attribute.name
+                c_attr.qname_href = NULL
+                c_attr.c_value_copy = NULL
+                if c_attribute.children is NULL:
+                    c_attr.value = <const_xmlChar*>b""
+                elif (c_attribute.children.next is NULL and
+                        c_attribute.children.type == tree.XML_TEXT_NODE):
+                    c_attr.value = c_attribute.children.content
+                else:
+                    c_attr.c_value_copy = tree.xmlNodeGetContent(<xmlNode*>c_attribute)
+                    if c_attr.c_value_copy is NULL:
+                        raise MemoryError()
+                    c_attr.value = c_attr.c_value_copy
+
+                c_name = &self._names[name_count]
+                name_count += 1
+                c_name.href = c_href
+                c_name.name = c_attr.name
+                c_name.prefix = &c_attr.prefix
+
+                # Resolve prefixes in attribute and tag text.
+                if self._qname_aware_attrs is not None and self._isInNames(
+                        self._qname_aware_attrs, c_href, c_attr.name):
+                    value = funicode(c_attr.value)
+                    if _looks_like_prefix_name(value):
+                        self._resolvePrefixName(value, &c_attr.qname_href, &c_attr.qname_name)
+                        c_name = &self._names[name_count]
+                        name_count += 1
+                        c_name.href = c_attr.qname_href
+                        c_name.name = c_attr.qname_name
+                        c_name.prefix = &c_attr.qname_prefix
+                c_attribute = c_attribute.next
+
+            c_name = &self._names[name_count]
+            name_count += 1
+            c_name.href = self._internHref(c_node.ns)
+            c_name.name = c_node.name
+            c_name.prefix = &c_tag_prefix
+            if qname_text is not None:
+                self._resolvePrefixName(qname_text, &c_text_href, &c_text_name)
+                c_name = &self._names[name_count]
+                name_count += 1
+                c_name.href = c_text_href
+                c_name.name = c_text_name
+                c_name.prefix = &c_text_prefix
+
+            # Assign prefixes in lexicographical order of used URIs.
+            qsort(self._names, name_count, sizeof(_C14NName), _compareC14NNames)
+            for i in range(name_count):
+                c_name = &self._names[i]
+                c_name.prefix[0] = self._qnamePrefix(c_name.href, c_name.name)
+
+            # Honour xml:space attributes.
+            preserve_space = (
+                self._elements[self._elements_count - 1].preserve_space
+                if self._elements_count else False)
+            for i in range(attr_count):
+                c_attr = &self._attributes[i]
+                if c_attr.href is self._c_xml_href and c_attr.value[0] and \
+                        cstring_h.strcmp(<const_char*>c_attr.name, "space") == 0:
+                    preserve_space = cstring_h.strcmp(<const_char*>c_attr.value, "preserve") == 0
+
+            # Write the tag.
+            self._writeBytes("<", 1)
+            self._writeQName(c_tag_prefix, c_node.name)
+
+            # Write namespace declarations in prefix order ...
+            ns_count = self._declared_count - self._declared_groups[self._declared_groups_count - 1]
+            if ns_count:
+                _c14nReserve(<void**>&self._new_namespaces, &self._new_namespaces_size,
+                             ns_count, sizeof(_C14NNamespace))
+                cstring_h.memcpy(self._new_namespaces,
+                                 &self._declared[self._declared_count - ns_count],
+                                 ns_count * sizeof(_C14NNamespace))
+                qsort(self._new_namespaces, ns_count, sizeof(_C14NNamespace),
+                      _compareC14NNamespaces)
+            for i in range(ns_count):
+                c_ns = &self._new_namespaces[i]
+                if c_ns.prefix[0]:
+                    self._writeBytes(" xmlns:", 7)
+                    self._writeString(c_ns.prefix)
+                    self._writeBytes('="', 2)
+                else:
+                    self._writeBytes(' xmlns="', 8)
+                self._writeEscaped(c_ns.href, cstring_h.strlen(<const_char*>c_ns.href), True)
+                self._writeBytes('"', 1)
+
+            # ... followed by attributes in URI+name order
+            if attr_count > 1:
+                qsort(self._attributes, attr_count, sizeof(_C14NAttribute),
+                      _compareC14NAttributes)
+            for i in range(attr_count):
+                c_attr = &self._attributes[i]
+                self._writeBytes(" ", 1)
+                if c_attr.href[0]:
+                    self._writeQName(c_attr.prefix, c_attr.name)
+                else:
+                    # No prefix for attributes in default ('') namespace.
+                    self._writeString(c_attr.name)
+                self._writeBytes('="', 2)
+                if c_attr.qname_href is not NULL:
+                    value = (<bytes>c_attr.qname_prefix + b':' + <bytes>c_attr.qname_name
+                             if c_attr.qname_prefix[0] else <bytes>c_attr.qname_name)
+                    self._writeEscaped(_xcstr(value), len(value), True)
+                else:
+                    self._writeEscaped(
+                        c_attr.value, cstring_h.strlen(<const_char*>c_attr.value), True)
+                self._writeBytes('"', 1)
+            self._writeBytes(">", 1)
+        finally:
+            for i in range(attr_count):
+                if self._attributes[i].c_value_copy is not NULL:
+                    tree.xmlFree(self._attributes[i].c_value_copy)
+
+        # Write the resolved qname text content.
+        if qname_text is not None:
+            if c_text_prefix[0]:
+                self._writeString(c_text_prefix)
+                self._writeBytes(":", 1)
+            self._writeEscaped(c_text_name, cstring_h.strlen(<const_char*>c_text_name), False)
+
+        _c14nReserve(<void**>&self._elements, &self._elements_size,
+                     self._elements_count + 1, sizeof(_C14NElement))
+        self._elements[self._elements_count].prefix = c_tag_prefix
+        self._elements[self._elements_count].name = c_node.name
+        self._elements[self._elements_count].preserve_space = preserve_space
+        self._elements_count += 1
+        self._root_seen = True
+        self._pushGroup(&self._namespace_groups, &self._namespace_groups_count,
+                        &self._namespace_groups_size, self._namespaces_count)
+        return 0
+
+    cdef int _end(self) except -1:
+        cdef _C14NElement* c_element
+        if self._ignored_depth:
+            self._ignored_depth -= 1
+            if not self._ignored_depth:
+                # forget the namespaces declared by the excluded element
+                self._namespaces_count = self._namespace_groups[self._namespace_groups_count - 1]
+            return 0
+        if self._data.length or self._pending_start is not NULL:
+            self._flush()
+        self._elements_count -= 1
+        c_element = &self._elements[self._elements_count]
+        self._writeBytes("</", 2)
+        self._writeQName(c_element.prefix, c_element.name)
+        self._writeBytes(">", 1)
+        self._root_done = self._elements_count == 0
+        self._declared_groups_count -= 1
+        self._declared_count = self._declared_groups[self._declared_groups_count]
+        self._namespace_groups_count -= 1
+        # also forget the namespaces that the element declared
+        self._namespaces_count = self._namespace_groups[self._namespace_groups_count - 1]
+        return 0
+
+    cdef int _addData(self, const_xmlChar* c_text) except -1:
+        if not self._ignored_depth and c_text is not NULL:
+            _c14nAppend(&self._data, <const_char*>c_text,
+                        cstring_h.strlen(<const_char*>c_text))
+        return 0
+
+    cdef int _flush(self) except -1:
+        cdef xmlNode* c_node
+        cdef const_char* c_data = self._data.data
+        cdef size_t c_len = self._data.length
+        self._data.length = 0
+        data = None
+        if self._strip_text and not (
+                self._elements_count and
+                self._elements[self._elements_count - 1].preserve_space):
+            while c_len and c_data[0] in b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f':
+                c_data += 1
+                c_len -= 1
+            while c_len and c_data[c_len - 1] in b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f':
+                c_len -= 1
+            if c_len and (<unsigned char>c_data[0] >= 0x80 or
+                          <unsigned char>c_data[c_len - 1] >= 0x80):
+                # strip non-ASCII whitespace just like str.strip()
+                data = c_data[:c_len].decode('utf8').strip().encode('utf8')
+                c_data = _cstr(data)
+                c_len = len(data)
+        if self._pending_start is not NULL:
+            c_node, self._pending_start = self._pending_start, NULL
+            qname_text = None
+            if c_len and cstring_h.memchr(c_data, c':', c_len) is not NULL:
+                text = c_data[:c_len].decode('utf8')
+                if _looks_like_prefix_name(text):
+                    qname_text = text
+            self._startElement(c_node, qname_text)
+            if qname_text is not None:
+                return 0
+        if c_len and self._root_seen:
+            self._writeEscaped(<const_xmlChar*>c_data, c_len, False)
+        return 0
+
+    cdef int _comment(self, xmlNode* c_node) except -1:
+        if not self._with_comments:
+            return 0
+        if self._ignored_depth:
+            return 0
+        if self._root_done:
+            self._writeBytes("\n", 1)
+        elif self._pending_start is not NULL or self._root_seen and self._data.length:
+            self._flush()
+        self._writeBytes("<!--", 4)
+        if c_node.content is not NULL:
+            self._writeEscaped(
+                c_node.content, cstring_h.strlen(<const_char*>c_node.content), False)
+        self._writeBytes("-->", 3)
+        if not self._root_seen:
+            self._writeBytes("\n", 1)
+        return 0
+
+    cdef int _pi(self, xmlNode* c_node) except -1:
+        if self._ignored_depth:
+            return 0
+        if self._root_done:
+            self._writeBytes("\n", 1)
+        elif self._pending_start is not NULL or self._root_seen and self._data.length:
+            self._flush()
+        self._writeBytes("<?", 2)
+        self._writeString(c_node.name)
+        if c_node.content is not NULL and c_node.content[0]:
+            self._writeBytes(" ", 1)
+            self._writeEscaped(
+                c_node.content, cstring_h.strlen(<const_char*>c_node.content), False)
+        self._writeBytes("?>", 2)
+        if not self._root_seen:
+            self._writeBytes("\n", 1)
+        return 0
+
+    # tree traversal
+
+    cdef int _writeTree(self, element_or_tree) except -1:
+        if isinstance(element_or_tree, _ElementTree):
+            (<_ElementTree>element_or_tree)._assertHasRoot()
+            self._writeNode((<_ElementTree>element_or_tree)._context_node, True)
+        elif isinstance(element_or_tree, _Element):
+            self._writeNode(<_Element>element_or_tree, False)
+        else:
+            raise TypeError, f"Type '{python._fqtypename(element_or_tree)}' cannot be serialized."
+        self._flushOutput(True)
+        return 0
+
+    cdef int _writeNode(self, _Element element, bint with_siblings) except -1:
+        cdef xmlNode* c_top = element._c_node
+        cdef xmlNode* c_node
+        _assertValidNode(element)
+        doc = element._doc
+        doc.lock_read()
+        try:
+            if with_siblings:
+                # add the comments and PIs before the root element
+                c_node = c_top
+                while c_node.prev is not NULL:
+                    c_node = c_node.prev
+                while c_node is not c_top:
+                    self._writeSibling(c_node)
+                    c_node = c_node.next
+            self._startInheritedNamespaces(c_top)
+            self._writeSubtree(c_top)
+            if with_siblings:
+                c_node = c_top.next
+                while c_node is not NULL:
+                    self._writeSibling(c_node)
+                    c_node = c_node.next
+        finally:
+            doc.unlock_read()
+        return 0
+
+    cdef int _writeSibling(self, xmlNode* c_node) except -1:
+        if c_node.type == tree.XML_COMMENT_NODE:
+            self._comment(c_node)
+        elif c_node.type == tree.XML_PI_NODE:
+            self._pi(c_node)
+        return 0
+
+    cdef int _startInheritedNamespaces(self, xmlNode* c_top) except -1:
+        # Make the namespaces declared by the ancestors of a subtree
+        # available, the innermost declaration of a prefix wins.
+        cdef xmlNode* c_parent = c_top.parent
+        cdef xmlNs* c_ns
+        cdef const_xmlChar* c_prefix
+        cdef size_t i, start = self._namespaces_count
+        cdef bint shadowed
+        while c_parent is not NULL and c_parent.type == tree.XML_ELEMENT_NODE:
+            c_ns = c_parent.nsDef
+            while c_ns is not NULL:
+                if c_ns.href is not NULL:
+                    c_prefix = self._intern(
+                        c_ns.prefix if c_ns.prefix is not NULL else <const_xmlChar*>b"")
+                    shadowed = False
+                    for i in range(start, self._namespaces_count):
+                        if self._namespaces[i].prefix is c_prefix:
+                            shadowed = True
+                            break
+                    if not shadowed:
+                        self._addNamespace(&self._namespaces, &self._namespaces_count,
+                                           &self._namespaces_size,
+                                           self._intern(c_ns.href), c_prefix)
+                c_ns = c_ns.next
+            c_parent = c_parent.parent
+        if self._namespaces_count > start:
+            # the subtree's own declarations take precedence
+            self._pushGroup(&self._namespace_groups, &self._namespace_groups_count,
+                            &self._namespace_groups_size, self._namespaces_count)
+        return 0
+
+    cdef int _writeSubtree(self, xmlNode* c_top) except -1:
+        cdef xmlNode* c_node = c_top
+        cdef xmlNode* c_child
+        if self._enterElement(c_node):
+            return self._end()
+        c_child = c_node.children
+        while True:
+            if c_child is NULL:
+                self._end()
+                if c_node is c_top:
+                    break
+                c_child = c_node.next
+                c_node = c_node.parent
+                continue
+            if c_child.type == tree.XML_ELEMENT_NODE:
+                if self._enterElement(c_child):
+                    # excluded, no need to look at the content
+                    self._end()
+                else:
+                    c_node = c_child
+                    c_child = c_node.children
+                    continue
+            elif c_child.type == tree.XML_TEXT_NODE or c_child.type == tree.XML_CDATA_SECTION_NODE:
+                self._addData(c_child.content)
+            elif c_child.type == tree.XML_COMMENT_NODE:
+                self._comment(c_child)
+            elif c_child.type == tree.XML_PI_NODE:
+                self._pi(c_child)
+            elif c_child.type == tree.XML_ENTITY_REF_NODE:
+                raise C14NError(
+                    f"Cannot canonicalize unresolved entity reference '&{funicode(c_child.name)};'")
+            c_child = c_child.next
+            if self._out.length >= 64 * 1024:
+                self._flushOutput(False)
+        return 0
+
+    cdef int _enterElement(self, xmlNode* c_node) except -1:
+        """Starts an element, returns 1 if it is excluded from the output.
+        """
+        cdef xmlNs* c_ns = c_node.nsDef
+        while c_ns is not NULL:
+            if c_ns.href is not NULL:
+                self._startNs(c_ns.prefix, c_ns.href)
+            c_ns = c_ns.next
+        self._start(c_node)
+        return self._ignored_depth > 0
+
+    # serialisation during parsing
+
+    cdef int _writeParseEvents(self, _FeedParser parser, source) except -1:
+        """Feeds the data from the file-like 'source' into the pull parser
+        and serialises the tree that it builds, based on its 'start', 'end',
+        'comment' and 'pi' events.  Discards the content of each element
+        from the tree after its 'end' event.
+        """
+        data = source.read(64 * 1024)
+        while data:
+            parser.feed(data)
+            self._writeEvents(parser)
+            data = source.read(64 * 1024)
+        parser.close()
+        self._writeEvents(parser)
+        self._flushOutput(True)
+        return 0
+
+    cdef int _writeEvents(self, _FeedParser parser) except -1:
+        cdef xmlNode* c_node
+        cdef xmlparser.xmlParserCtxt* c_ctxt = parser._getPushParserContext()._c_ctxt
+        for event, element in parser.read_events():
+            c_node = (<_Element>element)._c_node
+            if event == 'start':
+                self._addTextBefore(c_node.prev)
+                self._enterElement(c_node)
+            elif event == 'end':
+                self._addTextBefore(c_node.last)
+                self._end()
+                _discardSerialisedNodes((<_Element>element)._doc, c_node, c_ctxt)
+            elif event == 'comment':
+                self._addTextBefore(c_node.prev)
+                self._comment(c_node)
+            else:
+                self._addTextBefore(c_node.prev)
+                self._pi(c_node)
+            if self._out.length >= 64 * 1024:
+                self._flushOutput(False)
+        return 0
+
+    cdef int _addTextBefore(self, xmlNode* c_last) except -1:
+        # Adds the text nodes up to 'c_last' that follow the last
+        # non-text sibling, which was already handled by its own event.
+        cdef xmlNode* c_node = c_last
+        cdef xmlNode* c_first = NULL
+        while c_node is not NULL and (
+                c_node.type == tree.XML_TEXT_NODE or
+                c_node.type == tree.XML_CDATA_SECTION_NODE or
+                c_node.type == tree.XML_ENTITY_REF_NODE):
+            c_first = c_node
+            c_node = c_node.prev
+        c_node = c_first
+        while c_node is not NULL:
+            if c_node.type == tree.XML_ENTITY_REF_NODE:
+                raise C14NError(
+                    f"Cannot canonicalize unresolved entity reference '&{funicode(c_node.name)};'")
+            self._addData(c_node.content)
+            if c_node is c_last:
+                break
+            c_node = c_node.next
+        return 0
+
+
+cdef int _discardSerialisedNodes(_Document doc, xmlNode* c_node,
+                                 xmlparser.xmlParserCtxt* c_ctxt) except -1:
+    """Discard the content of an element from the tree that is being parsed,
+    together with all nodes that precede it in document order, except for
+    its ancestors.  The element itself is kept, so that its tail text stays.
+    """
+    cdef xmlNode* c_parent
+    while c_node.children is not NULL:
+        _removeNode(doc, c_node.children)
+    c_parent = c_node.parent
+    while c_parent is not NULL and _isElement(c_parent):
+        while c_parent.children is not c_node:
+            _removeNode(doc, c_parent.children)
+        c_node = c_parent
+        c_parent = c_node.parent
+    # The SAX2 tree builder tracks the buffer of the last text node for
+    # appending to it.  Make it use a safe (re-)allocation on append.
+    c_ctxt.nodemem = 0
+    return 0
+
+
+############################################################
+# parallel serialisation of independent elements
+
+# Number of elements that a worker thread serialises per task.  Small
+# records take only a few microseconds to serialise, so dispatching them
+# one by one would spend more time in the thread pool than in libxml2.
+cdef Py_ssize_t _TOSTRING_MANY_BATCH_SIZE = 16
+
+def _tostringBatch(serialise, list elements):
+    # Returns the results up to the first failure, and the exception.
+    results = []
+    try:
+        for element in elements:
+            results.append(serialise(element))
+    except Exception as exc:
+        return results, exc
+    return results, None
+
+cdef _tostringMany(elements, serialise, int workers, output, separator):
+    """Serialise the elements on a pool of worker threads.
+
+    The libxml2 serialisation in each thread only holds the read lock of
+    the element's document and runs without the GIL.  Returns the list of
+    results in input order, or writes them to the file-like 'output',
+    separated by 'separator'.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    cdef list results = [] if output is None else None
+    cdef list batch
+    cdef bint first = True
+    cdef Py_ssize_t max_pending = 2 * workers
+    elements = iter(elements)
+    pending = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="lxml-tostring_many")
+    try:
+        while True:
+            batch = list(islice(elements, _TOSTRING_MANY_BATCH_SIZE))
+            if batch:
+                pending.append(executor.submit(_tostringBatch, serialise, batch))
+                if len(pending) < max_pending:
+                    continue
+            elif not pending:
+                break
+            batch, error = pending.popleft().result()
+            if results is not None:
+                results.extend(batch)
+            else:
+                for data in batch:
+                    if first:
+                        first = False
+                    elif separator:
+                        output.write(separator)
+                    output.write(data)
+            if error is not None:
+                raise error
+    except:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return results
+
+
+############################################################
+# caching the serialised output of subtrees
+
+@cython.final
+cdef class SerializationCache:
+    """SerializationCache(self, element_or_tree)
+
+    Caches the serialised XML of selected subtrees of a document.
+
+    The cache attaches itself to the document of the element or tree.
+    Subtrees are marked for caching with ``add()``.  When the document,
+    or a part of it, is serialised to XML by ``tostring()``,
+    ``ElementTree.write()`` and the like, the output of the marked subtrees
+    is stored and copied into later serialisations instead of writing the
+    subtrees again, as long as they do not change.
+
+    Changes through the lxml API invalidate the cached output of the
+    marked subtrees that contain the changed element, text or attribute.
+    Moving a marked subtree to another place also invalidates the subtrees
+    inside of it, since its namespace context may change.  Operations that
+    may change the document as a whole, like XSLT, XInclude, the cleanup
+    functions or XPath calls with extension functions, invalidate the
+    entire cache.  Changes that bypass lxml, e.g. in C extensions, must be
+    followed by a call to ``invalidate()``.
+
+    Only plain XML serialisation without pretty printing uses the cache.
+    The cached output is kept for the most recently used encoding.
+    """
+    cdef _Document _doc
+    cdef dict _subtrees
+    cdef cython.pymutex _lock
+    cdef readonly Py_ssize_t hits
+    cdef readonly Py_ssize_t misses
+
+    def __init__(self, element_or_tree):
+        doc = _documentOrRaise(element_or_tree)
+        if doc._serialisation_cache is not None:
+            raise ValueError("The document already has a serialisation cache")
+        self._doc = doc
+        self._subtrees = {}
+        doc._serialisation_cache = self
+
+    def __len__(self):
+        return len(self._subtrees)
+
+    def __contains__(self, element):
+        if not isinstance(element, _Element):
+            return False
+        return <size_t>(<_Element>element)._c_node in self._subtrees
+
+    def add(self, _Element element not None):
+        """add(self, element)
+
+        Marks the subtree of an element for caching.
+        """
+        _assertValidNode(element)
+        self._assertAttached()
+        if element._doc is not self._doc:
+            raise ValueError("The element is not part of the cached document")
+        if element._c_node.type != tree.XML_ELEMENT_NODE:
+            raise TypeError("Only elements can be cached")
+        cdef _CachedSubtree subtree
+        key = <size_t>element._c_node
+        self._lock.acquire()
+        try:
+            if key not in self._subtrees:
+                subtree = _CachedSubtree.__new__(_CachedSubtree)
+                subtree._element = element
+                self._subtrees[key] = subtree
+        finally:
+            self._lock.release()
+
+    def discard(self, _Element element not None):
+        """discard(self, element)
+
+        Stops caching the subtree of an element, if it was marked.
+        """
+        self._lock.acquire()
+        try:
+            self._subtrees.pop(<size_t>element._c_node, None)
+        finally:
+            self._lock.release()
+
+    def invalidate(self, _Element element=None):
+        """invalidate(self, element=None)
+
+        Discards the cached output of all subtrees that contain the element
+        or that lie inside of it, or of all subtrees if no element is passed.
+        The subtrees stay marked for caching.
+        """
+        if element is None:
+            self._invalidateAll()
+        else:
+            _assertValidNode(element)
+            self._invalidateSubtree(element._c_node)
+
+    def detach(self):
+        """detach(self)
+
+        Removes the cache from its document and discards its content.
+        """
+        if self._doc is not None and self._doc._serialisation_cache is self:
+            self._doc._serialisation_cache = None
+        self._doc = None
+        self._lock.acquire()
+        try:
+            self._subtrees.clear()
+        finally:
+            self._lock.release()
+
+    cdef int _assertAttached(self) except -1:
+        if self._doc is None:
+            raise ValueError("The cache was detached from its document")
+        return 0
+
+    cdef void _invalidateAll(self) noexcept:
+        cdef _CachedSubtree subtree
+        self._lock.acquire()
+        for subtree in self._subtrees.values():
+            subtree._data = None
+        self._lock.release()
+
+    cdef void _invalidateNode(self, xmlNode* c_node) noexcept:
+        """Discards the output of the subtrees that contain the node.
+        """
+        cdef _CachedSubtree subtree
+        if not self._subtrees:
+            return
+        self._lock.acquire()
+        while c_node is not NULL and c_node.type == tree.XML_ELEMENT_NODE:
+            subtree = self._subtrees.get(<size_t>c_node)
+            if subtree is not None:
+                subtree._data = None
+            c_node = c_node.parent
+        self._lock.release()
+
+    cdef void _invalidateSubtree(self, xmlNode* c_node) noexcept:
+        """Discards the output of the subtrees that contain the node
+        or lie inside of it.
+        """
+        cdef _CachedSubtree subtree
+        cdef xmlNode* c_parent
+        if not self._subtrees:
+            return
+        self._invalidateNode(c_node)
+        self._lock.acquire()
+        for subtree in self._subtrees.values():
+            c_parent = subtree._element._c_node.parent
+            while c_parent is not NULL and c_parent is not c_node:
+                c_parent = c_parent.parent
+            if c_parent is c_node:
+                subtree._data = None
+        self._lock.release()
+
+    cdef _SerialisationSplices _prepare(self, xmlNode* c_top, const_char* c_enc):
+        """Looks up the marked subtrees below the top node, serialises those
+        without valid output and collects them into a splice table.
+
+        Must be called with the document locked for reading.
+        """
+        cdef _CachedSubtree subtree
+        cdef xmlNode* c_node
+        cdef xmlNode* c_parent
+        cdef list subtrees = []
+        encoding = <bytes>c_enc if c_enc is not NULL else None
+        self._lock.acquire()
+        try:
+            for subtree in self._subtrees.values():
+                c_node = subtree._element._c_node
+                if c_node is c_top or c_node.doc is not c_top.doc:
+                    continue
+                # Only use the outermost marked subtrees below the top node.
+                c_parent = c_node.parent
+                while c_parent is not NULL and c_parent is not c_top:
+                    if <size_t>c_parent in self._subtrees:
+                        break
+                    c_parent = c_parent.parent
+                if c_parent is not c_top:
+                    continue
+                if subtree._data is None or subtree._encoding != encoding:
+                    subtree._data = _serialiseSubtree(c_node, c_enc)
+                    subtree._encoding = encoding
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                subtrees.append(subtree)
+        finally:
+            self._lock.release()
+        if not subtrees:
+            return None
+        return _SerialisationSplices.create(c_top, subtrees)
+
+
+@cython.final
+@cython.internal
+@cython.freelist(8)
+cdef class _CachedSubtree:
+    cdef _Element _element
+    cdef bytes _encoding
+    cdef bytes _data
+
+
+@cython.final
+@cython.internal
+cdef class _SerialisationSplices:
+    """The cached subtrees used by a single serialisation run, and the
+    elements on the path to them.
+    """
+    cdef _SpliceTable _c_splices
+    cdef list _subtrees  # keeps the cached data alive
+
+    def __dealloc__(self):
+        python.lxml_free(self._c_splices.subtrees)
+        python.lxml_free(self._c_splices.path)
+
+    @staticmethod
+    cdef _SerialisationSplices create(xmlNode* c_top, list subtrees):
+        cdef _SerialisationSplices splices
+        cdef _CachedSubtree subtree
+        cdef _SplicedSubtree* c_subtree
+        cdef xmlNode* c_node
+        cdef set path = set()
+        cdef Py_ssize_t i
+        for subtree in subtrees:
+            c_node = subtree._element._c_node.parent
+            while <size_t>c_node not in path:
+                path.add(<size_t>c_node)
+                if c_node is c_top:
+                    break
+                c_node = c_node.parent
+
+        splices = _SerialisationSplices.__new__(_SerialisationSplices)
+        splices._subtrees = subtrees
+        splices._c_splices.subtrees = <_SplicedSubtree*>python.lxml_malloc(
+            len(subtrees), sizeof(_SplicedSubtree))
+        splices._c_splices.path = <xmlNode**>python.lxml_malloc(len(path), sizeof(xmlNode*))
+        if splices._c_splices.subtrees is NULL or splices._c_splices.path is NULL:
+            raise MemoryError()
+
+        for i, subtree in enumerate(subtrees):
+            c_subtree = &splices._c_splices.subtrees[i]
+            c_subtree.c_node = subtree._element._c_node
+            c_subtree.c_data = _cstr(subtree._data)
+            c_subtree.c_len = len(subtree._data)
+        splices._c_splices.subtree_count = len(subtrees)
+        qsort(splices._c_splices.subtrees, len(subtrees), sizeof(_SplicedSubtree),
+              _compareSplicedSubtrees)
+
+        for i, address in enumerate(path):
+            splices._c_splices.path[i] = <xmlNode*><size_t>address
+        splices._c_splices.path_count = len(path)
+        qsort(splices._c_splices.path, len(path), sizeof(xmlNode*), _compareNodeAddresses)
+        return splices
+
+
+cdef int _compareSplicedSubtrees(const void* a, const void* b) noexcept nogil:
+    return _compareNodeAddresses(&(<const _SplicedSubtree*>a).c_node,
+                                 &(<const _SplicedSubtree*>b).c_node)
+
+cdef int _compareNodeAddresses(const void* a, const void* b) noexcept nogil:
+    cdef size_t address_a = <size_t>(<xmlNode**>a)[0]
+    cdef size_t address_b = <size_t>(<xmlNode**>b)[0]
+    return (address_a > address_b) - (address_a < address_b)
+
+
+cdef bytes _serialiseSubtree(xmlNode* c_node, const_char* c_enc):
+    """Serialise an element without its tail, as libxml2 writes it inside
+    of its document, into the UTF-8 data that goes into the output buffer
+    before the output encoding is applied.
+    """
+    cdef tree.xmlOutputBuffer* c_buffer
+    cdef tree.xmlBuf* c_result_buffer
+    cdef int error_result
+    c_buffer = tree.xmlAllocOutputBuffer(NULL)
+    if c_buffer is NULL:
+        raise MemoryError()
+    with nogil:
+        tree.xmlNodeDumpOutput(c_buffer, c_node.doc, c_node, 0, 0, c_enc)
+    error_result = c_buffer.error
+    try:
+        if error_result == xmlerror.XML_ERR_OK:
+            c_result_buffer = _outputBufferResult(c_buffer)
+            data = <bytes>(<unsigned char*>tree.xmlBufContent(
+                c_result_buffer))[:tree.xmlBufUse(c_result_buffer)]
+    finally:
+        tree.xmlOutputBufferClose(c_buffer)
+    if error_result != xmlerror.XML_ERR_OK:
+        _raiseSerialisationError(error_result)
+    return data
+
+
+cdef _SerialisationSplices _prepareSplices(_Element element, const_char* c_enc,
+                                           int c_method, bint pretty_print):
+    """Returns the cached subtrees to splice into the serialisation of the
+    element, or None.  The document must be locked for reading.
+    """
+    cdef SerializationCache cache = element._doc._serialisation_cache
+    if cache is None or not _isPlainXmlOutput(element._c_node, c_method, pretty_print):
+        return None
+    return cache._prepare(element._c_node, c_enc)
+
+
+cdef bint _isPlainXmlOutput(xmlNode* c_node, int c_method, bint pretty_print) noexcept nogil:
+    """Checks whether libxml2 writes the element in the plain XML format
+    that _writeStartTag() and _writeEndTag() replicate.
+    """
+    cdef tree.xmlDtd* c_dtd
+    if c_method != OUTPUT_METHOD_XML or pretty_print:
+        return False
+    if c_node.type != tree.XML_ELEMENT_NODE:
+        return False
+    if c_node.doc.type != tree.XML_DOCUMENT_NODE:
+        return False
+    c_dtd = tree.xmlGetIntSubset(c_node.doc)
+    if c_dtd is not NULL and tree.xmlIsXHTML(c_dtd.SystemID, c_dtd.ExternalID) > 0:
+        # libxml2 writes XHTML documents in a different way
+        return False
+    return True
+
+
+# chunked serialisation
+
+def _iterTostring(_Element element, encoding, doctype, method,
+                  bint write_xml_declaration, bint write_complete_document,
+                  bint pretty_print, bint with_tail, int standalone,
+                  Py_ssize_t chunk_size):
+    """Generator that serializes an element into byte chunks of 'chunk_size'.
+
+    Plain XML output is written piece by piece and only buffers about one
+    chunk.  Other output methods are serialised as a whole first.
+    """
+    cdef tree.xmlOutputBuffer* c_buffer = NULL
+    cdef _FilelikeWriter writer
+    cdef _ChunkedWriter chunks
+    cdef int c_method
+    cdef int error_result
+    cdef bint is_plain_xml
+    _assertValidNode(element)
+    c_method = _findOutputMethod(method)
+    doc = element._doc
+    doc.lock_read()
+    is_plain_xml = _isPlainXmlOutput(element._c_node, c_method, pretty_print)
+    doc.unlock_read()
+    if not is_plain_xml:
+        data = _tostring(element, encoding, doctype, method, write_xml_declaration,
+                         write_complete_document, pretty_print, with_tail, standalone)
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i+chunk_size]
+        return
+
+    chunks = _ChunkedWriter.__new__(_ChunkedWriter)
+    chunks._top = element
+    chunks._data = bytearray()
+    chunks._encoding = _utf8(encoding)
+    chunks._doctype = _utf8(doctype) if doctype is not None else None
+    chunks._write_declaration = write_xml_declaration
+    chunks._write_complete_document = write_complete_document
+    chunks._with_tail = with_tail
+    chunks._standalone = standalone
+    writer = _create_output_buffer(chunks, _cstr(chunks._encoding), 0, &c_buffer, close=False)
+    try:
+        while True:
+            doc.lock_read()
+            try:
+                finished = chunks._writeStep(c_buffer, chunk_size)
+            finally:
+                doc.unlock_read()
+            writer._exc_context._raise_if_stored()
+            if c_buffer.error:
+                _raiseSerialisationError(c_buffer.error)
+            if finished:
+                break
+            while len(chunks._data) >= chunk_size:
+                yield chunks._popChunk(chunk_size)
+
+        # flush the remaining output
+        error_result = tree.xmlOutputBufferClose(c_buffer)
+        c_buffer = NULL
+        writer._exc_context._raise_if_stored()
+        if error_result == -1:
+            _raiseSerialisationError(error_result)
+        while chunks._data:
+            yield chunks._popChunk(chunk_size)
+    finally:
+        if c_buffer is not NULL:
+            tree.xmlOutputBufferClose(c_buffer)
+
+
+@cython.final
+@cython.internal
+cdef class _ChunkedWriter:
+    """Output target of a serialisation that writes a tree in steps.
+
+    Each step stops before the next element once a chunk of output was
+    collected.  The open elements are kept between the steps, so that
+    changes to the tree in between can be detected.
+    """
+    cdef _Element _top
+    cdef list _stack  # open elements below the top, or None before the first step
+    cdef _Element _next
+    cdef bytearray _data
+    cdef bytes _encoding
+    cdef bytes _doctype
+    cdef bint _write_declaration
+    cdef bint _write_complete_document
+    cdef bint _with_tail
+    cdef int _standalone
+
+    def write(self, data):
+        self._data += data
+
+    cdef bytes _popChunk(self, Py_ssize_t chunk_size):
+        chunk = bytes(self._data[:chunk_size])
+        del self._data[:chunk_size]
+        return chunk
+
+    cdef bint _writeStep(self, tree.xmlOutputBuffer* c_buffer,
+                         Py_ssize_t chunk_size) except -1:
+        """Writes the next part of the tree.  Returns True when done.
+
+        Must be called with the document locked for reading.
+        """
+        cdef xmlNode* c_top = self._top._c_node
+        cdef xmlNode* c_parent
+        cdef xmlNode* c_node
+        cdef xmlNode* c_nsdecl_node
+        cdef tree.xmlBuffer* c_tmp
+        cdef const_char* c_enc = _cstr(self._encoding)
+        cdef bint finished
+        c_tmp = tree.xmlBufferCreate()
+        if c_tmp is NULL:
+            raise MemoryError()
+        try:
+            if self._stack is None:
+                self._stack = []
+                _writeNodeProlog(
+                    c_buffer, c_top, c_enc,
+                    _xcstr(self._doctype) if self._doctype is not None else NULL,
+                    OUTPUT_METHOD_XML, self._write_declaration,
+                    self._write_complete_document, 0, self._standalone)
+                c_nsdecl_node = _createNsDeclNode(c_top)
+                if c_nsdecl_node is NULL:
+                    raise MemoryError()
+                if c_top.children is NULL:
+                    tree.xmlNodeDumpOutput(c_buffer, c_top.doc, c_nsdecl_node, 0, 0, c_enc)
+                else:
+                    _writeStartTag(c_buffer, c_nsdecl_node, c_tmp)
+                _freeNsDeclNode(c_top, c_nsdecl_node)
+                if c_top.children is NULL:
+                    finished = True
+                else:
+                    finished = self._writeChildren(c_buffer, c_top, c_top.children,
+                                                   c_enc, c_tmp, chunk_size)
+            else:
+                c_parent = self._resumeParent()
+                finished = self._writeChildren(c_buffer, c_parent, self._next._c_node,
+                                               c_enc, c_tmp, chunk_size)
+        finally:
+            tree.xmlBufferFree(c_tmp)
+        if finished and not c_buffer.error:
+            _writeNodeEpilog(c_buffer, c_top, c_enc, OUTPUT_METHOD_XML,
+                             self._write_complete_document, 0, self._with_tail)
+        return finished
+
+    cdef bint _writeChildren(self, tree.xmlOutputBuffer* c_buffer,
+                             xmlNode* c_parent, xmlNode* c_node, const_char* c_enc,
+                             tree.xmlBuffer* c_tmp, Py_ssize_t chunk_size) except -1:
+        # Mirrors the non-recursive tree walk of xmlNodeDumpOutput().
+        cdef xmlNode* c_top = self._top._c_node
+        while not c_buffer.error:
+            if c_node is NULL:
+                # all children written, close the parent
+                _writeEndTag(c_buffer, c_parent)
+                if c_parent is c_top:
+                    break
+                c_node = c_parent.next
+                c_parent = c_parent.parent
+                continue
+            if c_node.type == tree.XML_ELEMENT_NODE:
+                if len(self._data) >= chunk_size:
+                    self._storePosition(c_parent, c_node)
+                    return False
+                if c_node.children is not NULL:
+                    _writeStartTag(c_buffer, c_node, c_tmp)
+                    c_parent = c_node
+                    c_node = c_node.children
+                    continue
+            tree.xmlNodeDumpOutput(c_buffer, c_top.doc, c_node, 0, 0, c_enc)
+            c_node = c_node.next
+        self._next = None
+        return True
+
+    cdef int _storePosition(self, xmlNode* c_parent, xmlNode* c_node) except -1:
+        cdef xmlNode* c_top = self._top._c_node
+        doc = self._top._doc
+        self._next = _elementFactory(doc, c_node)
+        stack = []
+        while c_parent is not c_top:
+            stack.append(_elementFactory(doc, c_parent))
+            c_parent = c_parent.parent
+        stack.reverse()
+        self._stack = stack
+        return 0
+
+    cdef xmlNode* _resumeParent(self) except NULL:
+        cdef _Element element
+        cdef xmlNode* c_parent = self._top._c_node
+        for element in self._stack:
+            if element._c_node.parent is not c_parent:
+                raise RuntimeError("The tree was modified during serialisation")
+            c_parent = element._c_node
+        if self._next._c_node.parent is not c_parent:
+            raise RuntimeError("The tree was modified during serialisation")
+        return c_parent
+
+
 # incremental serialisation
 
 cdef class xmlfile:
@@ -0,0 +1,66 @@
+# cython: language_level=3
+
+"""
+C level parser target for testing ``ParserTargetBase``.
+"""
+
+from lxml.includes.etreepublic cimport ParserTargetBase
+cimport lxml.includes.etreepublic as cetree
+
+cetree.import_lxml__etree()
+
+
+cdef class EventCollector(ParserTargetBase):
+    """Collects all parser events in a list.
+    """
+    cdef readonly list events
+
+    def __cinit__(self, *args):
+        self.events = []
+        self._start_function = _collect_start
+        self._end_function = _collect_end
+        self._data_function = _collect_data
+        self._comment_function = _collect_comment
+        self._pi_function = _collect_pi
+
+    def close(self):
+        return self.events
+
+
+cdef class TagCounter(ParserTargetBase):
+    """Counts the start events only.
+    """
+    cdef readonly Py_ssize_t count
+
+    def __cinit__(self):
+        self._start_function = _count_start
+
+    def close(self):
+        return self.count
+
+
+cdef object _collect_start(object target, object tag, object attrib, object nsmap):
+    (<EventCollector>target).events.append(("start", tag, dict(attrib), dict(nsmap)))
+
+
+cdef object _collect_end(object target, object tag):
+    (<EventCollector>target).events.append(("end", tag))
+
+
+cdef int _collect_data(object target, object data) except -1:
+    if data == "fail":
+        raise ValueError(data)
+    (<EventCollector>target).events.append(("data", data))
+    return 0
+
+
+cdef object _collect_comment(object target, object comment):
+    (<EventCollector>target).events.append(("comment", comment))
+
+
+cdef object _collect_pi(object target, object pi_target, object data):
+    (<EventCollector>target).events.append(("pi", pi_target, data))
+
+
+cdef object _count_start(object target, object tag, object attrib, object nsmap):
+    (<TagCounter>target).count += 1
@@ -10,6 +10,7 @@ from collections import OrderedDict
 from io import StringIO, BytesIO
 import os.path
 import unittest
+import asyncio
 import contextlib
 import copy
 import itertools
@@ -719,6 +720,364 @@ class ETreeOnlyTestCase(HelperTestCase):
             b'<a><b><c/></b></a>',
             tostring(tree))
 
+    def test_parse_keep(self):
+        fromstring = self.etree.fromstring
+        tostring = self.etree.tostring
+        XMLParser = self.etree.XMLParser
+
+        xml = (b'<feed><meta>M</meta>'
+               b'<item id="1"><name>A</name><info><x/></info></item>'
+               b'<item id="2"><name>B</name><price>1</price></item>'
+               b'<other><deep><name>C</name></deep></other></feed>')
+
+        parser = XMLParser(keep='item/name')
+        self.assertEqual(
+            b'<feed><item id="1"><name>A</name></item><item id="2"><name>B</name></item></feed>',
+            tostring(fromstring(xml, parser)))
+        # reuse the parser
+        self.assertEqual(
+            b'<feed><item id="1"><name>A</name></item><item id="2"><name>B</name></item></feed>',
+            tostring(fromstring(xml, parser)))
+
+        parser = XMLParser(keep=['meta', 'item/price'])
+        self.assertEqual(
+            b'<feed><meta>M</meta><item id="2"><price>1</price></item></feed>',
+            tostring(fromstring(xml, parser)))
+
+        parser = XMLParser(keep='.//name')
+        self.assertEqual(
+            b'<feed><item id="1"><name>A</name></item><item id="2"><name>B</name></item>'
+            b'<other><deep><name>C</name></deep></other></feed>',
+            tostring(fromstring(xml, parser)))
+
+        parser = XMLParser(keep='*/*/name')
+        self.assertEqual(
+            b'<feed><other><deep><name>C</name></deep></other></feed>',
+            tostring(fromstring(xml, parser)))
+
+        parser = XMLParser(keep='.')
+        self.assertEqual(xml, tostring(fromstring(xml, parser)))
+
+    def test_parse_keep_text(self):
+        fromstring = self.etree.fromstring
+        tostring = self.etree.tostring
+        XMLParser = self.etree.XMLParser
+
+        xml = b'<a>\n  <b>B</b>\n  <c>C</c>\n  <b>B</b>\n</a>'
+        for compact in (True, False):
+            parser = XMLParser(keep='c', compact=compact)
+            self.assertEqual(
+                b'<a>\n  \n  <c>C</c>\n  \n</a>',
+                tostring(fromstring(xml, parser)))
+
+    def test_parse_keep_namespaces(self):
+        fromstring = self.etree.fromstring
+        tostring = self.etree.tostring
+        XMLParser = self.etree.XMLParser
+
+        xml = b'<r xmlns="urn:x"><a><b/></a><c/></r>'
+        self.assertEqual(
+            b'<r xmlns="urn:x"><a><b/></a></r>',
+            tostring(fromstring(xml, XMLParser(keep='{urn:x}a'))))
+        self.assertEqual(
+            b'<r xmlns="urn:x"><c/></r>',
+            tostring(fromstring(xml, XMLParser(keep='{*}c'))))
+        self.assertEqual(
+            b'<r xmlns="urn:x"/>',
+            tostring(fromstring(xml, XMLParser(keep='c'))))
+
+    def test_parse_keep_events(self):
+        XMLPullParser = self.etree.XMLPullParser
+        tostring = self.etree.tostring
+
+        parser = XMLPullParser(events=('start', 'end'), keep='b/c')
+        parser.feed(b'<a><b><c/><d/></b><e><c/></e></a>')
+        events = [(event, el.tag) for event, el in parser.read_events()]
+        self.assertEqual(
+            [('start', 'a'), ('start', 'b'), ('start', 'c'), ('end', 'c'),
+             ('start', 'd'), ('end', 'd'), ('end', 'b'), ('start', 'e'),
+             ('start', 'c'), ('end', 'c'), ('end', 'e'), ('end', 'a')],
+            events)
+        root = parser.close()
+        self.assertEqual(b'<a><b><c/></b></a>', tostring(root))
+
+    def test_parse_keep_html(self):
+        fromstring = self.etree.fromstring
+        tostring = self.etree.tostring
+        HTMLParser = self.etree.HTMLParser
+
+        html = ('<html><head><title>T</title></head>'
+                '<body><div><p>A</p><span>S</span></div><p>B</p></body></html>')
+        parser = HTMLParser(keep='body//p')
+        self.assertEqual(
+            b'<html><body><div><p>A</p></div><p>B</p></body></html>',
+            tostring(fromstring(html, parser)))
+
+    def test_parse_keep_invalid(self):
+        XMLParser = self.etree.XMLParser
+        self.assertRaises(SyntaxError, XMLParser, keep='a[1]')
+        self.assertRaises(SyntaxError, XMLParser, keep='a/..')
+        self.assertRaises(SyntaxError, XMLParser, keep='/a')
+        self.assertRaises(ValueError, XMLParser, keep=[])
+        self.assertRaises(ValueError, XMLParser, keep='a', target=object())
+
+    def test_parser_stats(self):
+        XMLParser = self.etree.XMLParser
+        fromstring = self.etree.fromstring
+        xml = b'<root a="1" b="2"><c d="3"/>text<e/></root>'
+
+        self.assertEqual(None, XMLParser().stats)
+        parser = XMLParser(collect_stats=True)
+        self.assertEqual(None, parser.stats)
+
+        root = fromstring(xml, parser)
+        stats = parser.stats
+        self.assertEqual(len(xml), stats['bytes_read'])
+        self.assertEqual(3, stats['elements'])
+        self.assertEqual(3, stats['attributes'])
+        self.assertEqual(0, stats['resolver_calls'])
+        self.assertGreater(stats['dict_size'], 0)
+        self.assertGreaterEqual(stats['parse_time'], stats['io_time'])
+        self.assertEqual(stats, root.getroottree().docinfo.parse_stats)
+
+        # names are already known in the second run
+        fromstring(xml, parser)
+        self.assertEqual(0, parser.stats['dict_growth'])
+
+    def test_parser_stats_created_nodes(self):
+        XMLParser = self.etree.XMLParser
+        fromstring = self.etree.fromstring
+        xml = b'<!DOCTYPE r [<!ATTLIST a x CDATA "1">]><r><a/><a x="2"/><b y="3"/></r>'
+
+        parser = XMLParser(collect_stats=True)
+        fromstring(xml, parser)
+        self.assertEqual(4, parser.stats['elements'])
+        self.assertEqual(2, parser.stats['attributes'])
+
+        parser = XMLParser(collect_stats=True, attribute_defaults=True)
+        fromstring(xml, parser)
+        self.assertEqual(4, parser.stats['elements'])
+        self.assertEqual(3, parser.stats['attributes'])
+
+        # elements that are discarded while parsing still count
+        parser = XMLParser(collect_stats=True, keep='a')
+        root = fromstring(xml, parser)
+        self.assertEqual(['a', 'a'], [child.tag for child in root])
+        self.assertEqual(4, parser.stats['elements'])
+
+        parser = self.etree.HTMLParser(collect_stats=True)
+        fromstring(b'<p class="x">text</p>', parser)
+        self.assertEqual(3, parser.stats['elements'])  # html, body, p
+        self.assertEqual(1, parser.stats['attributes'])
+
+    def test_parser_stats_disabled(self):
+        root = self.etree.fromstring(b'<a/>', self.etree.XMLParser())
+        self.assertEqual(None, root.getroottree().docinfo.parse_stats)
+
+    def test_parser_stats_filelike(self):
+        parser = self.etree.XMLParser(collect_stats=True)
+        xml = b'<root>' + b'<a/>' * 1000 + b'</root>'
+
+        class Reader:
+            def __init__(self):
+                self.data = BytesIO(xml)
+            def read(self, size):
+                return self.data.read(size)
+
+        tree = self.etree.parse(Reader(), parser)
+        stats = tree.docinfo.parse_stats
+        self.assertEqual(len(xml), stats['bytes_read'])
+        self.assertEqual(1001, stats['elements'])
+        self.assertGreater(stats['io_time'], 0)
+
+    def test_parser_stats_feed(self):
+        parser = self.etree.XMLParser(collect_stats=True)
+        parser.feed(b'<root><a/>')
+        parser.feed(b'<b x="1"/></root>')
+        root = parser.close()
+        stats = parser.stats
+        self.assertEqual(27, stats['bytes_read'])
+        self.assertEqual(3, stats['elements'])
+        self.assertEqual(1, stats['attributes'])
+        self.assertEqual(stats, root.getroottree().docinfo.parse_stats)
+
+    def test_parser_stats_resolver(self):
+        class MyResolver(self.etree.Resolver):
+            def resolve(self, url, id, context):
+                return self.resolve_string('<!ENTITY myentity "TEST">', context)
+
+        parser = self.etree.XMLParser(collect_stats=True, load_dtd=True)
+        parser.resolvers.add(MyResolver())
+        self.etree.fromstring(
+            b'<!DOCTYPE doc SYSTEM "test.dtd"><doc>&myentity;</doc>', parser)
+        self.assertEqual(1, parser.stats['resolver_calls'])
+
+    def test_parser_progress_filelike(self):
+        reports = []
+        parser = self.etree.XMLParser(progress=reports.append, progress_interval=1000)
+        xml = b'<root>' + b'<a><b/></a>' * 1000 + b'</root>'
+
+        class Reader:
+            def __init__(self):
+                self.data = BytesIO(xml)
+            def read(self, size):
+                return self.data.read(size)
+
+        root = self.etree.parse(Reader(), parser).getroot()
+        self.assertEqual(1000, len(root))
+        # libxml2 reads larger chunks than the interval
+        self.assertGreater(len(reports), 1)
+        bytes_read = [report['bytes_read'] for report in reports]
+        self.assertEqual(sorted(bytes_read), bytes_read)
+        self.assertGreaterEqual(bytes_read[0], 1000)
+        self.assertEqual(len(xml), bytes_read[-1])
+        report = reports[-1]
+        self.assertEqual(0, report['events'])
+        self.assertGreater(report['elements'], 1)
+        self.assertLessEqual(report['elements'], 2001)
+        self.assertIn(report['depth'], (1, 2, 3))
+        self.assertGreaterEqual(report['elapsed'], 0)
+        self.assertGreaterEqual(report['elements_per_second'], 0)
+
+    def test_parser_progress_file(self):
+        reports = []
+        parser = self.etree.XMLParser(progress=reports.append, progress_interval=1000)
+        xml = b'<root>' + b'<a/>' * 1000 + b'</root>'
+        with tmpfile() as filename:
+            with open(filename, 'wb') as f:
+                f.write(xml)
+            root = self.etree.parse(filename, parser).getroot()
+        self.assertEqual(1000, len(root))
+        self.assertTrue(reports)
+        self.assertGreaterEqual(reports[0]['bytes_read'], 1000)
+        self.assertEqual(len(xml), reports[-1]['bytes_read'])
+        self.assertEqual(1001, reports[-1]['elements'])
+
+        # parsing from memory does not report progress
+        del reports[:]
+        self.etree.fromstring(xml, parser)
+        self.assertEqual([], reports)
+
+    def test_parser_progress_file_native(self):
+        def stop(report):
+            raise ValueError("stop")
+
+        reports = []
+        xml = b'<root>' + b'<a/>' * 1000 + b'</root>'
+        with tmpfile() as filename:
+            with open(filename, 'wb') as f:
+                f.write(gzip.compress(xml))
+            # libxml2 decompresses the file itself and reports the XML bytes
+            parser = self.etree.XMLParser(
+                progress=reports.append, progress_interval=1000, decompress=True)
+            self.assertEqual(1000, len(self.etree.parse(filename, parser).getroot()))
+            self.assertEqual(5, len(reports))
+            self.assertEqual([1000, 2000, 3000, 4000],
+                             [report['bytes_read'] // 1000 * 1000 for report in reports[:-1]])
+            self.assertEqual(len(xml), reports[-1]['bytes_read'])
+
+            parser = self.etree.XMLParser(progress=stop, progress_interval=1000, decompress=True)
+            self.assertRaises(ValueError, self.etree.parse, filename, parser)
+
+    def test_parser_progress_mmap(self):
+        reports = []
+        parser = self.etree.XMLParser(progress=reports.append, progress_interval=1000)
+        xml = b'<root>' + b'<a/>' * 1000 + b'</root>'
+        with tmpfile() as filename:
+            with open(filename, 'wb') as f:
+                f.write(xml)
+            root = self.etree.parse(filename, parser, mmap=True).getroot()
+        self.assertEqual(1000, len(root))
+        self.assertEqual([1000, 2000, 3000, 4000, len(xml)],
+                         [report['bytes_read'] for report in reports])
+        self.assertEqual(1001, reports[-1]['elements'])
+
+    def test_parser_progress_bytesio(self):
+        reports = []
+        parser = self.etree.XMLParser(progress=reports.append, progress_interval=1000)
+        xml = b'<root>' + b'<a/>' * 1000 + b'</root>'
+        source = BytesIO(xml)
+        root = self.etree.parse(source, parser).getroot()
+        self.assertEqual(1000, len(root))
+        self.assertEqual([1000, 2000, 3000, 4000, len(xml)],
+                         [report['bytes_read'] for report in reports])
+        # the buffer was released
+        source.write(b'<!-- -->')
+
+    def test_parser_progress_final_report(self):
+        reports = []
+        parser = self.etree.XMLPullParser(progress=reports.append, progress_interval=1000)
+        parser.feed(b'<root>' + b'<a/>' * 10)
+        parser.feed(b'</root>')
+        self.assertEqual([], reports)
+        parser.close()
+        self.assertEqual(1, len(reports))
+        self.assertEqual(53, reports[0]['bytes_read'])
+        self.assertEqual(11, reports[0]['elements'])
+        self.assertEqual(0, reports[0]['depth'])
+
+        # the end of input that was already reported is not reported again
+        del reports[:]
+        parser = self.etree.XMLParser(progress=reports.append, progress_interval=53)
+        self.etree.parse(BytesIO(b'<root>' + b'<a/>' * 10 + b'</root>'), parser)
+        self.assertEqual([53], [report['bytes_read'] for report in reports])
+
+        # failed parser runs do not finish
+        del reports[:]
+        self.assertRaises(self.etree.XMLSyntaxError, self.etree.parse,
+                          BytesIO(b'<root>' + b'<a/>' * 10), parser)
+        self.assertEqual([], reports)
+
+    def test_parser_progress_feed(self):
+        reports = []
+        parser = self.etree.XMLPullParser(progress=reports.append, progress_interval=100)
+        parser.feed(b'<root>' + b'<a/>' * 20)
+        self.assertEqual(0, len(reports))
+        parser.feed(b'<a/>' * 20)
+        self.assertEqual(1, len(reports))
+        self.assertEqual(166, reports[0]['bytes_read'])
+        self.assertEqual(41, reports[0]['elements'])
+        self.assertEqual(40, reports[0]['events'])
+        self.assertEqual(1, reports[0]['depth'])
+        parser.feed(b'</root>')
+        parser.close()
+
+        # the next parser run reports its own counters
+        del reports[:]
+        parser.feed(b'<root>' + b'<a/>' * 30)
+        self.assertEqual(1, len(reports))
+        self.assertEqual(126, reports[0]['bytes_read'])
+        self.assertEqual(30, reports[0]['events'])
+        parser.feed(b'</root>')
+        parser.close()
+
+    def test_parser_progress_split_documents(self):
+        reports = []
+        parser = self.etree.XMLPullParser(
+            split_documents=True, progress=reports.append, progress_interval=100)
+        for _ in range(3):
+            parser.feed(b'<a><b/></a>\n' * 10)
+        self.assertEqual(60, len(list(parser.read_events())))
+        self.assertEqual([120, 240, 360], [report['bytes_read'] for report in reports])
+        self.assertEqual(60, reports[-1]['elements'])
+
+        parser.feed(b'<c/>')
+        parser.close()
+        self.assertEqual([120, 240, 360, 364], [report['bytes_read'] for report in reports])
+        self.assertEqual(61, reports[-1]['elements'])
+
+    def test_parser_progress_exception(self):
+        def progress(report):
+            raise ValueError("stop")
+        parser = self.etree.XMLParser(progress=progress, progress_interval=10)
+        self.assertRaises(ValueError, self.etree.parse,
+                          SillyFileLike(b'<root>' + b'<a/>' * 100 + b'</root>'), parser)
+        self.assertRaises(ValueError, parser.feed, b'<root>' + b'<a/>' * 100)
+
+    def test_parser_progress_invalid(self):
+        self.assertRaises(TypeError, self.etree.XMLParser, progress=1)
+        self.assertRaises(ValueError, self.etree.XMLParser, progress=print, progress_interval=0)
+
     def test_parse_parser_type_error(self):
         # ET raises IOError only
         parse = self.etree.parse
@@ -922,6 +1281,275 @@ class ETreeOnlyTestCase(HelperTestCase):
             [('start', root[0]), ('end', root[0])],
             events)
 
+    def test_iterparse_prune(self):
+        iterparse = self.etree.iterparse
+        f = BytesIO(b'<a><b>1<c/></b>t1<d/>t2<b>2</b><e><b>3</b></e></a>')
+
+        iterator = iterparse(f, tag="b", prune=True)
+        seen = []
+        for event, element in iterator:
+            previous = element.getprevious()
+            seen.append((element.text, len(element), element.getparent().tag,
+                         previous.tag if previous is not None else None))
+        self.assertEqual(
+            [('1', 1, 'a', None), ('2', 0, 'a', 'd'), ('3', 0, 'e', None)], seen)
+        self.assertEqual(b'<a><e/></a>', self.etree.tostring(iterator.root))
+
+    def test_iterparse_prune_keep_reference(self):
+        iterparse = self.etree.iterparse
+        f = BytesIO(b'<a xmlns:x="urn:x"><b x:y="1"><c>t</c></b>tail<b/></a>')
+
+        elements = [element for event, element in iterparse(
+            f, tag="b", events=('start', 'end'), prune=True)]
+        self.assertEqual(4, len(elements))
+        self.assertEqual(None, elements[1].getparent())
+        self.assertEqual(b'<b xmlns:x="urn:x" x:y="1"><c>t</c></b>tail',
+                         self.etree.tostring(elements[1]))
+
+    def test_iterparse_prune_requires_tag(self):
+        iterparse = self.etree.iterparse
+        f = BytesIO(b'<r><rec><a/><b/></rec></r>')
+        self.assertRaises(ValueError, iterparse, f, prune=True)
+        self.assertRaises(ValueError, iterparse, f, tag='*', prune=True)
+
+    def test_iterparse_prune_nested(self):
+        iterparse = self.etree.iterparse
+        f = BytesIO(b'<r><rec><a/><b/></rec><rec><rec><c/></rec><d/></rec><e/></r>')
+
+        iterator = iterparse(f, tag=('rec', 'a', 'b', 'c'), prune=True)
+        events = [(element.tag, [child.tag for child in element])
+                  for event, element in iterator]
+        self.assertEqual(
+            [('a', []), ('b', []), ('rec', ['a', 'b']),
+             ('c', []), ('rec', ['c']), ('rec', ['rec', 'd'])],
+            events)
+        self.assertEqual(b'<r><e/></r>', self.etree.tostring(iterator.root))
+
+    def test_iterparse_prune_large(self):
+        iterparse = self.etree.iterparse
+        xml = b'<a>' + b''.join(
+            b'<b n="%d">text<c/>tail</b>\n' % i for i in range(5000)) + b'</a>'
+
+        iterator = iterparse(BytesIO(xml), tag="b", prune=True, chunk_size=1000)
+        numbers = [int(element.get('n')) for event, element in iterator]
+        self.assertEqual(list(range(5000)), numbers)
+        self.assertEqual(0, len(iterator.root))
+
+    def test_iterparse_prune_dtd_validation(self):
+        self.assertRaises(ValueError, self.etree.iterparse, BytesIO(b'<a/>'),
+                          prune=True, dtd_validation=True)
+
+    def test_iterparse_extract(self):
+        iterparse = self.etree.iterparse
+        xml = (b'<root xmlns:n="urn:n"><head>h</head>' +
+               b''.join(b'<rec id="%d"><title>T%d</title><meta><n:x k="v">xt</n:x></meta>'
+                        b'<empty/></rec>' % (i, i) for i in range(1000)) +
+               b'</root>')
+        extract = {
+            'id': '@id', 'title': 'title', 'k': 'meta/{urn:n}x/@k', 'x': './/{urn:n}x',
+            'any': '*/*', 'empty': 'empty', 'missing': 'missing', 'no_attr': '@missing',
+        }
+        iterator = iterparse(BytesIO(xml), tag='rec', extract=extract, chunk_size=1000)
+        records = list(iterator)
+        self.assertEqual(1000, len(records))
+        self.assertEqual(
+            {'id': '999', 'title': 'T999', 'k': 'v', 'x': 'xt', 'any': 'xt',
+             'empty': '', 'missing': None, 'no_attr': None},
+            records[-1])
+        self.assertEqual([str(i) for i in range(1000)], [r['id'] for r in records])
+        # the records are discarded from the tree
+        self.assertEqual(0, len(iterator.root))
+        self.assertEqual('root', iterator.root.tag)
+
+    def test_iterparse_extract_tuples(self):
+        xml = b'<root><rec id="1"><a>A</a></rec><other/><rec id="2"/></root>'
+        records = list(self.etree.iterparse(BytesIO(xml), tag='rec', extract=['@id', 'a']))
+        self.assertEqual([('1', 'A'), ('2', None)], records)
+
+    def test_iterparse_extract_html(self):
+        html = b'<html><body><p class="c">a</p><div><p>b</p></div></body></html>'
+        records = list(self.etree.iterparse(
+            BytesIO(html), tag='p', html=True, extract=('.', '@class')))
+        self.assertEqual([('a', 'c'), ('b', None)], records)
+
+    def test_iterparse_extract_invalid(self):
+        iterparse = self.etree.iterparse
+        source = BytesIO(b'<a/>')
+        self.assertRaises(ValueError, iterparse, source, extract=['@id'])
+        self.assertRaises(ValueError, iterparse, source, tag='a', extract=['@id'], prune=True)
+        self.assertRaises(ValueError, iterparse, source, tag='a', extract=['@id'],
+                          events=('start', 'end'))
+        self.assertRaises(TypeError, iterparse, source, tag='a', extract='@id')
+        self.assertRaises(TypeError, iterparse, source, tag='a', extract=[1])
+        self.assertRaises(SyntaxError, iterparse, source, tag='a', extract=['b[1]'])
+        self.assertRaises(SyntaxError, iterparse, source, tag='a', extract=['b/@'])
+
+    def test_iterparse_checkpoint_resume(self):
+        iterparse = self.etree.iterparse
+        for encoding in ('utf-8', 'iso-8859-1'):
+            xml = ('<?xml version="1.0" encoding="%s"?>\n'
+                   '<p:root xmlns:p="urn:p" xmlns="urn:d" a="1">' % encoding +
+                   ''.join('\n <rec n="%d">\xe4<p:x/></rec>' % i for i in range(500)) +
+                   '\n</p:root>\n').encode(encoding)
+
+            iterator = iterparse(BytesIO(xml), events=('start', 'end'),
+                                 tag='{urn:d}rec', checkpoints=True, chunk_size=100)
+            self.assertIsNone(iterator.checkpoint())
+            for event, element in iterator:
+                if event == 'end' and element.get('n') == '299':
+                    break
+            checkpoint = iterator.checkpoint()
+            self.assertEqual(
+                {'offset': xml.index(b'</rec>', xml.index(b'n="299"')) + 6,
+                 'encoding': encoding,
+                 'ancestors': ['<p:root xmlns:p="urn:p" xmlns="urn:d" a="1">']},
+                checkpoint)
+
+            iterator = iterparse(BytesIO(xml), tag='{urn:d}rec', resume=checkpoint,
+                                 checkpoints=True, chunk_size=100)
+            numbers = []
+            for _, element in iterator:
+                self.assertEqual('\xe4', element.text)
+                numbers.append(int(element.get('n')))
+            self.assertEqual(list(range(300, 500)), numbers)
+            self.assertEqual('{urn:p}root', iterator.root.tag)
+            self.assertEqual(xml.rindex(b'</rec>') + 6, iterator.checkpoint()['offset'])
+
+    def test_iterparse_checkpoint_top_level_only(self):
+        xml = b'<root><a><b/></a><c/></root>'
+        iterator = self.etree.iterparse(BytesIO(xml), checkpoints=True)
+        offsets = [(element.tag, iterator.checkpoint()) for _, element in iterator]
+        self.assertEqual(
+            [('b', None), ('a', 17), ('c', 21), ('root', 21)],
+            [(tag, checkpoint and checkpoint['offset']) for tag, checkpoint in offsets])
+
+    def test_iterparse_checkpoint_invalid(self):
+        iterator = self.etree.iterparse(BytesIO(b'<a/>'))
+        self.assertRaises(ValueError, iterator.checkpoint)
+        checkpoint = {'offset': 0, 'encoding': None, 'ancestors': ['<a>']}
+        self.assertRaises(ValueError, self.etree.iterparse, BytesIO(b'<a/>'),
+                          resume=checkpoint, compression='gzip')
+
+    def _columnar_rows(self, batches):
+        rows = []
+        for batch in batches:
+            events, depths, tags = batch.event.tolist(), batch.depth.tolist(), batch.tag.tolist()
+            text, text_offsets = bytes(batch.text), batch.text_offsets.tolist()
+            attr_offsets, attr_names = batch.attr_offsets.tolist(), batch.attr_name.tolist()
+            values, value_offsets = bytes(batch.attr_values), batch.attr_value_offsets.tolist()
+            for i in range(len(batch)):
+                rows.append((
+                    batch.event_names[events[i]], depths[i],
+                    batch.names[tags[i]] if tags[i] >= 0 else None,
+                    text[text_offsets[i]:text_offsets[i+1]].decode('utf8'),
+                    [(batch.names[attr_names[j]],
+                      values[value_offsets[j]:value_offsets[j+1]].decode('utf8'))
+                     for j in range(attr_offsets[i], attr_offsets[i+1])]))
+        return rows
+
+    def test_iterparse_columnar(self):
+        iterparse = self.etree.iterparse
+        xml = ('<root xmlns:p="urn:p"><a id="1" p:x="\xe4">text &amp; more</a>'
+               '<!-- c --> tail<p:b/></root>').encode('utf8')
+        expected = [
+            ('start', 0, 'root', '', []),
+            ('start', 1, 'a', '', [('id', '1'), ('{urn:p}x', '\xe4')]),
+            ('text', 2, None, 'text & more', []),
+            ('end', 1, 'a', '', []),
+            ('text', 1, None, ' tail', []),
+            ('start', 1, '{urn:p}b', '', []),
+            ('end', 1, '{urn:p}b', '', []),
+            ('end', 0, 'root', '', []),
+        ]
+        for chunk_size in (1, 7, 1000):
+            iterator = iterparse(BytesIO(xml), events=('start', 'end', 'text'),
+                                 columnar=True, chunk_size=chunk_size)
+            batches = list(iterator)
+            self.assertEqual(expected, self._columnar_rows(batches))
+            self.assertIsNone(iterator.root)
+
+        rows = self._columnar_rows(iterparse(BytesIO(xml), columnar=True))
+        self.assertEqual(['a', '{urn:p}b', 'root'], [row[2] for row in rows])
+        self.assertEqual({'end'}, {row[0] for row in rows})
+
+    def test_iterparse_columnar_buffers(self):
+        xml = b'<root><a n="1">x</a></root>'
+        batch, = self.etree.iterparse(
+            BytesIO(xml), events=('start', 'end', 'text'), columnar=True)
+        self.assertEqual(5, len(batch))
+        for name, format, size in [('event', 'b', 5), ('depth', 'i', 5), ('tag', 'i', 5),
+                                   ('text_offsets', 'q', 6), ('text', 'B', 1),
+                                   ('attr_offsets', 'q', 6), ('attr_name', 'i', 1),
+                                   ('attr_value_offsets', 'q', 2), ('attr_values', 'B', 1)]:
+            column = getattr(batch, name)
+            self.assertEqual(format, column.format, name)
+            self.assertEqual((size,), column.shape, name)
+            self.assertTrue(column.readonly, name)
+        self.assertEqual([0, 1, 2, 1, 0], batch.depth.tolist())
+        self.assertEqual(['root', 'n', 'a'], batch.names)
+
+    def test_iterparse_columnar_error(self):
+        iterator = self.etree.iterparse(
+            BytesIO(b'<root><a/><b></root>'), events=('start',), columnar=True)
+        batch = next(iterator)
+        self.assertEqual(['root', 'a', 'b'], [batch.names[i] for i in batch.tag.tolist()])
+        self.assertRaises(self.etree.XMLSyntaxError, next, iterator)
+
+    def test_iterparse_columnar_invalid(self):
+        iterparse = self.etree.iterparse
+        source = BytesIO(b'<a/>')
+        self.assertRaises(ValueError, iterparse, source, events=('start-ns',), columnar=True)
+        self.assertRaises(ValueError, iterparse, source, tag='a', columnar=True)
+        self.assertRaises(ValueError, iterparse, source, html=True, columnar=True)
+        self.assertRaises(ValueError, iterparse, source, prune=True, columnar=True)
+        self.assertRaises(ValueError, iterparse, source, checkpoints=True, columnar=True)
+
+    def test_iterparse_progress(self):
+        iterparse = self.etree.iterparse
+        xml = b'<a>' + b''.join(b'<b n="%d"/>' % i for i in range(1000)) + b'</a>'
+        reports = []
+
+        events = list(iterparse(BytesIO(xml), events=('start', 'end'), chunk_size=1000,
+                                progress=reports.append, progress_interval=4000))
+        self.assertEqual(2002, len(events))
+        # the last report is sent when the parser finishes the input
+        self.assertEqual([4000, 8000, len(xml)], [report['bytes_read'] for report in reports])
+        self.assertEqual(2002, reports[-1]['events'])
+        for report in reports:
+            self.assertGreater(report['elements'], 0)
+            self.assertEqual(2 * report['elements'] - report['depth'], report['events'])
+
+    def test_iterparse_iter_batches(self):
+        iterparse = self.etree.iterparse
+        xml = b'<a>' + b''.join(b'<b n="%d"/>' % i for i in range(1000)) + b'</a>'
+
+        iterator = iterparse(BytesIO(xml), events=('start', 'end'), chunk_size=500)
+        self.assertEqual(('start', 'a'), (lambda e: (e[0], e[1].tag))(next(iterator)))
+        batches = list(iterator.iter_batches(max_events=100))
+        self.assertTrue(all(1 <= len(batch) <= 100 for batch in batches))
+        events = [event for batch in batches for event in batch]
+        self.assertEqual(2001, len(events))
+        self.assertEqual(('start', 'b'), (events[0][0], events[0][1].tag))
+        self.assertEqual('999', events[-3][1].get('n'))
+        self.assertEqual(('end', iterator.root), events[-1])
+
+    def test_iterparse_iter_batches_prune(self):
+        iterparse = self.etree.iterparse
+        xml = b'<a>' + b''.join(b'<b n="%d"><c/></b>' % i for i in range(1000)) + b'</a>'
+
+        iterator = iterparse(BytesIO(xml), tag='b', prune=True, chunk_size=500)
+        numbers = []
+        for batch in iterator.iter_batches(max_events=10):
+            for event, element in batch:
+                self.assertEqual(1, len(element))
+                numbers.append(int(element.get('n')))
+        self.assertEqual(list(range(1000)), numbers)
+        self.assertEqual(0, len(iterator.root))
+
+    def test_iterparse_iter_batches_invalid(self):
+        iterator = self.etree.iterparse(BytesIO(b'<a/>'))
+        self.assertRaises(ValueError, next, iterator.iter_batches(0))
+
     def test_iterparse_tag_all(self):
         iterparse = self.etree.iterparse
         f = BytesIO(b'<a><b><d/></b><c/></a>')
@@ -1019,6 +1647,28 @@ class ETreeOnlyTestCase(HelperTestCase):
         self.etree.XMLParser(encoding="utf-8")
         self.etree.XMLParser(encoding="iso-8859-1")
 
+    def test_parser_encoding_aliases(self):
+        # Python names of encodings that libxml2 decodes natively
+        for encoding, expected in [("utf8", "UTF-8"), ("latin1", "ISO-8859-1"),
+                                   ("us-ascii", "ASCII"), ("utf_16_le", "UTF-16LE")]:
+            parser = self.etree.XMLParser(encoding=encoding)
+            root = self.etree.fromstring('<a>\xe4</a>'.encode(encoding, 'replace'), parser)
+            self.assertEqual('\xe4'.encode(encoding, 'replace').decode(encoding), root.text)
+            self.assertEqual(expected, root.getroottree().docinfo.encoding)
+
+        parser = self.etree.HTMLParser(encoding="latin1")
+        root = self.etree.fromstring('<p>\xe4</p>'.encode('latin1'), parser)
+        self.assertEqual('\xe4', root.findtext('.//p'))
+
+    def test_feed_parser_unicode_ascii_chunks(self):
+        parser = self.etree.XMLParser()
+        parser.feed('<root><a>' + 'x' * 100000)
+        parser.feed('\xe4</a><b>')
+        parser.feed('ascii</b></root>')
+        root = parser.close()
+        self.assertEqual('x' * 100000 + '\xe4', root[0].text)
+        self.assertEqual('ascii', root[1].text)
+
     def test_feed_parser_recover(self):
         parser = self.etree.XMLParser(recover=True)
 
@@ -1065,6 +1715,47 @@ class ETreeOnlyTestCase(HelperTestCase):
         # FIXME: would be nice to get some errors logged ...
         #self.assertTrue(len(parser.error_log) > 0, "error log is empty")
 
+    def test_feed_parser_buffer(self):
+        import array
+        parser = self.etree.XMLParser()
+
+        data = bytearray(b'<root><a>t')
+        parser.feed(data)
+        parser.feed(memoryview(b'xxext</a><b/></root>')[2:])
+        parser.feed(bytearray())
+        root = parser.close()
+
+        self.assertEqual(b'<root><a>text</a><b/></root>', self.etree.tostring(root))
+
+        parser.feed(array.array('b', b'<root>'))
+        parser.feed(array.array('b', b'</root>'))
+        self.assertEqual('root', parser.close().tag)
+
+    def test_feed_parser_buffer_invalid(self):
+        parser = self.etree.XMLParser()
+        self.assertRaises(TypeError, parser.feed, 123)
+        self.assertRaises(BufferError, parser.feed, memoryview(b'<root/>')[::2])
+
+    def test_fromstring_buffer(self):
+        import array, mmap
+        fromstring = self.etree.fromstring
+        data = b'<root><a>text</a></root>'
+
+        for buffer in (bytearray(data), memoryview(b'..' + data)[2:],
+                       array.array('b', data), memoryview(data).cast('B', (2, len(data) // 2))):
+            self.assertEqual('text', fromstring(buffer)[0].text)
+            self.assertEqual('text', self.etree.XML(buffer)[0].text)
+
+        mapping = mmap.mmap(-1, len(data))
+        try:
+            mapping.write(data)
+            self.assertEqual('text', fromstring(mapping)[0].text)
+        finally:
+            mapping.close()
+
+        self.assertRaises(self.etree.XMLSyntaxError, fromstring, bytearray())
+        self.assertRaises(TypeError, fromstring, 123)
+
     def test_elementtree_parser_target_type_error(self):
         assertEqual = self.assertEqual
         assertFalse  = self.assertFalse
@@ -1269,6 +1960,89 @@ class ETreeOnlyTestCase(HelperTestCase):
                            "end-root", "close"],
                           events)
 
+    def test_parser_target_data_coalesced(self):
+        events = []
+        class Target:
+            def data(self, data):
+                events.append("data-" + data)
+            def comment(self, text):
+                events.append("comment-" + text)
+            def close(self):
+                return "DONE"
+
+        parser = self.etree.XMLParser(target=Target())
+
+        done = self.etree.fromstring(
+            b'<root>A&amp;&#66;<![CDATA[<c>]]>\xc3\xa9<a>x</a><!--y-->z</root>', parser)
+
+        self.assertEqual("DONE", done)
+        self.assertEqual(["data-A&B<c>\xe9", "data-x", "comment-y", "data-z"],
+                          events)
+
+    def test_parser_target_data_feed(self):
+        events = []
+        class Target:
+            def data(self, data):
+                events.append(data)
+            def end(self, tag):
+                events.append("end-" + tag)
+            def close(self):
+                return "DONE"
+
+        parser = self.etree.XMLParser(target=Target())
+
+        parser.feed('<root>some text</ro')
+        self.assertEqual(["some text"], events)
+        parser.feed('ot>')
+        self.assertEqual("DONE", parser.close())
+        self.assertEqual(["some text", "end-root"], events)
+
+    def test_parser_target_base_c(self):
+        from lxml.tests._testtarget import EventCollector, TagCounter
+        self.assertTrue(issubclass(EventCollector, self.etree.ParserTargetBase))
+
+        parser = self.etree.XMLParser(target=EventCollector())
+        events = self.etree.fromstring(
+            '<root xmlns:n="urn:n" a="1"><?pi data?>A&amp;B<n:a/><!--c-->C</root>',
+            parser)
+        self.assertEqual([
+            ("start", "root", {"a": "1"}, {"n": "urn:n"}),
+            ("pi", "pi", "data"),
+            ("data", "A&B"),
+            ("start", "{urn:n}a", {}, {}),
+            ("end", "{urn:n}a"),
+            ("comment", "c"),
+            ("data", "C"),
+            ("end", "root"),
+        ], events)
+
+        parser = self.etree.XMLParser(target=TagCounter())
+        parser.feed('<root><a/>text<b><c/></b></root>')
+        self.assertEqual(4, parser.close())
+
+    def test_parser_target_base_c_exception(self):
+        from lxml.tests._testtarget import EventCollector
+        parser = self.etree.XMLParser(target=EventCollector())
+        self.assertRaises(ValueError, self.etree.fromstring,
+                          '<root><a>fail</a></root>', parser)
+
+    def test_parser_target_base_python_subclass(self):
+        events = []
+        class Target(self.etree.ParserTargetBase):
+            def start(self, tag, attrib):
+                events.append("start-" + tag)
+            def end(self, tag):
+                events.append("end-" + tag)
+            def close(self):
+                return "DONE"
+
+        parser = self.etree.XMLParser(target=Target())
+        self.assertEqual("DONE", self.etree.fromstring('<root><a/></root>', parser))
+        self.assertEqual(["start-root", "start-a", "end-a", "end-root"], events)
+
+        parser = self.etree.XMLParser(target=self.etree.ParserTargetBase())
+        self.assertEqual(None, self.etree.fromstring('<root><a/></root>', parser))
+
     def test_iterwalk_tag(self):
         iterwalk = self.etree.iterwalk
         root = self.etree.XML(b'<a><b><d/></b><c/></a>')
@@ -1518,6 +2292,57 @@ class ETreeOnlyTestCase(HelperTestCase):
              ('end', 'a')],
             tags)
 
+    def test_iterwalk_skip_tags(self):
+        iterwalk = self.etree.iterwalk
+        root = self.etree.XML(b'<a><b><c/><x/></b><x><d><x/></d></x><!--c--><d><e><x/></e></d></a>')
+
+        events = list(iterwalk(root, events=('start', 'end'), skip='b'))
+        self.assertEqual(
+            [('start', 'a'), ('start', 'b'), ('end', 'b'),
+             ('start', 'x'), ('start', 'd'), ('start', 'x'), ('end', 'x'), ('end', 'd'), ('end', 'x'),
+             ('start', 'd'), ('start', 'e'), ('start', 'x'), ('end', 'x'), ('end', 'e'), ('end', 'd'),
+             ('end', 'a')],
+            [(event, elem.tag) for event, elem in events])
+
+        events = list(iterwalk(root, events=('start', 'end'), tag='x', skip=('b', 'e')))
+        self.assertEqual(
+            [('start', 'x'), ('start', 'x'), ('end', 'x'), ('end', 'x')],
+            [(event, elem.tag) for event, elem in events])
+        self.assertEqual([root[1], root[1][0][0], root[1][0][0], root[1]],
+                         [elem for event, elem in events])
+
+        events = list(iterwalk(root, events=('end', 'comment'), skip=['x', 'e']))
+        self.assertEqual(
+            ['c', 'x', 'b', 'x', self.etree.Comment, 'e', 'd', 'a'],
+            [elem.tag for event, elem in events])
+
+    def test_iterwalk_tag_subtree(self):
+        iterwalk = self.etree.iterwalk
+        root = self.etree.XML(b'<a><b><c/><b><c/></b></b><c/></a>')
+
+        iterator = iterwalk(root[0], events=('start', 'end'), tag='b')
+        tags = []
+        for event, elem in iterator:
+            tags.append((event, elem.tag))
+            if event == 'start' and len(tags) == 2:
+                iterator.skip_subtree()
+        self.assertEqual(
+            [('start', 'b'), ('start', 'b'), ('end', 'b'), ('end', 'b')],
+            tags)
+        self.assertEqual(
+            [], list(iterwalk(root[1], events=('start', 'end'), tag='b')))
+
+    def test_iterwalk_tag_modify_tree(self):
+        iterwalk = self.etree.iterwalk
+        root = self.etree.XML(b'<a><b><c/></b><b><c/></b><d><b/></d></a>')
+
+        tags = []
+        for event, elem in iterwalk(root, tag='b'):
+            tags.append(elem.tag)
+            elem.getparent().remove(elem)
+        self.assertEqual(['b', 'b', 'b'], tags)
+        self.assertEqual(b'<a><d/></a>', self.etree.tostring(root))
+
     def test_iterwalk_ns_skip(self):
         iterwalk = self.etree.iterwalk
         root = self.etree.XML(_bytes(
@@ -4884,6 +5709,235 @@ class ETreeOnlyTestCase(HelperTestCase):
         result = tounicode(a, pretty_print=True)
         self.assertEqual(result, "<a>\n  <b/>\n  <c/>\n</a>\n")
 
+    def test_tostring_into_bytearray(self):
+        tostring_into = self.etree.tostring_into
+        root = self.etree.XML('<a>\xe9<b/>t</a>')
+
+        buffer = bytearray()
+        self.assertEqual(18, tostring_into(root, buffer))
+        self.assertEqual(b'<a>&#233;<b/>t</a>', buffer)
+
+        buffer = bytearray(b'<!-- -->' + b'x' * 50)
+        self.assertEqual(14, tostring_into(root, buffer, 8, encoding='UTF-8'))
+        self.assertEqual(b'<!-- --><a>\xc3\xa9<b/>t</a>' + b'x' * 36, buffer)
+
+        buffer = bytearray(b'1234')
+        self.assertEqual(18, tostring_into(root, buffer, 2))
+        self.assertEqual(b'12<a>&#233;<b/>t</a>', buffer)
+
+    def test_tostring_into_options(self):
+        tostring = self.etree.tostring
+        tostring_into = self.etree.tostring_into
+        tree = self.etree.ElementTree(self.etree.XML('<a><b>t</b>tail</a>'))
+        b = tree.getroot()[0]
+
+        for el, options in [
+                (tree, dict(encoding='iso-8859-1')),
+                (tree, dict(xml_declaration=True, pretty_print=True)),
+                (tree, dict(standalone=True, doctype='<!DOCTYPE a>')),
+                (b, dict(with_tail=False)),
+                (b, dict(method='html')),
+                (tree, dict(method='text', encoding='UTF-8')),
+                ]:
+            buffer = bytearray()
+            count = tostring_into(el, buffer, **options)
+            self.assertEqual(tostring(el, **options), buffer)
+            self.assertEqual(len(buffer), count)
+
+    def test_tostring_into_memoryview(self):
+        tostring_into = self.etree.tostring_into
+        root = self.etree.XML('<a><b/></a>')
+
+        data = bytearray(b'-' * 13)
+        self.assertEqual(11, tostring_into(root, memoryview(data), 1))
+        self.assertEqual(b'-<a><b/></a>-', data)
+
+        data = bytearray(b'-' * 12)
+        self.assertRaises(ValueError, tostring_into, root, memoryview(data), 3)
+        self.assertEqual(b'-' * 12, data)
+
+    def test_tostring_into_invalid(self):
+        tostring_into = self.etree.tostring_into
+        root = self.etree.XML('<a/>')
+
+        self.assertRaises(ValueError, tostring_into, root, bytearray(), -1)
+        self.assertRaises(ValueError, tostring_into, root, bytearray(b'12'), 3)
+        self.assertRaises(ValueError, tostring_into, root, bytearray(), encoding='unicode')
+        self.assertRaises(ValueError, tostring_into, root, bytearray(), method='c14n')
+        self.assertRaises(TypeError, tostring_into, root, object())
+        self.assertRaises(TypeError, tostring_into, None, bytearray())
+        self.assertRaises((TypeError, BufferError), tostring_into, root, b'1234')
+
+    def test_tostring_many(self):
+        tostring = self.etree.tostring
+        tostring_many = self.etree.tostring_many
+        elements = [self.etree.XML(f'<rec id="{i}"><v>{i}</v></rec>') for i in range(100)]
+        elements.append(self.etree.ElementTree(self.etree.XML('<tree/>')))
+        expected = [tostring(el) for el in elements]
+
+        for workers in (None, 1, 3):
+            self.assertEqual(expected, tostring_many(elements, workers=workers))
+        self.assertEqual(expected, tostring_many(iter(elements), workers=2))
+        self.assertEqual([], tostring_many([], workers=2))
+
+    def test_tostring_many_options(self):
+        tostring = self.etree.tostring
+        tostring_many = self.etree.tostring_many
+        root = self.etree.XML('<root><a>A</a><b>B</b>tail</root>')
+        elements = list(root) * 20
+
+        for options in [dict(encoding='unicode'),
+                        dict(encoding='iso-8859-1', with_tail=False),
+                        dict(method='text'),
+                        dict(method='c14n2'),
+                        dict(xml_declaration=True, pretty_print=True)]:
+            expected = [tostring(el, **options) for el in elements]
+            self.assertEqual(expected, tostring_many(elements, workers=2, **options))
+
+    def test_tostring_many_output(self):
+        tostring_many = self.etree.tostring_many
+        elements = [self.etree.XML(f'<rec>{i}</rec>') for i in range(50)]
+        expected = b'\n'.join(b'<rec>%d</rec>' % i for i in range(50))
+
+        out = BytesIO()
+        self.assertIsNone(tostring_many(elements, workers=2, output=out, separator=b'\n'))
+        self.assertEqual(expected, out.getvalue())
+
+        out = StringIO()
+        tostring_many(elements[:3], workers=2, output=out, encoding='unicode')
+        self.assertEqual('<rec>0</rec><rec>1</rec><rec>2</rec>', out.getvalue())
+
+        with tmpfile() as filename:
+            tostring_many(elements, workers=2, output=filename, separator=b'\n')
+            self.assertEqual(expected, read_file(filename, 'rb'))
+
+    def test_tostring_many_invalid(self):
+        tostring_many = self.etree.tostring_many
+        elements = [self.etree.XML('<a/>')] * 40 + [None, self.etree.XML('<b/>')]
+
+        self.assertRaises(ValueError, tostring_many, elements, workers=0)
+        self.assertRaises(TypeError, tostring_many, elements, workers=2)
+        self.assertRaises(LookupError, tostring_many, elements[:1], encoding='no-such-encoding')
+
+        out = BytesIO()
+        self.assertRaises(TypeError, tostring_many, elements, workers=2, output=out)
+        self.assertEqual(b'<a/>' * 40, out.getvalue())
+
+    def test_serialization_cache(self):
+        tostring = self.etree.tostring
+        root = self.etree.XML(
+            '<root xmlns="urn:x" xmlns:y="urn:y"><part y:a="1&amp;2">'
+            '<item>1</item><y:item>2</y:item></part><part><item>3</item></part>tail</root>')
+        expected = tostring(root)
+        cache = self.etree.SerializationCache(root)
+        cache.add(root[0])
+        cache.add(root[1][0])
+        self.assertEqual(2, len(cache))
+        self.assertIn(root[0], cache)
+        self.assertNotIn(root[1], cache)
+
+        self.assertEqual(expected, tostring(root))
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+        self.assertEqual(expected, tostring(root))
+        self.assertEqual((2, 2), (cache.hits, cache.misses))
+        self.assertEqual(tostring(root, encoding='iso-8859-1'),
+                         tostring(root, encoding='iso-8859-1'))
+        self.assertEqual(tostring(root[1]), tostring(root[1]))
+
+        cache.detach()
+        self.assertEqual(tostring(root, encoding='iso-8859-1'), expected.replace(
+            b'<root', b"<?xml version='1.0' encoding='iso-8859-1'?>\n<root"))
+
+    def test_serialization_cache_invalidation(self):
+        tostring = self.etree.tostring
+        root = self.etree.XML('<root><a><b>B</b></a><c/></root>')
+        cache = self.etree.SerializationCache(root)
+        a, b, c = root[0], root[0][0], root[1]
+        cache.add(a)
+        cache.add(c)
+        tostring(root)
+
+        b.text = 'changed'
+        self.assertEqual(b'<root><a><b>changed</b></a><c/></root>', tostring(root))
+        b.set('attr', 'value')
+        self.assertEqual(b'<root><a><b attr="value">changed</b></a><c/></root>', tostring(root))
+        b.tail = 'tail'
+        self.assertEqual(b'<root><a><b attr="value">changed</b>tail</a><c/></root>', tostring(root))
+        c.append(b)
+        self.assertEqual(b'<root><a/><c><b attr="value">changed</b>tail</c></root>', tostring(root))
+        a.tag = 'A'
+        self.assertEqual(b'<root><A/><c><b attr="value">changed</b>tail</c></root>', tostring(root))
+
+        hits = cache.hits
+        self.assertEqual(tostring(root), tostring(root))
+        self.assertEqual(hits + 4, cache.hits)
+        cache.invalidate()
+        misses = cache.misses
+        tostring(root)
+        self.assertEqual(misses + 2, cache.misses)
+
+    def test_serialization_cache_invalid(self):
+        SerializationCache = self.etree.SerializationCache
+        root = self.etree.XML('<root><a/><!--comment--></root>')
+        cache = SerializationCache(root)
+        self.assertRaises(ValueError, SerializationCache, root)
+        self.assertRaises(ValueError, cache.add, self.etree.Element('other'))
+        self.assertRaises(TypeError, cache.add, root[1])
+
+        cache.detach()
+        self.assertRaises(ValueError, cache.add, root[0])
+        SerializationCache(root).add(root[0])
+
+    def test_iter_tostring(self):
+        tostring = self.etree.tostring
+        iter_tostring = self.etree.iter_tostring
+        root = self.etree.XML(
+            '<root xmlns="urn:x" xmlns:y="urn:y"><?pi?><a y:attr="1&amp;2">text<b>\xe4</b>tail</a>'
+            '<!--comment--><y:c><d/>' + '<e>x</e>' * 200 + '</y:c>tail</root>')
+        for element in [root, root[1], root[3], root[3][0]]:
+            for options in [dict(),
+                            dict(encoding='iso-8859-1', with_tail=False),
+                            dict(encoding='UTF-16'),
+                            dict(doctype='<!DOCTYPE root>', standalone=True),
+                            dict(pretty_print=True),
+                            dict(method='html')]:
+                expected = tostring(element, **options)
+                for chunk_size in [1, 7, 1000, 1 << 20]:
+                    chunks = list(iter_tostring(element, chunk_size, **options))
+                    self.assertEqual(expected, b''.join(chunks))
+                    self.assertTrue(all(len(chunk) == chunk_size for chunk in chunks[:-1]))
+                    self.assertTrue(0 < len(chunks[-1]) <= chunk_size)
+
+    def test_iter_tostring_tree(self):
+        tostring = self.etree.tostring
+        iter_tostring = self.etree.iter_tostring
+        tree = self.etree.ElementTree(self.etree.XML(
+            '<!DOCTYPE root [<!ENTITY e "entity">]><!--before--><root>&e;<a/></root><?after?>'))
+        self.assertEqual(tostring(tree), b''.join(iter_tostring(tree, 5)))
+        self.assertEqual(tostring(tree, method='text', encoding='UTF-8'),
+                         b''.join(iter_tostring(tree, 5, method='text', encoding='UTF-8')))
+
+    def test_iter_tostring_modified(self):
+        iter_tostring = self.etree.iter_tostring
+        root = self.etree.XML('<root><a><b>%s</b><c/></a><d/></root>' % ('x' * 5000))
+        chunks = iter_tostring(root, 10)
+        self.assertEqual(b'<root><a><', next(chunks))
+        root.remove(root[0])
+        self.assertRaises(RuntimeError, list, chunks)
+
+        chunks = iter_tostring(root, 10)
+        next(chunks)
+        chunks.close()
+
+    def test_iter_tostring_invalid(self):
+        iter_tostring = self.etree.iter_tostring
+        root = self.etree.XML('<root/>')
+        self.assertRaises(ValueError, iter_tostring, root, 0)
+        self.assertRaises(ValueError, iter_tostring, root, encoding='unicode')
+        self.assertRaises(ValueError, iter_tostring, root, method='c14n')
+        self.assertRaises(TypeError, iter_tostring, None)
+        self.assertRaises(LookupError, list, iter_tostring(root, encoding='no-such-encoding'))
+
     def test_tostring_unicode(self):
         tostring = self.etree.tostring
         Element = self.etree.Element
@@ -5474,6 +6528,70 @@ class ETreeC14NTestCase(HelperTestCase):
         self.assertEqual(b'<a><b></b></a>',
                           s)
 
+    def test_c14n2_element_inherited_namespaces(self):
+        tree = self.parse(b'<r xmlns:a="urn:a" xmlns:b="urn:b"><a:x b:y="1"><a:z/></a:x></r>')
+        self.assertEqual(
+            '<a:x xmlns:a="urn:a" xmlns:b="urn:b" b:y="1"><a:z></a:z></a:x>',
+            etree.canonicalize(tree.getroot()[0]))
+
+    def test_c14n2_sibling_namespace_scope(self):
+        xml = '<r xmlns:a="urn:a"><x xmlns:b="urn:a"></x><a:y></a:y></r>'
+        expected = '<r><x></x><a:y xmlns:a="urn:a"></a:y></r>'
+        self.assertEqual(expected, etree.canonicalize(xml))
+        self.assertEqual(expected, etree.canonicalize(etree.XML(xml)))
+
+        out = []
+        parser = etree.XMLParser(target=etree.C14NWriterTarget(out.append))
+        etree.XML(xml, parser)
+        self.assertEqual(expected, ''.join(out))
+
+    def test_c14n2_qname_aware_tag_without_text(self):
+        xml = '<a><b/><c xmlns:p="urn:p">p:x</c><!--x--></a>'
+        expected = '<a><b></b><c xmlns:p="urn:p">p:x</c><!--x--></a>'
+        options = dict(qname_aware_tags=['a', 'b', 'c'], with_comments=True)
+        self.assertEqual(expected, etree.canonicalize(xml, **options))
+        self.assertEqual(expected, etree.canonicalize(etree.XML(xml), **options))
+
+        out = []
+        parser = etree.XMLParser(target=etree.C14NWriterTarget(out.append, **options))
+        etree.XML(xml, parser)
+        self.assertEqual(expected, ''.join(out))
+
+    def test_c14n2_out(self):
+        xml = '<a>' + '<b x="&amp;">\xe9</b>' * 10000 + '</a>'
+        out = []
+        class Writer:
+            def write(self, data):
+                out.append(data)
+        self.assertEqual(None, etree.canonicalize(xml, out=Writer()))
+        self.assertTrue(len(out) > 1)
+        self.assertEqual(etree.canonicalize(xml), ''.join(out))
+
+    def test_c14n2_from_file(self):
+        xml = ('<!--pre--><?pi data?><r xmlns:p="urn:p">t0<a p:x="1">t1<!--c-->t2<b/>'
+               'tail<p:c>in</p:c></a>t3<![CDATA[cd]]><e/>\n</r><!--post-->')
+        for options in [{}, dict(with_comments=True), dict(strip_text=True),
+                        dict(exclude_tags=['a']), dict(rewrite_prefixes=True)]:
+            self.assertEqual(etree.canonicalize(xml, **options),
+                             etree.canonicalize(from_file=BytesIO(xml.encode('utf8')), **options))
+
+    def test_c14n2_from_file_streaming(self):
+        xml = b'<a>' + b'<b x="1">text<c/>tail</b>\n' * 100000 + b'</a>'
+        source = BytesIO(xml)
+        positions = []
+        class Writer:
+            def write(self, data):
+                positions.append((source.tell(), len(data)))
+        etree.canonicalize(from_file=source, out=Writer())
+        self.assertEqual(len(xml) + 100000 * 3, sum(length for _, length in positions))
+        # the output is written while the input is still being read
+        self.assertLess(positions[0][0], len(xml) // 2)
+
+    def test_c14n2_unresolved_entity(self):
+        parser = etree.XMLParser(resolve_entities=False)
+        root = etree.XML('<!DOCTYPE a [<!ENTITY e "x">]><a>&e;</a>', parser)
+        self.assertRaises(etree.C14NError, etree.canonicalize, root)
+
     def test_c14n_element_tostring_with_comments(self):
         tree = self.parse(b'<!--hi--><a><!--ho--><b/></a><!--hu-->')
         s = etree.tostring(tree.getroot(), method='c14n')
@@ -5900,6 +7018,173 @@ class XMLPullParserTest(unittest.TestCase):
         root = parser.close()
         self.assertEqual('root-huhu', root.tag)
 
+    def test_pull_read_events_batch(self):
+        parser = self.etree.XMLPullParser(['start', 'end'])
+        self.assertEqual([], parser.read_events_batch())
+
+        parser.feed('<root><element>')
+        self.assert_event_tags(
+            parser.read_events_batch(), [('start', 'root'), ('start', 'element')])
+        self.assertEqual([], parser.read_events_batch())
+
+        parser.feed('</element><child/></root>')
+        self.assert_event_tags(
+            parser.read_events_batch(max_events=2), [('end', 'element'), ('start', 'child')])
+        self.assert_event_tags(
+            parser.read_events(), [('end', 'child'), ('end', 'root')])
+        self.assertRaises(ValueError, parser.read_events_batch, 0)
+
+    def test_pull_read_events_batch_backlog(self):
+        parser = self.etree.XMLPullParser()
+        parser.feed('<root>' + ''.join('<a id="%d"/>' % i for i in range(5000)))
+        ids = []
+        events = parser.read_events()
+        while True:
+            batch = parser.read_events_batch(max_events=7)
+            if not batch:
+                break
+            ids.extend(el.get('id') for _, el in batch)
+            # mix with the iterator interface
+            for _, el in events:
+                ids.append(el.get('id'))
+                break
+        self.assertEqual([str(i) for i in range(5000)], ids)
+        parser.feed('</root>')
+        self.assertEqual(['root'], [el.tag for _, el in parser.read_events_batch()])
+        parser.close()
+
+    def test_pull_checkpoint_resume(self):
+        xml = b'<root xmlns="urn:d"><a>1</a><a>2</a><a>3</a></root>'
+        parser = self.etree.XMLPullParser(checkpoints=True)
+        parser.feed(xml[:25])
+        self.assertIsNone(parser.checkpoint())
+        parser.feed(xml[25:35])
+        self.assert_event_tags(parser.read_events(), [('end', '{urn:d}a')])
+        checkpoint = parser.checkpoint()
+        self.assertEqual(28, checkpoint['offset'])
+
+        parser = self.etree.XMLPullParser(resume=checkpoint)
+        parser.feed(xml[checkpoint['offset']:])
+        self.assert_event_tags(
+            parser.read_events(), [('end', '{urn:d}a'), ('end', '{urn:d}a'), ('end', '{urn:d}root')])
+        root = parser.close()
+        self.assertEqual(['2', '3'], [child.text for child in root])
+
+    def test_pull_reset(self):
+        parser = self.etree.XMLPullParser(['start', 'end'])
+        parser.feed('<root><a>')
+        self.assert_event_tags(parser.read_events(), [('start', 'root'), ('start', 'a')])
+        parser.feed('</a><b>')
+        parser.reset()
+        self.assertEqual([], list(parser.read_events()))
+
+        parser.feed('<doc><c/></doc>')
+        self.assert_event_tags(
+            parser.read_events(),
+            [('start', 'doc'), ('start', 'c'), ('end', 'c'), ('end', 'doc')])
+        root = parser.close()
+        self.assertEqual('doc', root.tag)
+
+        # the parser is reusable after close()
+        parser.feed('<other/>')
+        self.assertEqual('other', parser.close().tag)
+
+    def test_pull_split_documents(self):
+        xml = (b'<?xml version="1.0"?>\n<msg id="1"><a>x</a></msg>\n'
+               b'<m:msg xmlns:m="urn:m" id="2"/>'
+               b'<?xml version="1.0"?>\n<msg id="3"/>\n\n')
+        for chunk_size in (1, 7, len(xml)):
+            parser = self.etree.XMLPullParser(split_documents=True)
+            roots = []
+            for i in range(0, len(xml), chunk_size):
+                parser.feed(xml[i:i+chunk_size])
+                roots.extend(el for _, el in parser.read_events() if el.getparent() is None)
+            self.assertIsNone(parser.close())
+            self.assertEqual(['msg', '{urn:m}msg', 'msg'], [root.tag for root in roots])
+            self.assertEqual(['1', '2', '3'], [root.get('id') for root in roots])
+            self.assertEqual('x', roots[0].findtext('a'))
+            self.assertIsNot(roots[0].getroottree(), roots[1].getroottree())
+
+    def test_pull_split_documents_unicode(self):
+        xml = ('<?xml version="1.0" encoding="latin-1"?><a>\xe4</a>'
+               '<?xml version="1.0" encoding="latin-1"?><b>\xf6</b>')
+        parser = self.etree.XMLPullParser(split_documents=True)
+        parser.feed(xml)
+        self.assertIsNone(parser.close())
+        self.assertEqual(['\xe4', '\xf6'], [el.text for _, el in parser.read_events()])
+
+    def test_pull_split_documents_unfinished(self):
+        parser = self.etree.XMLPullParser(split_documents=True)
+        parser.feed('<a>1</a> <b>2</b> <c>')
+        self.assertEqual(['a', 'b'], [el.tag for _, el in parser.read_events()])
+        self.assertRaises(self.etree.XMLSyntaxError, parser.close)
+
+        parser.feed('<d/>')
+        self.assertIsNone(parser.close())
+        self.assertEqual(['d'], [el.tag for _, el in parser.read_events()])
+
+        parser.feed('<e/> <f>')
+        self.assertEqual(['e'], [el.tag for _, el in parser.read_events()])
+        parser.feed('</f>')
+        self.assertIsNone(parser.close())
+        self.assertEqual(['f'], [el.tag for _, el in parser.read_events()])
+
+        self.assertRaises(ValueError, self.etree.XMLPullParser,
+                          split_documents=True, target=self.etree.TreeBuilder())
+
+    def test_pull_aread_events(self):
+        async def chunks(data):
+            for i in range(0, len(data), 4):
+                yield data[i:i+4]
+
+        async def read_all(parser, data):
+            return [event async for event in parser.aread_events(chunks(data))]
+
+        parser = self.etree.XMLPullParser(['start', 'end'])
+        events = asyncio.run(read_all(parser, b'<root><a/><b>text</b></root>'))
+        self.assert_event_tags(events, [
+            ('start', 'root'), ('start', 'a'), ('end', 'a'),
+            ('start', 'b'), ('end', 'b'), ('end', 'root')])
+        self.assertEqual('text', events[-2][1].text)
+
+        parser = self.etree.HTMLPullParser()
+        events = asyncio.run(read_all(parser, b'<p>some<br>text</p>'))
+        self.assert_event_tags(events, [
+            ('end', 'br'), ('end', 'p'), ('end', 'body'), ('end', 'html')])
+
+    def test_pull_aread_events_error(self):
+        async def chunks():
+            yield b'<root><a>'
+            yield b'</b></root>'
+
+        async def read_all(parser):
+            return [event async for event in parser.aread_events(chunks())]
+
+        parser = self.etree.XMLPullParser()
+        self.assertRaises(self.etree.XMLSyntaxError, asyncio.run, read_all(parser))
+
+    def test_pull_aread_events_abandoned(self):
+        async def chunks():
+            yield b'<root><a/>'
+            yield b'<b/>'
+            yield b'</root>'
+
+        async def read_first(parser):
+            events = parser.aread_events(chunks())
+            async for event in events:
+                break
+            await events.aclose()
+            return event
+
+        parser = self.etree.XMLPullParser(['start'])
+        event = asyncio.run(read_first(parser))
+        self.assertEqual(('start', 'root'), (event[0], event[1].tag))
+        # pending events and the unfinished document were discarded
+        self.assertEqual([], list(parser.read_events()))
+        parser.feed(b'<x/>')
+        self.assertEqual('x', parser.close().tag)
+        self.assert_event_tags(parser.read_events(), [('start', 'x')])
+
 
 def test_suite():
     suite = unittest.TestSuite()
@@ -374,6 +374,251 @@ class ETreeIOTestCase(_IOTestCaseBase):
                 output = tostring(root)
                 self.assertEqual(output, data)
 
+    def test_parse_mmap_filename(self):
+        parse = self.etree.parse
+        tostring = self.etree.tostring
+
+        data = b'<a>' + b'<b>text</b>' * 200 + b'</a>'
+        filename = self.getTestFilePath('mapped.xml')
+        write_to_file(filename, data, 'wb')
+
+        tree = parse(filename, mmap=True)
+        self.assertEqual(data, tostring(tree))
+        self.assertTrue(tree.docinfo.URL.endswith('mapped.xml'))
+
+        tree = parse(pathlib.Path(filename), mmap=True)
+        self.assertEqual(data, tostring(tree))
+
+    def test_parse_mmap_fileobject(self):
+        parse = self.etree.parse
+        tostring = self.etree.tostring
+
+        data = b'<a><b/><c>&#228;</c></a>'
+        filename = self.getTestFilePath('mapped.xml')
+        write_to_file(filename, data, 'wb')
+
+        with open(filename, 'rb') as f:
+            tree = parse(f, mmap=True, base_url='http://example.com/doc.xml')
+            self.assertFalse(f.closed)
+        self.assertEqual(data, tostring(tree))
+        self.assertEqual('http://example.com/doc.xml', tree.docinfo.URL)
+
+    def test_parse_mmap_fileobject_position(self):
+        parse = self.etree.parse
+        tostring = self.etree.tostring
+
+        data = b'<a><b/><c>&#228;</c></a>'
+        for skip in (3, 5000):
+            filename = self.getTestFilePath('mapped.xml')
+            write_to_file(filename, b'x' * skip + data, 'wb')
+            with open(filename, 'rb') as f:
+                f.read(skip)
+                tree = parse(f, mmap=True)
+                self.assertEqual(skip + len(data), f.tell())
+            self.assertEqual(data, tostring(tree))
+
+    def test_parse_mmap_slices(self):
+        # mapped files are pushed in slices when they are larger than the libxml2
+        # memory parser can handle or when the parser reports its progress
+        parse = self.etree.parse
+        tostring = self.etree.tostring
+
+        def slicing_parser(**kwargs):
+            return self.etree.XMLParser(
+                progress=reports.append, progress_interval=7, **kwargs)
+
+        reports = []
+        data = b'<a>' + b'<b>t\xc3\xa4xt</b>' * 200 + b'</a>'
+        filename = self.getTestFilePath('mapped.xml')
+        write_to_file(filename, data, 'wb')
+
+        tree = parse(filename, slicing_parser(collect_stats=True), mmap=True)
+        self.assertEqual(data.replace(b'\xc3\xa4', b'&#228;'), tostring(tree))
+        self.assertEqual(len(data), tree.docinfo.parse_stats['bytes_read'])
+        self.assertEqual(len(data) // 7 + 1, len(reports))
+
+        write_to_file(filename, b'x' * 5 + data, 'wb')
+        with open(filename, 'rb') as f:
+            f.read(5)
+            tree = parse(f, slicing_parser(), mmap=True)
+            self.assertEqual(len(data) + 5, f.tell())
+        self.assertEqual(data.replace(b'\xc3\xa4', b'&#228;'), tostring(tree))
+
+        write_to_file(filename, b'<a><b></a>', 'wb')
+        self.assertRaises(self.etree.XMLSyntaxError, parse, filename, slicing_parser(), mmap=True)
+
+    def test_parse_mmap_parser(self):
+        parse = self.etree.parse
+        tostring = self.etree.tostring
+
+        filename = self.getTestFilePath('mapped.html')
+        write_to_file(filename, b'<html><body><p>text', 'wb')
+
+        tree = parse(filename, self.etree.HTMLParser(), mmap=True)
+        self.assertEqual(b'<html><body><p>text</p></body></html>',
+                         tostring(tree.getroot()))
+
+    def test_parse_mmap_parser_option(self):
+        # mapped files are pushed in slices of the progress interval
+        parse = self.etree.parse
+        reports = []
+        parser = self.etree.XMLParser(
+            mmap=True, progress=reports.append, progress_interval=10)
+        data = b'<a>' + b'<b>text</b>' * 3 + b'</a>'
+        filename = self.getTestFilePath('mapped.xml')
+        write_to_file(filename, data, 'wb')
+
+        tree = parse(filename, parser)
+        self.assertEqual(data, self.etree.tostring(tree))
+        self.assertEqual([10, 20, 30, len(data)], [report['bytes_read'] for report in reports])
+
+        del reports[:]
+        tree = self.etree.ElementTree()
+        tree.parse(filename, parser)
+        self.assertEqual([10, 20, 30, len(data)], [report['bytes_read'] for report in reports])
+
+        del reports[:]
+        with open(filename, 'rb') as f:
+            tree = parse(f, parser)
+        self.assertEqual(data, self.etree.tostring(tree))
+        self.assertEqual([10, 20, 30, len(data)], [report['bytes_read'] for report in reports])
+
+        # other input is read as usual
+        tree = parse(BytesIO(data), parser)
+        self.assertEqual(data, self.etree.tostring(tree))
+        tree = parse(SillyFileLike(data), parser)
+        self.assertEqual(data, self.etree.tostring(tree))
+
+        # the option of parse() takes precedence
+        tree = parse(filename, parser, mmap=False)
+        self.assertEqual(data, self.etree.tostring(tree))
+        self.assertRaises(TypeError, parse, BytesIO(data), parser, mmap=True)
+
+        del reports[:]
+        parser = self.etree.HTMLParser(
+            mmap=True, progress=reports.append, progress_interval=10)
+        tree = parse(filename, parser)
+        self.assertEqual(3, len(tree.findall('//b')))
+        self.assertEqual([10, 20, 30, len(data)], [report['bytes_read'] for report in reports])
+
+    def test_parse_mmap_error(self):
+        parse = self.etree.parse
+        filename = self.getTestFilePath('broken.xml')
+        write_to_file(filename, b'<a><b></a>', 'wb')
+        self.assertRaises(self.etree.XMLSyntaxError, parse, filename, mmap=True)
+
+        filename = self.getTestFilePath('empty.xml')
+        write_to_file(filename, b'', 'wb')
+        self.assertRaises(self.etree.XMLSyntaxError, parse, filename, mmap=True)
+
+        self.assertRaises(TypeError, parse, BytesIO(b'<a/>'), mmap=True)
+
+    def test_parse_compressed(self):
+        import bz2, lzma
+        parse = self.etree.parse
+        xml = b'<root>' + b'<a>text</a>' * 1000 + b'</root>'
+        for compression, compress in [('gzip', gzip.compress),
+                                      ('bz2', bz2.compress),
+                                      ('xz', lzma.compress)]:
+            for format in (compression, 'auto'):
+                tree = parse(BytesIO(compress(xml)), compression=format)
+                self.assertEqual(1000, len(tree.getroot()))
+
+    def test_parse_compressed_filename(self):
+        parse = self.etree.parse
+        filename = self.getTestFilePath('test.xml.gz')
+        write_to_file(filename, gzip.compress(b'<a><b/></a>'), 'wb')
+        tree = parse(filename, compression='auto')
+        self.assertEqual(b'<a><b/></a>', self.etree.tostring(tree))
+        self.assertEqual(filename, tree.docinfo.URL)
+
+    def test_parse_compressed_auto_uncompressed(self):
+        parse = self.etree.parse
+        tree = parse(BytesIO(b'<a><b/></a>'), compression='auto')
+        self.assertEqual(b'<a><b/></a>', self.etree.tostring(tree))
+
+    def test_parse_compressed_empty(self):
+        parse = self.etree.parse
+        XMLSyntaxError = self.etree.XMLSyntaxError
+        for data, compression in [(gzip.compress(b''), 'gzip'), (b'', 'auto')]:
+            with self.assertRaises(XMLSyntaxError) as cm:
+                parse(BytesIO(data), compression=compression)
+            self.assertIn("Document is empty", str(cm.exception))
+
+        # uncompressed empty input gives the same error
+        with self.assertRaises(XMLSyntaxError) as cm:
+            parse(BytesIO(b''))
+        self.assertIn("Document is empty", str(cm.exception))
+
+    def test_parse_compressed_multiple_streams(self):
+        parse = self.etree.parse
+        data = gzip.compress(b'<a><b/>') + gzip.compress(b'<c/></a>')
+        tree = parse(BytesIO(data), compression='gzip')
+        self.assertEqual(b'<a><b/><c/></a>', self.etree.tostring(tree))
+
+    def test_parse_compressed_limits_chunk_size(self):
+        import bz2, lzma, tracemalloc
+        # highly compressible input must not inflate into a single huge chunk
+        xml = b'<root>' + (b'<!--' + b' ' * 2**16 + b'-->') * 2**8 + b'<a/></root>'
+        parser = self.etree.XMLParser(remove_comments=True)
+        is_tracing = tracemalloc.is_tracing()
+        if not is_tracing:
+            tracemalloc.start()
+        try:
+            for compress in (gzip.compress, bz2.compress, lambda data: lzma.compress(data, preset=1)):
+                data = compress(xml)
+                start = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                tree = self.etree.parse(BytesIO(data), parser, compression='auto')
+                pull_parser = self.etree.XMLPullParser(compression='auto', remove_comments=True)
+                pull_parser.feed(data)
+                pull_root = pull_parser.close()
+                peak = tracemalloc.get_traced_memory()[1] - start
+                self.assertEqual(['a'], [el.tag for el in tree.getroot()])
+                self.assertEqual(['a'], [el.tag for el in pull_root])
+                self.assertLess(peak, 2**22)
+        finally:
+            if not is_tracing:
+                tracemalloc.stop()
+
+    def test_parse_compressed_zstd(self):
+        try:
+            from compression import zstd
+            compress = zstd.compress
+        except ImportError:
+            try:
+                import zstandard
+            except ImportError:
+                raise unittest.SkipTest("zstd is not available")
+            compress = zstandard.ZstdCompressor().compress
+        tree = self.etree.parse(BytesIO(compress(b'<a><b/></a>')), compression='auto')
+        self.assertEqual(b'<a><b/></a>', self.etree.tostring(tree))
+
+    def test_parse_compressed_invalid(self):
+        parse = self.etree.parse
+        self.assertRaises(ValueError, parse, BytesIO(b'<a/>'), compression='rar')
+        self.assertRaises(ValueError, parse, BytesIO(b'<a/>'), compression='gzip', mmap=True)
+        self.assertRaises(self.etree.XMLSyntaxError,
+                          parse, BytesIO(gzip.compress(b'<a><b></a>')), compression='gzip')
+
+    def test_iterparse_compressed(self):
+        import lzma
+        xml = b'<root>' + b'<a>text</a>' * 1000 + b'</root>'
+        events = list(self.etree.iterparse(BytesIO(lzma.compress(xml)), compression='auto'))
+        self.assertEqual(1001, len(events))
+        self.assertEqual('root', events[-1][1].tag)
+
+    def test_pull_parser_compressed(self):
+        import bz2
+        data = bz2.compress(b'<root><a/><b/></root>')
+        parser = self.etree.XMLPullParser(compression='auto')
+        for i in range(len(data)):
+            parser.feed(data[i:i+1])
+        self.assertEqual(['a', 'b', 'root'],
+                         [el.tag for _, el in parser.read_events()])
+        root = parser.close()
+        self.assertEqual('root', root.tag)
+
     def test_write_compressed_text(self):
         Element = self.etree.Element
         SubElement = self.etree.SubElement
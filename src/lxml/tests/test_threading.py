@@ -3,13 +3,18 @@ Tests for thread usage in lxml.etree.
 """
 
 
+import asyncio
+import gc
 import re
 import sys
+import time
 import unittest
 import threading
 from queue import Queue, Empty
 
-from .common_imports import etree, HelperTestCase, BytesIO, IS_FT_PYTHON, IS_PYPY
+from .common_imports import (
+    etree, HelperTestCase, BytesIO, IS_FT_PYTHON, IS_PYPY, fileInTestDir, tmpfile, write_to_file,
+)
 
 
 class ThreadingTestCase(HelperTestCase):
@@ -92,6 +97,350 @@ class ThreadingTestCase(HelperTestCase):
         self.assertEqual(len(root), 15)
         self.assertListEqual(['node'] * 15, [child.tag for child in root])
 
+    def test_parse_many(self):
+        sources = [BytesIO(b'<root><a>%d</a></root>' % i) for i in range(50)]
+        trees = list(self.etree.parse_many(sources, workers=4))
+        self.assertEqual(50, len(trees))
+        self.assertEqual([str(i) for i in range(50)],
+                         [tree.getroot()[0].text for tree in trees])
+
+    def test_parse_many_files(self):
+        filenames = [fileInTestDir('test.xml')] * 10
+        expected = self.etree.tostring(self.etree.parse(filenames[0]))
+        for tree in self.etree.parse_many(filenames, workers=3):
+            self.assertEqual(expected, self.etree.tostring(tree))
+
+    def test_parse_many_unordered(self):
+        sources = [BytesIO(b'<root>%d</root>' % i) for i in range(50)]
+        texts = [tree.getroot().text
+                 for tree in self.etree.parse_many(sources, workers=4, ordered=False)]
+        self.assertEqual(sorted(str(i) for i in range(50)), sorted(texts))
+
+    def test_parse_many_parser(self):
+        parser = self.etree.XMLParser(remove_blank_text=True)
+        sources = [BytesIO(b'<root> <a/> </root>') for _ in range(10)]
+        for tree in self.etree.parse_many(sources, parser, workers=2):
+            self.assertEqual(b'<root><a/></root>', self.etree.tostring(tree))
+            self.assertIsInstance(tree.parser, self.etree.XMLParser)
+            self.assertIsNot(parser, tree.parser)
+
+    def test_parse_many_error(self):
+        sources = [BytesIO(b'<root/>'), BytesIO(b'<root>'), BytesIO(b'<root/>')]
+        trees = self.etree.parse_many(sources, workers=2)
+        self.assertEqual('root', next(trees).getroot().tag)
+        self.assertRaises(self.etree.XMLSyntaxError, next, trees)
+        self.assertEqual('root', next(trees).getroot().tag)
+        self.assertRaises(StopIteration, next, trees)
+
+    def test_parse_many_close(self):
+        sources = [BytesIO(b'<root>%d</root>' % i) for i in range(50)]
+        with self.etree.parse_many(sources, workers=2) as trees:
+            self.assertEqual('0', next(trees).getroot().text)
+        self.assertRaises(StopIteration, next, trees)
+
+        trees = self.etree.parse_many(iter(sources), workers=2)
+        next(trees)
+        trees.close()
+        self.assertRaises(StopIteration, next, trees)
+        trees.close()
+
+    def test_parse_many_collect_cycle(self):
+        def sources(holder):
+            for i in range(50):
+                yield BytesIO(b'<root>%d</root>' % i)
+
+        unraisable = []
+        orig_hook = sys.unraisablehook
+        sys.unraisablehook = unraisable.append
+        try:
+            holder = []
+            trees = self.etree.parse_many(sources(holder), workers=2)
+            holder.append(trees)  # reference cycle through the sources
+            self.assertEqual('0', next(trees).getroot().text)
+            del trees, holder
+            gc.collect()
+        finally:
+            sys.unraisablehook = orig_hook
+        self.assertEqual([], unraisable)
+
+    def test_parse_many_invalid_arguments(self):
+        self.assertRaises(ValueError, self.etree.parse_many, [], workers=0)
+        parser = self.etree.XMLParser(target=self.etree.TreeBuilder())
+        self.assertRaises(ValueError, self.etree.parse_many, [], parser)
+
+    def _records_xml(self, count):
+        return (
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            b'<!DOCTYPE root [<!ENTITY e "entity">]>\n'
+            b'<root xmlns:p="urn:p" a="&gt;">' +
+            b''.join(b'\n  <p:record n="%d"><p:v>&e;</p:v></p:record>' % i for i in range(count)) +
+            b'\n  <other/>\n</root>\n'
+        )
+
+    def test_iterparse_parallel(self):
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, self._records_xml(500), 'wb')
+            records = list(self.etree.iterparse_parallel(
+                filename, 'p:record', workers=3, shard_size=1000))
+        self.assertEqual([str(i) for i in range(500)], [r.get('n') for r in records])
+        for record in records[::50]:
+            self.assertEqual('{urn:p}record', record.tag)
+            self.assertEqual('entity', record[0].text)
+            self.assertEqual('root', record.getparent().tag)
+            self.assertEqual('>', record.getparent().get('a'))
+
+    def test_iterparse_parallel_unordered(self):
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, self._records_xml(500), 'wb')
+            with open(filename, 'rb') as f:
+                numbers = [int(r.get('n')) for r in self.etree.iterparse_parallel(
+                    f, 'p:record', workers=3, shard_size=1000, ordered=False)]
+        self.assertEqual(list(range(500)), sorted(numbers))
+
+    def test_iterparse_parallel_close(self):
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, self._records_xml(500), 'wb')
+            with self.etree.iterparse_parallel(
+                    filename, 'p:record', workers=3, shard_size=1000) as records:
+                self.assertEqual('0', next(records).get('n'))
+            self.assertRaises(StopIteration, next, records)
+
+    def test_iterparse_parallel_tag_name(self):
+        xml = b'<root xmlns:p="urn:p"><recordx/><record/><record>1</record><p:record/><other/></root>'
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, xml, 'wb')
+            records = list(self.etree.iterparse_parallel(filename, 'record', shard_size=1))
+            self.assertEqual([None, '1'], [r.text for r in records])
+            records = list(self.etree.iterparse_parallel(filename, 'p:record', shard_size=1))
+            self.assertEqual(['{urn:p}record'], [r.tag for r in records])
+
+    def test_iterparse_parallel_one_piece(self):
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, '<root><record/><record>1</record></root>'.encode('utf-16'), 'wb')
+            records = list(self.etree.iterparse_parallel(filename, 'record', shard_size=1))
+            self.assertEqual([None, '1'], [r.text for r in records])
+
+            write_to_file(filename, b'<record/>', 'wb')
+            self.assertEqual([], list(self.etree.iterparse_parallel(filename, 'record')))
+
+    def test_iterparse_parallel_error(self):
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, b'<root><record/><record><a></record><record/></root>', 'wb')
+            records = self.etree.iterparse_parallel(filename, 'record', shard_size=1)
+            self.assertEqual('record', next(records).tag)
+            self.assertRaises(self.etree.XMLSyntaxError, next, records)
+            self.assertEqual(["record"], [r.tag for r in records])
+
+        with tmpfile(suffix='.xml') as filename:
+            write_to_file(filename, b'', 'wb')
+            records = self.etree.iterparse_parallel(filename, 'record')
+            self.assertRaises(self.etree.XMLSyntaxError, next, records)
+
+    def test_iterparse_parallel_invalid_arguments(self):
+        iterparse_parallel = self.etree.iterparse_parallel
+        filename = fileInTestDir('test.xml')
+        self.assertRaises(ValueError, iterparse_parallel, filename, 'a', workers=0)
+        self.assertRaises(ValueError, iterparse_parallel, filename, 'a', shard_size=0)
+        self.assertRaises(ValueError, iterparse_parallel, filename, '{urn:x}a')
+        parser = self.etree.XMLParser(target=self.etree.TreeBuilder())
+        self.assertRaises(ValueError, iterparse_parallel, filename, 'a', parser=parser)
+        self.assertRaises(TypeError, iterparse_parallel, BytesIO(b'<a/>'), 'a')
+
+    async def _async_chunks(self, data, size):
+        for i in range(0, len(data), size):
+            await asyncio.sleep(0)
+            yield data[i:i+size]
+
+    def test_aparse(self):
+        data = b'<root>' + b'<a>text</a>' * 500 + b'</root>'
+        tree = asyncio.run(self.etree.aparse(self._async_chunks(data, 100)))
+        self.assertIsInstance(tree, self.etree._ElementTree)
+        self.assertEqual(500, len(tree.getroot()))
+        self.assertEqual(data, self.etree.tostring(tree))
+
+    def test_aparse_reader(self):
+        class AsyncReader:
+            def __init__(self, data):
+                self.data = data
+                self.sizes = []
+
+            async def read(self, size):
+                self.sizes.append(size)
+                data, self.data = self.data[:size], self.data[size:]
+                return data
+
+        reader = AsyncReader(b'<root><a/></root>')
+        tree = asyncio.run(self.etree.aparse(
+            reader, base_url='http://example.com/doc.xml', chunk_size=5))
+        self.assertEqual(b'<root><a/></root>', self.etree.tostring(tree))
+        self.assertEqual('http://example.com/doc.xml', tree.docinfo.URL)
+        self.assertEqual({5}, set(reader.sizes))
+
+    def test_aparse_concurrent(self):
+        async def parse_all():
+            return await asyncio.gather(*[
+                self.etree.aparse(self._async_chunks(b'<root><a>%d</a></root>' % i, 7))
+                for i in range(20)
+            ])
+        trees = asyncio.run(parse_all())
+        self.assertEqual([str(i) for i in range(20)],
+                         [tree.getroot()[0].text for tree in trees])
+
+    def test_aparse_parser(self):
+        parser = self.etree.XMLParser(remove_blank_text=True)
+        tree = asyncio.run(self.etree.aparse(
+            self._async_chunks(b'<root> <a/> </root>', 3), parser))
+        self.assertEqual(b'<root><a/></root>', self.etree.tostring(tree))
+
+        parser = self.etree.XMLParser(target=self.etree.TreeBuilder())
+        root = asyncio.run(self.etree.aparse(
+            self._async_chunks(b'<root><a/></root>', 3), parser))
+        self.assertEqual('root', root.tag)
+
+    def test_aparse_error(self):
+        self.assertRaises(
+            self.etree.XMLSyntaxError, asyncio.run,
+            self.etree.aparse(self._async_chunks(b'<root><a></root>', 3)))
+        self.assertRaises(TypeError, asyncio.run, self.etree.aparse(b'<root/>'))
+
+    def test_aparse_cancel(self):
+        started = threading.Event()
+
+        class Target:
+            def __init__(self):
+                self.tags = []
+            def start(self, tag, attrib):
+                started.set()
+                time.sleep(0.05)
+                self.tags.append(tag)
+            def close(self):
+                return self.tags
+
+        async def chunks():
+            yield b'<root><a/>'
+            await asyncio.Event().wait()
+
+        async def parse_and_cancel(parser):
+            task = asyncio.ensure_future(self.etree.aparse(chunks(), parser))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        target = Target()
+        parser = self.etree.XMLParser(target=target)
+        asyncio.run(parse_and_cancel(parser))
+        # the pending feed() call has finished and the parser was reset
+        self.assertEqual(['root', 'a'], target.tags)
+        parser.feed(b'<b/>')
+        self.assertEqual(['root', 'a', 'b'], parser.close())
+
+    def test_aparse_source_error(self):
+        async def chunks():
+            yield b'<root><a>'
+            raise ValueError("broken source")
+
+        parser = self.etree.XMLParser()
+        self.assertRaises(ValueError, asyncio.run, self.etree.aparse(chunks(), parser))
+        parser.feed(b'<b/>')
+        self.assertEqual('b', parser.close().tag)
+
+    def test_parser_prime_dict(self):
+        parser = self.etree.XMLParser()
+        parser.prime_dict(['root', '{urn:test}item', 'name'])
+        size = parser.dict_size
+        self.assertTrue(size >= 3, size)
+        parser.prime_dict(self.etree.fromstring(
+            '<root xmlns:p="urn:test"><item p:id="1" name="x"/></root>'))
+        self.assertTrue(parser.dict_size > size, (parser.dict_size, size))
+
+        root = self.etree.fromstring('<root><item name="x"/></root>', parser)
+        self.assertEqual('x', root[0].get('name'))
+        self.assertRaises(TypeError, parser.prime_dict, 5)
+
+    def test_freeze_parser_dict(self):
+        self.addCleanup(self.etree.freeze_parser_dict)
+        xml = b'<root xmlns:p="urn:test"><item p:id="1" name="a">x</item><item/></root>'
+        parser = self.etree.XMLParser(collect_stats=True)
+        self.etree.fromstring(xml, parser)
+        growth = parser.stats['dict_growth']
+
+        self.etree.freeze_parser_dict(self.etree.fromstring(xml))
+        parser = self.etree.XMLParser(collect_stats=True)
+        self.etree.fromstring(xml, parser)
+        self.assertTrue(parser.stats['dict_growth'] < growth,
+                        (parser.stats['dict_growth'], growth))
+
+        trees = []
+        def parse():
+            trees.append(self.etree.fromstring(xml, self.etree.XMLParser()))
+        self._run_threads(4, parse)
+
+        self.etree.freeze_parser_dict(['other'])
+        root = self.etree.Element('top')
+        for tree in trees:
+            root.append(tree)
+        del trees[:]
+        self.etree.freeze_parser_dict()
+        gc.collect()
+        self.assertEqual(
+            b'<top>' + xml * 4 + b'</top>',
+            self.etree.tostring(root))
+
+    def test_parser_pool(self):
+        pool = self.etree.ParserPool(self.etree.XMLParser, size=2, remove_blank_text=True)
+        self.assertEqual(2, pool.size)
+
+        with pool.checkout() as parser:
+            self.assertIsInstance(parser, self.etree.XMLParser)
+            root = self.etree.fromstring('<root> <a/> </root>', parser)
+        self.assertEqual(b'<root><a/></root>', self.etree.tostring(root))
+
+        with pool.checkout() as parser1:
+            with pool.checkout() as parser2:
+                self.assertIsNot(parser1, parser2)
+                self.assertEqual(2, pool.stats['in_use'])
+
+        stats = pool.stats
+        self.assertEqual(3, stats['checkouts'])
+        self.assertEqual(0, stats['waits'])
+        self.assertEqual(0, stats['in_use'])
+        self.assertEqual(2, stats['max_in_use'])
+
+    def test_parser_pool_html(self):
+        pool = self.etree.ParserPool(self.etree.HTMLParser, size=1)
+        with pool.checkout() as parser:
+            root = self.etree.fromstring('<p>text', parser)
+        self.assertEqual('html', root.tag)
+
+    def test_parser_pool_timeout(self):
+        pool = self.etree.ParserPool(size=1)
+        with pool.checkout():
+            self.assertRaises(TimeoutError, pool.checkout(timeout=0.01).__enter__)
+        self.assertEqual(1, pool.stats['waits'])
+        self.assertEqual(0, pool.stats['in_use'])
+
+    def test_parser_pool_invalid(self):
+        self.assertRaises(ValueError, self.etree.ParserPool, size=0)
+        self.assertRaises(TypeError, self.etree.ParserPool, dict, size=1)
+
+    def test_parser_pool_threads(self):
+        pool = self.etree.ParserPool(size=3)
+        results = []
+
+        def parse():
+            for i in range(20):
+                with pool.checkout() as parser:
+                    root = self.etree.fromstring(b'<root><a>%d</a></root>' % i, parser)
+                results.append(root[0].text)
+
+        self._run_threads(6, parse)
+        self.assertEqual(6 * 20, len(results))
+        stats = pool.stats
+        self.assertEqual(6 * 20, stats['checkouts'])
+        self.assertEqual(0, stats['in_use'])
+        self.assertLessEqual(stats['max_in_use'], 3)
+
     def test_main_xslt_in_thread(self):
         XML = self.etree.XML
         style = XML(b'''\